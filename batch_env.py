@@ -0,0 +1,326 @@
+import math
+import numpy as np
+from config import CHASE_DURATION, ENEMY_SPAWN_POSITIONS, ENEMY_SPEED_FACTOR, POWER_PELLET_DURATION
+from map import Map
+from pathfinding import NEIGHBOR_OFFSETS, PathTable
+from enemy_store import PATROL, CHASE, RUN_AWAY, INVESTIGATE_SOUND  # Shared with the object-based game
+
+# Actions as (row, col) offsets: none, up, down, left, right
+ACTION_OFFSETS = np.array([(0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)], dtype=np.int32)
+NEIGHBOR_ARRAY = np.array(NEIGHBOR_OFFSETS, dtype=np.int32)
+
+class BatchEnv:
+    """
+    N independent games on the same maze, stored as stacked NumPy arrays and
+    advanced together by step(actions).
+
+    The rules mirror Player.move, Map.collect_point, EntityManager and
+    EnemyAI; ghost navigation reads the maze's all-pairs PathTable instead of
+    running searches. Positions are (row, col) and actions index
+    ACTION_OFFSETS.
+    """
+
+    def __init__(self, num_envs, num_enemies=len(ENEMY_SPAWN_POSITIONS), game_map=None,
+                 player_spawn=None, auto_reset=True):
+        template = game_map if game_map is not None else Map()
+        self.table = template.path_table or PathTable.build(template.occupancy_map)
+        self.layout = template.occupancy_map.astype(np.int8)
+        self.walkable = self.layout != Map.WALL
+        self.rows, self.cols = self.layout.shape
+        self.num_envs = num_envs
+        self.num_enemies = num_enemies
+        self.auto_reset = auto_reset
+
+        self.player_spawn = np.array(player_spawn if player_spawn is not None else template.player_spawn, dtype=np.int32)
+        self.enemy_spawns = np.array(template.enemy_spawns[:num_enemies], dtype=np.int32).reshape(num_enemies, 2)
+        self.enemy_move_interval = math.ceil(ENEMY_SPEED_FACTOR)  # Enemy.move_counter threshold
+        self.chase_ticks = CHASE_DURATION
+
+        # Walls up to (not including) each column/row, for O(1) line-of-sight checks
+        walls = (~self.walkable).astype(np.int32)
+        self.row_wall_counts = np.pad(np.cumsum(walls, axis=1), ((0, 0), (1, 0)))
+        self.col_wall_counts = np.pad(np.cumsum(walls, axis=0), ((1, 0), (0, 0)))
+
+        # First open neighbour of each cell, which is where a ghost standing on its target steps
+        open_neighbors = self._valid(np.indices(self.layout.shape).transpose(1, 2, 0)[:, :, None, :] + NEIGHBOR_ARRAY)
+        self.first_open = np.where(open_neighbors.any(axis=2), open_neighbors.argmax(axis=2), -1)
+
+        n, g = num_envs, num_enemies
+        self.cells = np.empty((n, self.rows, self.cols), dtype=np.int8)
+        self.player = np.empty((n, 2), dtype=np.int32)
+        self.intended = np.zeros(n, dtype=np.int8)  # Action codes, 0 = none
+        self.current = np.zeros(n, dtype=np.int8)
+        self.power_timer = np.zeros(n, dtype=np.int32)
+        self.pending_sound = np.full((n, 2), -1, dtype=np.int32)
+        self.remaining = np.zeros(n, dtype=np.int32)
+        self.dots = np.zeros(n, dtype=np.int32)
+        self.power_pellets = np.zeros(n, dtype=np.int32)
+        self.enemies_eaten = np.zeros(n, dtype=np.int32)
+        self.ticks = np.zeros(n, dtype=np.int32)
+
+        self.enemy_pos = np.empty((n, g, 2), dtype=np.int32)
+        self.enemy_prev = np.empty((n, g, 2), dtype=np.int32)
+        self.alive = np.empty((n, g), dtype=bool)
+        self.mode = np.empty((n, g), dtype=np.int8)
+        self.chase_timer = np.empty((n, g), dtype=np.int32)
+        self.patrol_dir = np.empty((n, g, 2), dtype=np.int32)  # Stored like EnemyAI: [col, row]
+        self.horizontal = np.empty((n, g), dtype=bool)
+        self.move_counter = np.empty((n, g), dtype=np.int32)
+        self.sound_target = np.empty((n, g, 2), dtype=np.int32)
+
+        self.reset()
+
+    @property
+    def scores(self):
+        return self.dots * 10 + self.power_pellets * 50 + self.enemies_eaten * 200
+
+    def reset(self, mask=None):
+        """Reset all games, or only those selected by a boolean mask."""
+        envs = np.arange(self.num_envs) if mask is None else np.flatnonzero(mask)
+        if envs.size == 0:
+            return
+
+        self.cells[envs] = self.layout
+        self.cells[envs, self.player_spawn[0], self.player_spawn[1]] = Map.EMPTY
+        self.player[envs] = self.player_spawn
+        self.intended[envs] = 0
+        self.current[envs] = 0
+        self.power_timer[envs] = 0
+        self.pending_sound[envs] = -1
+        pellets = (self.cells[envs] == Map.REGULAR_PELLET) | (self.cells[envs] == Map.POWER_PELLET)
+        self.remaining[envs] = pellets.sum(axis=(1, 2))
+        self.dots[envs] = 0
+        self.power_pellets[envs] = 0
+        self.enemies_eaten[envs] = 0
+        self.ticks[envs] = 0
+
+        self.enemy_pos[envs] = self.enemy_spawns
+        self.enemy_prev[envs] = self.enemy_spawns
+        self.alive[envs] = True
+        self.mode[envs] = PATROL
+        self.chase_timer[envs] = 0
+        self.patrol_dir[envs] = (0, 1)
+        self.horizontal[envs] = True
+        self.move_counter[envs] = 0
+        self.sound_target[envs] = -1
+
+    def step(self, actions):
+        """
+        Advance every game by one tick.
+        Returns (rewards, dones, info) where info holds 'won' and 'lost' masks.
+        """
+        actions = np.asarray(actions, dtype=np.int8)
+        envs = np.arange(self.num_envs)
+        scores_before = self.scores
+
+        # Input handling (Simulation.set_direction)
+        pressed = actions > 0
+        self.intended[pressed] = actions[pressed]
+        accepted = pressed & self._valid(self.player + ACTION_OFFSETS[actions])
+        self.current[accepted] = actions[accepted]
+
+        # Map.update: power pellet countdown
+        self.power_timer = np.maximum(self.power_timer - 1, 0)
+
+        # Player.move: intended direction first, then the current one
+        moving = self.current > 0
+        via_intended = moving & (self.intended > 0) & self._valid(self.player + ACTION_OFFSETS[self.intended])
+        via_current = moving & ~via_intended & self._valid(self.player + ACTION_OFFSETS[self.current])
+        self.current[via_intended] = self.intended[via_intended]
+        moved = via_intended | via_current
+        self.player[moved] += ACTION_OFFSETS[self.current[moved]]
+        self._collect(envs[moved])
+
+        self._move_enemies(envs)
+
+        # EntityManager.check_collision
+        player = self.player[:, None, :]
+        player_prev = (self.player - ACTION_OFFSETS[self.current])[:, None, :]
+        same_cell = (self.enemy_pos == player).all(axis=2)
+        swapped = (self.enemy_pos == player_prev).all(axis=2) & (self.enemy_prev == player).all(axis=2)
+        touching = self.alive & (same_cell | swapped)
+        eaten = touching & (self.mode == RUN_AWAY)
+        self.alive &= ~eaten
+        self.enemies_eaten += eaten.sum(axis=1)
+        lost = (touching & ~eaten).any(axis=1)
+        won = ~lost & (self.remaining == 0)
+
+        self.ticks += 1
+        rewards = self.scores - scores_before
+        dones = lost | won
+        if self.auto_reset:
+            self.reset(dones)
+        return rewards, dones, {'won': won, 'lost': lost}
+
+    def _valid(self, positions):
+        """Map.is_valid_move over an array of (..., 2) positions."""
+        rows, cols = positions[..., 0], positions[..., 1]
+        in_bounds = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        return in_bounds & self.walkable[rows.clip(0, self.rows - 1), cols.clip(0, self.cols - 1)]
+
+    def _collect(self, envs):
+        """Map.collect_point plus the sound-pellet notification, for players that moved."""
+        rows, cols = self.player[envs, 0], self.player[envs, 1]
+        cell = self.cells[envs, rows, cols]
+        self.cells[envs, rows, cols] = Map.EMPTY
+
+        self.dots[envs] += cell == Map.REGULAR_PELLET
+        self.remaining[envs] -= (cell == Map.REGULAR_PELLET) | (cell == Map.POWER_PELLET)
+        power = envs[cell == Map.POWER_PELLET]
+        self.power_pellets[power] += 1
+        self.power_timer[power] = POWER_PELLET_DURATION
+
+        # EntityManager.sound_detected: the closest enemy not running away investigates
+        sound = envs[cell == Map.SOUND_PELLET]
+        if sound.size == 0:
+            return
+        source = self.player[sound]
+        distance = np.abs(self.enemy_pos[sound] - source[:, None, :]).sum(axis=2)
+        eligible = self.alive[sound] & (self.mode[sound] != RUN_AWAY)
+        distance = np.where(eligible, distance, np.iinfo(np.int32).max)
+        closest = distance.argmin(axis=1)
+        assigned = eligible.any(axis=1)
+        self.mode[sound[assigned], closest[assigned]] = INVESTIGATE_SOUND
+        self.sound_target[sound[assigned], closest[assigned]] = source[assigned]
+        self.pending_sound[sound[assigned]] = -1
+        self.pending_sound[sound[~assigned]] = source[~assigned]
+
+    def _can_see(self):
+        """EnemyPerception.can_see_player for every enemy at once."""
+        enemy_row, enemy_col = self.enemy_pos[..., 0], self.enemy_pos[..., 1]
+        player_row, player_col = self.player[:, None, 0], self.player[:, None, 1]
+
+        low = np.minimum(enemy_col, player_col)
+        high = np.maximum(enemy_col, player_col)
+        row = enemy_row.clip(0, self.rows - 1)
+        row_clear = self.row_wall_counts[row, high] - self.row_wall_counts[row, (low + 1).clip(max=self.cols)] <= 0
+
+        low = np.minimum(enemy_row, player_row)
+        high = np.maximum(enemy_row, player_row)
+        col = enemy_col.clip(0, self.cols - 1)
+        col_clear = self.col_wall_counts[high, col] - self.col_wall_counts[(low + 1).clip(max=self.rows), col] <= 0
+
+        same_row = enemy_row == player_row
+        return np.where(same_row, row_clear, (enemy_col == player_col) & col_clear)
+
+    def _update_modes(self):
+        """EnemyAI.update_mode for every enemy at once."""
+        mode = self.mode
+        new_mode = mode.copy()
+        power = np.broadcast_to((self.power_timer > 0)[:, None], mode.shape)
+        decided = power.copy()
+        new_mode[power] = RUN_AWAY
+
+        calmed = ~decided & (mode == RUN_AWAY)
+        new_mode[calmed] = PATROL
+        decided |= calmed
+
+        spotted = ~decided & self._can_see()
+        new_mode[spotted] = CHASE
+        self.chase_timer[spotted] = self.chase_ticks
+        decided |= spotted
+
+        has_pending = np.broadcast_to((self.pending_sound[:, 0] >= 0)[:, None], mode.shape)
+        heard = ~decided & has_pending & (mode != INVESTIGATE_SOUND)
+        new_mode[heard] = INVESTIGATE_SOUND
+        self.sound_target[heard] = np.broadcast_to(self.pending_sound[:, None, :], self.sound_target.shape)[heard]
+        decided |= heard
+
+        arrived = ~decided & self._at_sound_target()
+        new_mode[arrived] = PATROL
+        self.sound_target[arrived] = -1
+        decided |= arrived
+
+        chasing = ~decided & (mode == CHASE)
+        self.chase_timer[chasing] -= 1
+        expired = chasing & (self.chase_timer <= 0)
+        new_mode[expired] = PATROL
+        self.chase_timer[expired] = 0
+
+        self.mode = new_mode
+
+    def _at_sound_target(self):
+        return ((self.mode == INVESTIGATE_SOUND) & (self.sound_target[..., 0] >= 0) &
+                (self.enemy_pos == self.sound_target).all(axis=2))
+
+    def _move_enemies(self, envs):
+        """EntityManager.move_enemies: update modes, pick moves, apply at the reduced speed."""
+        # Enemies standing on their sound source go back to patrolling first
+        arrived = self._at_sound_target()
+        self.mode[arrived] = PATROL
+        self.sound_target[arrived] = -1
+
+        self._update_modes()
+
+        moves = np.zeros_like(self.enemy_pos)  # (row, col) offsets
+        investigating = (self.mode == INVESTIGATE_SOUND) & (self.sound_target[..., 0] >= 0)
+        patrolling = ~((self.mode == CHASE) | (self.mode == RUN_AWAY) | investigating)
+
+        player = np.broadcast_to(self.player[:, None, :], self.enemy_pos.shape)
+        chasing = self.mode == CHASE
+        moves[chasing] = self._step_towards(self.enemy_pos[chasing], player[chasing])
+        moves[investigating] = self._step_towards(self.enemy_pos[investigating], self.sound_target[investigating])
+        running = self.mode == RUN_AWAY
+        moves[running] = self._step_away(self.enemy_pos[running], player[running])
+        moves[patrolling] = self._patrol(patrolling)
+
+        # Enemy.move: only every enemy_move_interval-th tick actually moves
+        self.move_counter += 1
+        stepping = self.move_counter >= self.enemy_move_interval
+        self.move_counter[stepping] = 0
+        target = self.enemy_pos + moves
+        stepping &= self.alive & self._valid(target)
+        self.enemy_prev[stepping] = self.enemy_pos[stepping]
+        self.enemy_pos[stepping] = target[stepping]
+
+    def _step_towards(self, positions, targets):
+        """EnemyAI.move_towards via the path table's next hops."""
+        cell_index = self.table.cell_index
+        start = cell_index[positions[:, 0], positions[:, 1]]
+        goal = cell_index[targets[:, 0], targets[:, 1]]
+        hops = self.table.next_hops[start, goal].astype(np.int32)
+
+        # No hop: on the target (first open neighbour wins the scan) or unreachable (stay)
+        no_hop = hops == PathTable.NO_HOP
+        hops[no_hop] = np.where(start[no_hop] == goal[no_hop],
+                                self.first_open[positions[no_hop, 0], positions[no_hop, 1]], -1)
+        return np.where((hops >= 0)[:, None], NEIGHBOR_ARRAY[hops.clip(min=0)], 0)
+
+    def _step_away(self, positions, threats):
+        """EnemyAI.run_away: farthest neighbour, or the first one the threat cannot reach."""
+        neighbors = positions[:, None, :] + NEIGHBOR_ARRAY
+        valid = self._valid(neighbors)
+        cell_index = self.table.cell_index
+        neighbor_ids = cell_index[neighbors[..., 0].clip(0, self.rows - 1), neighbors[..., 1].clip(0, self.cols - 1)]
+        threat_ids = cell_index[threats[:, 0], threats[:, 1]]
+        distance = self.table.distances[neighbor_ids, threat_ids[:, None]].astype(np.int64)
+
+        unreachable = valid & (distance == PathTable.TABLE_UNREACHABLE)
+        scores = np.where(valid, distance, -1)
+        choice = np.where(unreachable.any(axis=1), unreachable.argmax(axis=1), scores.argmax(axis=1))
+        stuck = ~valid.any(axis=1)
+        return np.where(stuck[:, None], 0, NEIGHBOR_ARRAY[choice])
+
+    def _patrol(self, selected):
+        """EnemyAI.patrol for the selected enemies, updating their patrol state."""
+        positions = self.enemy_pos[selected]
+        direction = self.patrol_dir[selected].copy()  # [col, row]
+        horizontal = self.horizontal[selected]
+
+        blocked = ~self._valid(positions + direction[:, ::-1])
+
+        # Horizontal patrollers flip the row component, vertical ones the column component
+        flip_h = blocked & horizontal
+        flip_v = blocked & ~horizontal
+        direction[flip_h, 1] *= -1
+        direction[flip_v, 0] *= -1
+        still_blocked = blocked & ~self._valid(positions + direction[:, ::-1])
+        switch_v = still_blocked & horizontal
+        switch_h = still_blocked & ~horizontal
+        direction[switch_v] = (1, 0)
+        direction[switch_h] = (0, 1)
+        horizontal = np.where(switch_v, False, np.where(switch_h, True, horizontal))
+
+        self.patrol_dir[selected] = direction
+        self.horizontal[selected] = horizontal
+        return direction[:, ::-1]
@@ -0,0 +1,44 @@
+"""
+Measure BatchEnv throughput against stepping Simulation objects one by one.
+
+Run from the repository root:
+    python benchmarks/bench_batch_env.py
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from batch_env import BatchEnv
+from simulation import Simulation
+
+ACTION_DIRECTIONS = {1: (0, -1), 2: (0, 1), 3: (-1, 0), 4: (1, 0)}
+
+
+def bench_batch(num_envs, ticks=200):
+    env = BatchEnv(num_envs)
+    actions = np.random.default_rng(0).integers(0, 5, size=(ticks, num_envs))
+    start = time.perf_counter()
+    for t in range(ticks):
+        env.step(actions[t])
+    return num_envs * ticks / (time.perf_counter() - start)
+
+
+def bench_simulation(ticks=2000):
+    actions = np.random.default_rng(0).integers(0, 5, size=ticks)
+    sim = Simulation(seed=0)
+    steps = 0
+    start = time.perf_counter()
+    for t in range(ticks):
+        if sim.step(ACTION_DIRECTIONS.get(int(actions[t]))) != Simulation.RUNNING:
+            sim = Simulation(seed=0)
+        steps += 1
+    return steps / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    print(f"Simulation (one game)   {bench_simulation():>12,.0f} env-steps/s")
+    for num_envs in [64, 256, 1024, 4096]:
+        print(f"BatchEnv  N={num_envs:<5}      {bench_batch(num_envs):>12,.0f} env-steps/s")
@@ -0,0 +1,94 @@
+"""
+Measure how much memory thousands of headless ghosts take and how many
+blocks each tick allocates. Tracing restarts for every tick, so a tick's
+count is the blocks allocated during that tick and still live at its end;
+its peak is the most it held at once, transients included. Per-ghost
+reads of position are counted on their own: with the store's cached
+tuples they allocate nothing.
+
+Run from the repository root:
+    python benchmarks/bench_entity_memory.py
+"""
+import os
+import sys
+import tracemalloc
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from entities import EntityManager
+from map import Map
+
+
+def build(num_enemies, size=(101, 101), seed=0):
+    """
+    A generated maze with num_enemies ghosts on random walkable cells,
+    and the bytes the ghosts alone took.
+    """
+    game_map = Map(size=size, seed=seed, precompute_paths=False)
+    rows, cols = np.nonzero(game_map.occupancy_map != Map.WALL)
+    cells = [(int(rows[i]), int(cols[i])) for i in np.random.default_rng(seed).choice(len(rows), size=num_enemies)]
+    manager = EntityManager(game_map, player_spawn=game_map.player_spawn)
+
+    tracemalloc.start()
+    for x, y in cells:
+        manager.add_enemy(x, y)
+    ghost_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return manager, ghost_bytes
+
+
+def tick(manager, t):
+    manager.move_enemies(current_tick=t)
+    manager.check_collision()
+
+
+def traced_blocks(snapshot):
+    """Blocks in a snapshot, leaving out tracemalloc's own."""
+    return sum(stat.count for stat in snapshot.statistics('filename')
+               if stat.traceback[0].filename != tracemalloc.__file__)
+
+
+def count_allocations(run):
+    """(blocks allocated by run() and still live when it returns, peak bytes while it ran)."""
+    tracemalloc.start()
+    result = run()
+    peak = tracemalloc.get_traced_memory()[1]
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del result
+    return traced_blocks(snapshot), peak
+
+
+def compare(num_enemies, ticks=50, warmup=20):
+    manager, ghost_bytes = build(num_enemies)
+
+    # Let the distance and flow caches fill before measuring steady state
+    for t in range(warmup):
+        tick(manager, t)
+
+    blocks, peaks = [], []
+    for t in range(warmup, warmup + ticks):
+        count, peak = count_allocations(lambda: tick(manager, t))
+        blocks.append(count)
+        peaks.append(peak)
+
+    # The same without tracing: change in the interpreter's live block count
+    net = []
+    for t in range(warmup + ticks, warmup + 2 * ticks):
+        before = sys.getallocatedblocks()
+        tick(manager, t)
+        net.append(sys.getallocatedblocks() - before)
+
+    # Keep every read alive so each allocation shows up, less the list holding them
+    read_blocks, _ = count_allocations(lambda: [enemy.position for enemy in manager.enemies])
+    list_blocks, _ = count_allocations(lambda: [enemy for enemy in manager.enemies])
+
+    print(f"{num_enemies:>6} ghosts   {ghost_bytes / num_enemies:6.0f} B/ghost   "
+          f"{np.mean(blocks):8.1f} blocks/tick   net {np.mean(net):+7.1f} blocks/tick   "
+          f"peak {np.mean(peaks) / 1024:8.1f} KiB/tick   position reads {(read_blocks - list_blocks) / num_enemies:4.2f} blocks/ghost")
+
+
+if __name__ == "__main__":
+    for num_enemies in (100, 1000, 5000):
+        compare(num_enemies)
@@ -0,0 +1,58 @@
+"""
+Compare repairing the player-target distance field after a one-cell move
+against rebuilding it with a full BFS.
+
+Run from the repository root:
+    python benchmarks/bench_incremental.py
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from map import Map
+from pathfinding import GridGraph, NEIGHBOR_OFFSETS
+
+
+def random_walk(game_map, steps, seed=0):
+    """Target positions of a player wandering the maze one cell at a time."""
+    rng = np.random.default_rng(seed)
+    position = game_map.player_spawn
+    path = [position]
+    while len(path) <= steps:
+        dr, dc = NEIGHBOR_OFFSETS[rng.integers(len(NEIGHBOR_OFFSETS))]
+        step = (position[0] + dr, position[1] + dc)
+        if game_map.is_valid_move(*step):
+            position = step
+            path.append(position)
+    return path
+
+
+def compare(label, game_map, steps):
+    graph = GridGraph(game_map.occupancy_map)
+    path = random_walk(game_map, steps)
+
+    start = time.perf_counter()
+    full = [graph.distance_map(target) for target in path[1:]]
+    rebuild = (time.perf_counter() - start) / steps
+
+    start = time.perf_counter()
+    field = graph.distance_map(path[0])
+    repaired = []
+    for target in path[1:]:
+        field = graph.repair_distance_map(field, target)
+        repaired.append(field)
+    repair = (time.perf_counter() - start) / steps
+
+    assert all(np.array_equal(a, b) for a, b in zip(full, repaired))
+    print(f"{label:<22} rebuild {rebuild * 1000:8.2f} ms   repair {repair * 1000:8.2f} ms   "
+          f"speedup {rebuild / repair:5.1f}x")
+
+
+if __name__ == "__main__":
+    compare("stock 33x31", Map(precompute_paths=False), steps=500)
+    for size in (201, 501, 1001):
+        compare(f"generated {size}x{size}", Map(size=(size, size), seed=0, precompute_paths=False),
+                steps=max(20, 20000 // size))
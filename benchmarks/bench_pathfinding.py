@@ -0,0 +1,99 @@
+"""
+Compare the vectorized BFS engine against the old heapq Dijkstra search.
+
+Run from the repository root:
+    python benchmarks/bench_pathfinding.py
+"""
+import heapq
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from map import Map
+from pathfinding import GridGraph, NEIGHBOR_OFFSETS
+
+
+class GridMap:
+    """Minimal map wrapper around a raw occupancy grid."""
+
+    def __init__(self, occupancy_map):
+        self.occupancy_map = occupancy_map
+
+    def is_valid_move(self, x, y):
+        return (0 <= x < self.occupancy_map.shape[0] and
+                0 <= y < self.occupancy_map.shape[1] and
+                self.occupancy_map[x, y] != -1)
+
+
+def dijkstra_distance_map(start_position, game_map):
+    """The original list-of-lists Dijkstra, kept here as the baseline."""
+    height, width = game_map.occupancy_map.shape
+    distance_map = [[float('inf') for _ in range(width)] for _ in range(height)]
+    distance_map[start_position[0]][start_position[1]] = 0
+    priority_queue = [(0, start_position[0], start_position[1])]
+    while priority_queue:
+        current_distance, current_x, current_y = heapq.heappop(priority_queue)
+        if current_distance > distance_map[current_x][current_y]:
+            continue
+        for dx, dy in NEIGHBOR_OFFSETS:
+            new_x, new_y = current_x + dx, current_y + dy
+            if game_map.is_valid_move(new_x, new_y):
+                new_distance = current_distance + 1
+                if new_distance < distance_map[new_x][new_y]:
+                    distance_map[new_x][new_y] = new_distance
+                    heapq.heappush(priority_queue, (new_distance, new_x, new_y))
+    return distance_map
+
+
+def synthetic_maze(rows, cols, seed=0, loop_probability=0.1):
+    """Binary-tree maze (fully connected) with a few extra openings for loops."""
+    rng = np.random.default_rng(seed)
+    occupancy = np.full((rows, cols), -1)
+    occupancy[1:-1:2, 1:-1:2] = 0
+    cell_rows, cell_cols = occupancy[1:-1:2, 1:-1:2].shape
+
+    # Every cell opens north or east; the top row and right column open the only way they can
+    go_north = rng.random((cell_rows, cell_cols)) < 0.5
+    go_north[0, :] = False
+    go_north[:, -1] = True
+    go_north[0, -1] = False
+    north = np.zeros_like(occupancy, dtype=bool)
+    east = np.zeros_like(occupancy, dtype=bool)
+    north[0:-2:2, 1:-1:2][:cell_rows, :cell_cols] = go_north
+    east[1:-1:2, 2::2][:cell_rows, :cell_cols] = ~go_north
+    occupancy[north | east] = 0
+
+    # Knock out random interior walls to create loops
+    loops = rng.random((rows, cols)) < loop_probability
+    loops[[0, -1], :] = False
+    loops[:, [0, -1]] = False
+    occupancy[loops] = 0
+    return occupancy
+
+
+def best_of(func, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare(label, occupancy_map, start, repeats):
+    game_map = GridMap(occupancy_map)
+    graph = GridGraph(occupancy_map)
+    legacy = best_of(lambda: dijkstra_distance_map(start, game_map), repeats)
+    vectorized = best_of(lambda: graph.distance_map(start), repeats)
+    build = best_of(lambda: GridGraph(occupancy_map), repeats)
+    print(f"{label:<18} dijkstra {legacy * 1000:9.2f} ms   bfs {vectorized * 1000:8.2f} ms   "
+          f"graph build {build * 1000:7.2f} ms   speedup {legacy / vectorized:6.1f}x")
+
+
+if __name__ == "__main__":
+    compare("stock 33x31", Map().occupancy_map, (1, 1), repeats=50)
+    for seed in range(3):
+        compare(f"synthetic 500x500/{seed}", synthetic_maze(500, 500, seed), (1, 1), repeats=2)
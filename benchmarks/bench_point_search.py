@@ -0,0 +1,44 @@
+"""
+Compare A* point-to-point next steps against building a whole flow field,
+for targets near and far from the ghost.
+
+Run from the repository root:
+    python benchmarks/bench_point_search.py
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from map import Map
+
+
+def median_ms(func, pairs):
+    times = []
+    for start, target in pairs:
+        began = time.perf_counter()
+        func(start, target)
+        times.append(time.perf_counter() - began)
+    return np.median(times) * 1000
+
+
+def compare(label, game_map, samples=10, seed=0):
+    graph = game_map.grid_graph
+    cells = np.argwhere(game_map.occupancy_map != Map.WALL)
+    rng = np.random.default_rng(seed)
+    starts = cells[rng.integers(len(cells), size=samples)]
+    near = [(tuple(s), tuple(cells[np.abs(cells - s).sum(axis=1).argsort()[20]])) for s in starts]
+    far = [(tuple(s), tuple(cells[rng.integers(len(cells))])) for s in starts]
+
+    field = lambda start, target: graph.flow_field(graph.distance_map(target))
+    for name, pairs in (("near", near), ("far", far)):
+        print(f"{label:<22} {name:<5} a* {median_ms(graph.next_step, pairs):8.2f} ms   "
+              f"flow field {median_ms(field, pairs):8.2f} ms")
+
+
+if __name__ == "__main__":
+    compare("stock 33x31", Map(precompute_paths=False))
+    for size in (201, 1001):
+        compare(f"generated {size}x{size}", Map(size=(size, size), seed=0, precompute_paths=False))
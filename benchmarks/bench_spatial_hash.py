@@ -0,0 +1,54 @@
+"""
+Compare the spatial hash against a linear scan for the per-tick entity
+queries: who is on the player's cell, and which ghost is nearest a sound.
+
+Run from the repository root:
+    python benchmarks/bench_spatial_hash.py
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from spatial_hash import SpatialHash
+
+
+def scan_at(positions, cell):
+    return [key for key, position in enumerate(positions) if position == cell]
+
+
+def scan_nearest(positions, cell):
+    best, best_distance = None, float('inf')
+    for key, (row, col) in enumerate(positions):
+        distance = abs(row - cell[0]) + abs(col - cell[1])
+        if distance < best_distance:
+            best, best_distance = key, distance
+    return [best] if best is not None else []
+
+
+def compare(num_entities, size=500, queries=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    positions = [tuple(cell) for cell in rng.integers(0, size, size=(num_entities, 2)).tolist()]
+    probes = [tuple(cell) for cell in rng.integers(0, size, size=(queries, 2)).tolist()]
+    index = SpatialHash()
+    for key, position in enumerate(positions):
+        index.insert(key, position)
+
+    start = time.perf_counter()
+    expected = [(scan_at(positions, cell), scan_nearest(positions, cell)) for cell in probes]
+    scan = (time.perf_counter() - start) / queries
+
+    start = time.perf_counter()
+    got = [(index.at(cell), index.nearest(cell)) for cell in probes]
+    hashed = (time.perf_counter() - start) / queries
+
+    assert got == expected
+    print(f"{num_entities:>6} entities   scan {scan * 1e6:9.1f} us   hash {hashed * 1e6:7.1f} us   "
+          f"speedup {scan / hashed:6.1f}x")
+
+
+if __name__ == "__main__":
+    for num_entities in (100, 1000, 10000):
+        compare(num_entities)
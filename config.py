@@ -27,6 +27,10 @@ DISTANCE_MAP_COLOR_MIN = (0, 0, 100)
 DISTANCE_MAP_COLOR_MAX = (255, 0, 255)  
 DISTANCE_MAP_OPACITY = 150 
 
+# Rendering
+DIRTY_RECT_RENDERING = True  # Redraw and push only changed screen regions
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept by text_cache
+
 # Movement directions
 DIRECTIONS = {
     pygame.K_UP: (0, -1),
@@ -40,6 +44,20 @@ GAME_TITLE = "Pac-Man"
 FRAME_DELAY = 250
 FPS = 60 
 GAME_SPEED = 5 
+MAX_UPDATES_PER_FRAME = 5  # Catch-up ticks run before a frame is drawn; a longer backlog is dropped
+RENDER_INTERPOLATION = False  # Slide entities between cells between ticks instead of snapping
 ENEMY_SPEED_FACTOR = 1.1
-CHASE_DURATION = 3
-POWER_PELLET_DURATION = 100 
\ No newline at end of file
+CHASE_DURATION = 15  # Ticks a ghost keeps chasing after losing sight of the player (3 s at GAME_SPEED 5)
+POWER_PELLET_DURATION = 100 
+ENEMY_SPAWN_POSITIONS = [(5, 11), (15, 11), (30, 11), (20, 11)]
+SPATIAL_HASH_BUCKET = 8  # Side of the square cell blocks enemies are bucketed by for collision/proximity queries
+
+# Pathfinding
+DISTANCE_CACHE_SIZE = 16
+SOUND_FLOW_CACHE_SIZE = 4  # Flow fields towards sound sources, kept apart from chase fields
+FLOW_FIELD_MIN_SHARERS = 2  # Ghosts sharing a target before a whole flow field beats per-ghost A*
+POINT_SEARCH_BUDGET = 4096  # Cells a lone ghost's A* may close before it falls back to the flow field
+PRECOMPUTE_PATH_TABLE = True  # Build the all-pairs table when a Map is created
+PATH_TABLE_MAX_CELLS = 2048  # Skip the table for mazes with more walkable cells
+PATH_TABLE_CACHE_DIR = None  # Directory to persist tables in, keyed by layout hash
+PATH_TABLE_MEMORY_SIZE = 4  # Tables kept in memory per process (least recently used evicted)
@@ -0,0 +1,46 @@
+from collections import OrderedDict
+from config import DISTANCE_CACHE_SIZE
+
+class DistanceFieldCache:
+    """
+    LRU cache of distance fields keyed by (target cell, wall layout version).
+
+    Every ghost chasing the same target and the distance map overlay share a
+    single field per tick instead of each running its own search. Pellet
+    changes never touch walls, so they never invalidate an entry.
+    Cached fields are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, compute, maxsize=DISTANCE_CACHE_SIZE):
+        self.compute = compute  # compute(target) -> distance field
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._fields = OrderedDict()
+
+    def get(self, target, wall_version):
+        """Return the distance field towards target, computing it on a miss."""
+        key = ((int(target[0]), int(target[1])), wall_version)
+        field = self._fields.get(key)
+        if field is not None:
+            self.hits += 1
+            self._fields.move_to_end(key)
+            return field
+
+        self.misses += 1
+        field = self.compute(key[0])
+        self._fields[key] = field
+        if len(self._fields) > self.maxsize:
+            self._fields.popitem(last=False)  # Evict least recently used
+        return field
+
+    def peek(self, target, wall_version):
+        """Return the cached field for target, or None, without counting or reordering."""
+        return self._fields.get(((int(target[0]), int(target[1])), wall_version))
+
+    def clear(self):
+        """Drop every cached field."""
+        self._fields.clear()
+
+    def __len__(self):
+        return len(self._fields)
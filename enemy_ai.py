@@ -1,6 +1,9 @@
-import heapq
-import time
-from config import CHASE_DURATION
+import numpy as np
+from config import CHASE_DURATION, FLOW_FIELD_MIN_SHARERS, POINT_SEARCH_BUDGET
+from map import Map
+import pathfinding
+from enemy_store import (EnemyStore, PATROL, CHASE, RUN_AWAY, INVESTIGATE_SOUND, MODE_NAMES, MODE_CODES,
+                         NO_SOUND, NEVER_UPDATED)
 
 class EnemyPerception:
 
@@ -12,6 +15,10 @@ class EnemyPerception:
         Check if the enemy can see the player by looking in straight lines (horizontal and vertical).
         Stops checking when it hits a wall.
         """
+        # Real maps answer from their precomputed segment index
+        if isinstance(game_map, Map):
+            return game_map.visibility.can_see(enemy_position, player_position)
+        
         # Get positions
         enemy_row, enemy_col = enemy_position
         player_row, player_col = player_position
@@ -37,81 +44,174 @@ class EnemyPerception:
         # Not in the same row or column, so can't see player
         return False
 
+    def perceive(self, enemy_positions, player_positions, game_map):
+        """
+        Batched perception for many ghosts against one or more players.
+        Returns (visible, distances): (enemies, players) arrays holding
+        can_see_player and calculate_distance for every pair.
+        """
+        enemies = np.asarray(enemy_positions, dtype=np.intp).reshape(-1, 2)
+        players = np.asarray(player_positions, dtype=np.intp).reshape(-1, 2)
+        distances = np.abs(enemies[:, None, :] - players[None, :, :]).sum(axis=2)
+
+        if isinstance(game_map, Map):
+            visible = game_map.visibility.visible(enemies, players)
+        else:
+            visible = np.array([[self.can_see_player(tuple(enemy), tuple(player), game_map) for player in players]
+                                for enemy in enemies], dtype=bool).reshape(len(enemies), len(players))
+        return visible, distances
+
 class EnemyAI:
-    def __init__(self):
+    __slots__ = ('slot', 'perception', 'target_sharers', 'search_target')
+    
+    directions = ((-1, 0), (1, 0), (0, -1), (0, 1))
+    
+    def __init__(self, slot=None):
+        """
+        AI for one enemy. Its mode, timers and patrol state live in an
+        EnemyStore row (slot); a standalone AI gets a store of its own.
+        """
+        self.slot = slot if slot is not None else EnemyStore(capacity=1).add(0, 0)
         self.perception = EnemyPerception()
-        self.current_mode = "patrol"  # patrol, chase, run away, investigate_sound
-        self.patrol_direction = [0, 1] 
-        self.is_horizontal = True  
-        self.directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  
-        self.chase_timer = CHASE_DURATION
-        self.last_update_time = 0
-        self.sound_location = None 
-    
-    def update_mode(self, enemy_position, player_position, game_map, sound_position=None, current_time=None):
-        """Update the AI mode based on the game state."""
-        # If current_time is not provided, get the current time
-        if current_time is None:
-            current_time = time.time()
-        
-        # Initialize last_update_time if this is the first update
-        if self.last_update_time == 0:
-            self.last_update_time = current_time
-        
-        # Calculate time delta since last update
-        dt = current_time - self.last_update_time
-        self.last_update_time = current_time
+        self.target_sharers = 1  # Ghosts heading for the same target this tick (set by EntityManager)
+        self.search_target = None  # Target of this ghost's last point search
+    
+    @property
+    def mode_code(self):
+        """current_mode as an enemy_store mode code."""
+        return int(self.slot.store.mode[self.slot.index])
+    
+    @property
+    def current_mode(self):
+        """patrol, chase, run away, investigate_sound"""
+        return MODE_NAMES[self.slot.store.mode[self.slot.index]]
+    
+    @current_mode.setter
+    def current_mode(self, mode):
+        self.slot.store.mode[self.slot.index] = MODE_CODES[mode]
+    
+    @property
+    def patrol_direction(self):
+        return self.slot.store.patrol_direction[self.slot.index]
+    
+    @patrol_direction.setter
+    def patrol_direction(self, direction):
+        self.slot.store.patrol_direction[self.slot.index] = (int(direction[0]), int(direction[1]))
+    
+    @property
+    def is_horizontal(self):
+        return bool(self.slot.store.is_horizontal[self.slot.index])
+    
+    @is_horizontal.setter
+    def is_horizontal(self, horizontal):
+        self.slot.store.is_horizontal[self.slot.index] = horizontal
+    
+    @property
+    def chase_timer(self):
+        """Ticks of chase left once the player is out of sight."""
+        return int(self.slot.store.chase_timer[self.slot.index])
+    
+    @chase_timer.setter
+    def chase_timer(self, timer):
+        self.slot.store.chase_timer[self.slot.index] = timer
+    
+    @property
+    def last_update_tick(self):
+        """Tick of the latest update_mode call, NEVER_UPDATED before the first."""
+        return int(self.slot.store.last_update_tick[self.slot.index])
+    
+    @last_update_tick.setter
+    def last_update_tick(self, tick):
+        self.slot.store.last_update_tick[self.slot.index] = tick
+    
+    @property
+    def sound_location(self):
+        location = self.slot.store.sound_location[self.slot.index]
+        return None if location[0] == NO_SOUND else tuple(location.tolist())
+    
+    @sound_location.setter
+    def sound_location(self, location):
+        self.slot.store.sound_location[self.slot.index] = (NO_SOUND, NO_SOUND) if location is None else location
+    
+    def update_mode(self, enemy_position, player_position, game_map, sound_position=None, current_tick=None,
+                    player_visible=None):
+        """
+        Update the AI mode based on the game state.
+        current_tick comes from the game's logical clock (Simulation.tick);
+        without one, every call counts as one tick. Timers never read the
+        wall clock, so a run replays identically at any speed.
+        player_visible can be passed in from a batched perceive() call.
+        """
+        # Read this enemy's row once; the store holds the state
+        store, i = self.slot.store, self.slot.index
+        mode = store.mode[i]
+        last_update_tick = store.last_update_tick[i]
+        
+        if current_tick is None:
+            current_tick = 0 if last_update_tick == NEVER_UPDATED else last_update_tick + 1
+        
+        # Initialize last_update_tick if this is the first update
+        if last_update_tick == NEVER_UPDATED:
+            last_update_tick = current_tick
+        
+        # Ticks since last update
+        dt = current_tick - last_update_tick
+        store.last_update_tick[i] = current_tick
         
         # Check if power pellet is active - this takes precedence over other modes
-        if game_map.is_power_pellet_active():
-            self.current_mode = "run away"
+        power_active = game_map.is_power_pellet_active()
+        if power_active:
+            store.mode[i] = RUN_AWAY
             return
         
         # If we were in run away mode but power pellet is no longer active, switch to patrol
-        if self.current_mode == "run away" and not game_map.is_power_pellet_active():
-            self.current_mode = "patrol"
+        if mode == RUN_AWAY and not power_active:
+            store.mode[i] = PATROL
             return
         
         # Check if enemy can see player
-        can_see_player = self.perception.can_see_player(enemy_position, player_position, game_map)
+        if player_visible is None:
+            player_visible = self.perception.can_see_player(enemy_position, player_position, game_map)
+        can_see_player = player_visible
         
         # Player spotted - start/continue chase
         if can_see_player:
-            self.current_mode = "chase"
-            self.chase_timer = CHASE_DURATION
+            store.mode[i] = CHASE
+            store.chase_timer[i] = CHASE_DURATION
             return
         
         # If sound is detected and we're not already investigating
-        if sound_position is not None and self.current_mode != "investigate_sound":
-            self.current_mode = "investigate_sound"
+        if sound_position is not None and mode != INVESTIGATE_SOUND:
+            store.mode[i] = INVESTIGATE_SOUND
             self.sound_location = sound_position
             return
         
         # If investigating sound and reached the location
-        if self.current_mode == "investigate_sound" and self.sound_location is not None:
-            if enemy_position[0] == self.sound_location[0] and enemy_position[1] == self.sound_location[1]:
+        if mode == INVESTIGATE_SOUND and store.sound_location[i, 0] != NO_SOUND:
+            if enemy_position[0] == store.sound_location[i, 0] and enemy_position[1] == store.sound_location[i, 1]:
                 # Reached the sound source, switch back to patrol
-                self.current_mode = "patrol"
+                store.mode[i] = PATROL
                 self.sound_location = None
                 return
         
         # Update chase timer if in chase mode
-        if self.current_mode == "chase":
-            self.chase_timer -= dt
-            if self.chase_timer <= 0:
+        if mode == CHASE:
+            store.chase_timer[i] -= dt
+            if store.chase_timer[i] <= 0:
                 # Chase timeout - go back to patrol
-                self.current_mode = "patrol"
-                self.chase_timer = 0
+                store.mode[i] = PATROL
+                store.chase_timer[i] = 0
     
     def decide_move(self, enemy_position, player_position, game_map):
         """Decide the next move for the enemy based on the current mode."""
-        if self.current_mode == "patrol":
+        mode = self.slot.store.mode[self.slot.index]
+        if mode == PATROL:
             return self.patrol(enemy_position, game_map)
-        elif self.current_mode == "chase":
+        elif mode == CHASE:
             return self.chase(enemy_position, player_position, game_map)
-        elif self.current_mode == "run away":
+        elif mode == RUN_AWAY:
             return self.run_away(enemy_position, player_position, game_map)
-        elif self.current_mode == "investigate_sound" and self.sound_location is not None:
+        elif mode == INVESTIGATE_SOUND and self.sound_location is not None:
             return self.investigate_sound(enemy_position, game_map)
         return self.patrol(enemy_position, game_map)  # Default to patrol
     
@@ -120,12 +220,42 @@ class EnemyAI:
         if self.sound_location is None:
             return self.patrol(enemy_position, game_map)
         
-        # Create distance map from the sound location
-        distance_map = self.create_distance_map(self.sound_location, game_map)
+        # The sound source stays put, so its flow field is cached for the whole investigation
+        if isinstance(game_map, Map) and game_map.path_table is None:
+            return self.follow_flow(game_map.sound_flow_field(self.sound_location), enemy_position)
         
-        # Find shortest path to sound location
-        best_move = (0, 0)
-        shortest_distance = float('inf')
+        return self.move_towards(enemy_position, self.sound_location, game_map)
+    
+    def move_towards(self, enemy_position, target_position, game_map):
+        """Return the first move along a shortest path to target_position."""
+        # Precomputed all-pairs table: a single lookup
+        path_table = game_map.path_table if isinstance(game_map, Map) else None
+        if path_table is not None:
+            step = path_table.next_step(enemy_position, target_position)
+            if step is not None:
+                return (step[1], step[0])
+        
+        if isinstance(game_map, Map):
+            # Shared per-target flow field: a single lookup per ghost, worth
+            # building when several ghosts want it (or free if already cached)
+            if (self.target_sharers >= FLOW_FIELD_MIN_SHARERS or
+                    game_map.cached_flow_field(target_position) is not None):
+                return self.follow_flow(game_map.flow_field(target_position), enemy_position)
+            # A lone ghost only needs its own next step, unless the target has
+            # stayed put (one field then serves every following tick) or the
+            # search grows too large (the field is repaired from the last one)
+            if tuple(target_position) != self.search_target:
+                self.search_target = tuple(target_position)
+                step = game_map.next_step(enemy_position, target_position, POINT_SEARCH_BUDGET)
+                if step is not None:
+                    return self.step_to_move(step)
+            return self.follow_flow(game_map.flow_field(target_position), enemy_position)
+        
+        distance_map = self.create_distance_map(target_position, game_map)
+        
+        # Find shortest path to the target
+        best_move = (0, 0)  # Stay put if the target cannot be reached
+        shortest_distance = pathfinding.UNREACHABLE
 
         for dx, dy in self.directions:
             new_x, new_y = enemy_position[0] + dx, enemy_position[1] + dy
@@ -136,80 +266,72 @@ class EnemyAI:
 
         return best_move
     
+    def follow_flow(self, field, enemy_position):
+        """Read this ghost's move off a flow field (see GridGraph.flow_field)."""
+        return self.step_to_move(field[enemy_position[0], enemy_position[1]])
+    
+    def step_to_move(self, code):
+        """Turn a NEIGHBOR_OFFSETS index (-1: none) into a move."""
+        if code < 0:
+            return (0, 0)
+        dx, dy = pathfinding.NEIGHBOR_OFFSETS[code]
+        return (dy, dx)
+    
     def create_distance_map(self, start_position, game_map):
-        """Creates a distance map using Dijkstra's algorithm from the start position."""
-        height, width = game_map.occupancy_map.shape
-        distance_map = [[float('inf') for _ in range(width)] for _ in range(height)]
-        distance_map[start_position[0]][start_position[1]] = 0
-        
-        priority_queue = []
-        heapq.heappush(priority_queue, (0, start_position[0], start_position[1]))
-        
-        while priority_queue:
-            current_distance, current_x, current_y = heapq.heappop(priority_queue)
-            
-            if current_distance > distance_map[current_x][current_y]:
-                continue
-            for dx, dy in self.directions:
-                new_x, new_y = current_x + dx, current_y + dy
-                if game_map.is_valid_move(new_x, new_y):
-                    new_distance = current_distance + 1
-                    if new_distance < distance_map[new_x][new_y]:
-                        distance_map[new_x][new_y] = new_distance
-                        heapq.heappush(priority_queue, (new_distance, new_x, new_y))
-        return distance_map
+        """
+        Return a distance map towards start_position.
+        Real maps serve it from their shared distance-field cache, so all
+        ghosts with the same target reuse one search per tick.
+        """
+        if isinstance(game_map, Map):
+            return game_map.distance_field(start_position)
+        return pathfinding.create_distance_map(start_position, game_map)
     
     def patrol(self, enemy_position, game_map):
         """Patrol mode: Move in a straight line until hit a wall, then change direction."""
+        direction = self.patrol_direction
+        
         # Try to move in current direction
-        new_x = enemy_position[0] + self.patrol_direction[1]
-        new_y = enemy_position[1] + self.patrol_direction[0]
+        new_x = enemy_position[0] + direction[1]
+        new_y = enemy_position[1] + direction[0]
         
         # If current move is valid, keep going in same direction
         if game_map.is_valid_move(new_x, new_y):
-            return self.patrol_direction
+            return direction
             
         # If we hit a wall, change direction
         if self.is_horizontal:
             # If moving horizontally (left/right), reverse direction
-            self.patrol_direction[1] *= -1
+            direction = (direction[0], -direction[1])
             
             # If still can't move, switch to vertical movement
-            new_x = enemy_position[0] + self.patrol_direction[1]
-            new_y = enemy_position[1] + self.patrol_direction[0]
+            new_x = enemy_position[0] + direction[1]
+            new_y = enemy_position[1] + direction[0]
             if not game_map.is_valid_move(new_x, new_y):
                 self.is_horizontal = False
-                self.patrol_direction = [1, 0]  # Start moving down
+                direction = (1, 0)  # Start moving down
         else:
             # If moving vertically (up/down), reverse direction
-            self.patrol_direction[0] *= -1
+            direction = (-direction[0], direction[1])
             
             # If still can't move, switch to horizontal movement
-            new_x = enemy_position[0] + self.patrol_direction[1]
-            new_y = enemy_position[1] + self.patrol_direction[0]
+            new_x = enemy_position[0] + direction[1]
+            new_y = enemy_position[1] + direction[0]
             if not game_map.is_valid_move(new_x, new_y):
                 self.is_horizontal = True
-                self.patrol_direction = [0, 1]
-        return self.patrol_direction
+                direction = (0, 1)
+        self.patrol_direction = direction
+        return direction
     
     def chase(self, enemy_position, player_position, game_map):
         """Chase mode: Move towards the player using the shortest path."""
-        distance_map = self.create_distance_map(player_position, game_map)
-        
-        best_move = (0, 0)
-        shortest_distance = float('inf')
-
-        for dx, dy in self.directions:
-            new_x, new_y = enemy_position[0] + dx, enemy_position[1] + dy
-            if game_map.is_valid_move(new_x, new_y):
-                if distance_map[new_x][new_y] < shortest_distance:
-                    shortest_distance = distance_map[new_x][new_y]
-                    best_move = (dy, dx)
-
-        return best_move
+        return self.move_towards(enemy_position, player_position, game_map)
     
     def run_away(self, enemy_position, player_position, game_map):
         """Run away mode: Move away from the player as far as possible."""
+        if isinstance(game_map, Map):
+            return self.follow_flow(game_map.escape_field(player_position), enemy_position)
+        
         player_distance_map = self.create_distance_map(player_position, game_map)
         
         # Find the best direction to maximize distance from player
@@ -221,7 +343,7 @@ class EnemyAI:
             new_x, new_y = enemy_position[0] + dx, enemy_position[1] + dy
             if game_map.is_valid_move(new_x, new_y):
                 distance = player_distance_map[new_x][new_y]
-                if distance == float('inf'):
+                if distance == pathfinding.UNREACHABLE:
                     return (dy, dx)
                 
                 if distance > max_distance:
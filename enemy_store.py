@@ -0,0 +1,178 @@
+import numpy as np
+from config import CHASE_DURATION, ENEMY_SPEED_FACTOR
+from map import Map
+from spatial_hash import SpatialHash
+
+# Enemy mode codes, and the names EnemyAI.current_mode has always used for them
+PATROL = 0
+CHASE = 1
+RUN_AWAY = 2
+INVESTIGATE_SOUND = 3
+MODE_NAMES = ("patrol", "chase", "run away", "investigate_sound")
+MODE_CODES = {name: code for code, name in enumerate(MODE_NAMES)}
+
+NO_SOUND = -1  # sound_location row/col when there is none
+NEVER_UPDATED = -1  # last_update_tick before the first update_mode call
+
+# Per-row state in numpy columns, and in plain lists of tuples
+ARRAY_FIELDS = ('position', 'previous_position', 'move_counter', 'mode', 'chase_timer',
+                'last_update_tick', 'is_horizontal', 'sound_location')
+ROW_FIELDS = ('cells', 'previous_cells', 'patrol_direction')
+
+class EnemySlot:
+    """Where one enemy's state lives: a store and a row in it. Enemy and EnemyAI views share one."""
+
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+
+class EnemyStore:
+    """
+    Structure-of-arrays state for a group of enemies.
+
+    Row i of every array belongs to the i-th live enemy; rows past `count`
+    are spare capacity. Enemy and EnemyAI are thin views onto one row each,
+    while EntityManager reads and writes whole columns at once for movement
+    and collisions. Positions are [row, col]; patrol directions keep
+    EnemyAI's [col, row] order. `cells` and `previous_cells` hold the
+    positions again as (row, col) tuples and `patrol_direction` is a list of
+    tuples, so per-enemy reads hand back a stored tuple instead of building
+    one. `spatial` indexes the slots by position for per-cell and
+    nearest-enemy queries; every position write goes through add, place,
+    place_previous or advance so the copies stay in step.
+    """
+
+    def __init__(self, capacity=4):
+        self.count = 0
+        self.slots = []
+        self.cells = []
+        self.previous_cells = []
+        self.patrol_direction = []
+        self.spatial = SpatialHash()
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        fields = {
+            'position': np.zeros((capacity, 2), dtype=np.int32),
+            'previous_position': np.zeros((capacity, 2), dtype=np.int32),
+            'move_counter': np.zeros(capacity, dtype=np.int32),
+            'mode': np.zeros(capacity, dtype=np.int8),
+            'chase_timer': np.zeros(capacity, dtype=np.int32),
+            'last_update_tick': np.zeros(capacity, dtype=np.int64),
+            'is_horizontal': np.zeros(capacity, dtype=bool),
+            'sound_location': np.full((capacity, 2), NO_SOUND, dtype=np.int32),
+        }
+        for name, array in fields.items():
+            old = getattr(self, name, None)
+            if old is not None:
+                array[:self.count] = old[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def add(self, x, y):
+        """Append an enemy at [x, y] with fresh AI state and return its slot."""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        i = self.count
+        cell = (int(x), int(y))
+        self.position[i] = self.previous_position[i] = cell
+        self.cells.append(cell)
+        self.previous_cells.append(cell)
+        self.patrol_direction.append((0, 1))
+        self.move_counter[i] = 0
+        self.mode[i] = PATROL
+        self.chase_timer[i] = CHASE_DURATION
+        self.last_update_tick[i] = NEVER_UPDATED
+        self.is_horizontal[i] = True
+        self.sound_location[i] = NO_SOUND
+        self.count += 1
+        slot = EnemySlot(self, i)
+        self.slots.append(slot)
+        self.spatial.insert(slot, cell)
+        return slot
+
+    def place(self, index, position):
+        """Put enemy `index` at position [row, col]."""
+        cell = (int(position[0]), int(position[1]))
+        self.position[index] = cell
+        self.cells[index] = cell
+        self.spatial.move(self.slots[index], cell)
+
+    def place_previous(self, index, position):
+        """Set the cell enemy `index` was on before its latest move."""
+        cell = (int(position[0]), int(position[1]))
+        self.previous_position[index] = cell
+        self.previous_cells[index] = cell
+
+    def remove(self, mask):
+        """
+        Drop the enemies where mask is True and close the gaps. Removed enemies
+        keep working as standalone objects: their state moves to a store of their own.
+        """
+        mask = np.asarray(mask, dtype=bool)
+        keep = ~mask
+        for slot in [slot for slot, gone in zip(self.slots, mask) if gone]:
+            detached = EnemyStore(capacity=1)
+            detached._copy_row(self, slot.index)
+            slot.store, slot.index = detached, 0
+            detached.slots.append(slot)
+            self.spatial.remove(slot)
+            detached.spatial.insert(slot, detached.cells[0])
+
+        n = self.count
+        for name in ARRAY_FIELDS:
+            array = getattr(self, name)
+            kept = array[:n][keep]
+            array[:len(kept)] = kept
+        for name in ROW_FIELDS:
+            setattr(self, name, [value for value, stay in zip(getattr(self, name), keep) if stay])
+        self.slots = [slot for slot, stay in zip(self.slots, keep) if stay]
+        for i, slot in enumerate(self.slots):
+            slot.index = i
+        self.count = len(self.slots)
+
+    def _copy_row(self, other, index):
+        for name in ARRAY_FIELDS:
+            getattr(self, name)[0] = getattr(other, name)[index]
+        for name in ROW_FIELDS:
+            setattr(self, name, [getattr(other, name)[index]])
+        self.count = 1
+
+    def advance(self, directions, game_map):
+        """
+        Apply one tick of movement to every enemy: each direction is (dx, dy)
+        as returned by EnemyAI, but only enemies whose move counter reaches
+        ENEMY_SPEED_FACTOR actually step. Returns the mask of enemies that moved.
+        """
+        n = self.count
+        counters = self.move_counter[:n]
+        counters += 1
+        due = counters >= ENEMY_SPEED_FACTOR
+        counters[due] = 0
+        if not due.any():
+            return due
+
+        position = self.position[:n]
+        targets = position + np.array(directions, dtype=np.int32).reshape(n, 2)[:, ::-1]  # (dx, dy) -> (row, col)
+        rows, cols = targets[:, 0], targets[:, 1]
+
+        if isinstance(game_map, Map):
+            height, width = game_map.occupancy_map.shape
+            inside = (rows >= 0) & (rows < height) & (cols >= 0) & (cols < width)
+            cells = np.take(game_map.occupancy_map, rows * width + cols, mode='clip')
+            moved = due & inside & (cells != Map.WALL)
+        else:
+            moved = np.array([bool(due[i]) and bool(game_map.is_valid_move(int(rows[i]), int(cols[i])))
+                              for i in range(n)], dtype=bool)
+
+        self.previous_position[:n] = np.where(moved[:, None], position, self.previous_position[:n])
+        position[:] = np.where(moved[:, None], targets, position)
+        for i, (row, col) in zip(np.flatnonzero(moved).tolist(), targets[moved].tolist()):
+            cell = (row, col)
+            self.previous_cells[i] = self.cells[i]
+            self.cells[i] = cell
+            self.spatial.move(self.slots[i], cell)
+        return moved
@@ -1,11 +1,15 @@
 import random
+import numpy as np
 from config import *
 from enemy_ai import EnemyAI
+from enemy_store import EnemyStore, PATROL, CHASE, RUN_AWAY, INVESTIGATE_SOUND, NO_SOUND
 
 class Player:
+    __slots__ = ('position', 'current_direction', 'intended_direction', 'renderer', 'entity_manager')
+    
     def __init__(self, x=1, y=1):
         """Initialize player entity with a position and movement state."""
-        self.position = [x, y]
+        self.position = (x, y)  # (row, col); replaced, never mutated
         self.current_direction = None
         self.intended_direction = None  # Store the last pressed key direction
         self.renderer = None  # Will be set by EntityManager
@@ -19,7 +23,7 @@ class Player:
                 new_y = self.position[1] + test_direction[0]
                 
                 if game_map.is_valid_move(new_x, new_y):
-                    self.position = [new_x, new_y]
+                    self.position = (new_x, new_y)
                     self.current_direction = test_direction if test_direction == self.intended_direction else direction                    
                     self._handle_collection(new_x, new_y, game_map)
                     return True
@@ -28,28 +32,61 @@ class Player:
     # Handle pellet collection and trigger appropriate effects
     def _handle_collection(self, x, y, game_map):
         collected, is_power, is_sound = game_map.collect_point(x, y)
-        if collected and is_sound and self.renderer:
-            self.renderer.start_sound_effect(x, y)
-            # Notify entity manager about sound pellet
+        if collected and is_sound:
+            if self.renderer:
+                self.renderer.start_sound_effect(x, y)
+            # Notify entity manager about sound pellet (also when running headless)
             if self.entity_manager:
                 self.entity_manager.sound_detected(x, y)
 
 class Enemy:
-    def __init__(self, x=None, y=None):
-        """Initialize enemy entity with a position and AI controller."""
-        self.position = [x, y]
-        self.previous_position = [x, y]  # Initialize previous position
-        self.ai = EnemyAI()  # AI system for enemy behavior
-        self.move_counter = 0  # Counter for movement speed control
+    __slots__ = ('slot', 'ai', 'next_direction', 'rng')
+    
+    def __init__(self, x=None, y=None, slot=None, rng=None):
+        """
+        Initialize enemy entity with a position and AI controller.
+        Its state lives in an EnemyStore row (slot); a standalone enemy gets a store of its own.
+        Random moves are drawn from rng (a random.Random), a private one if not given.
+        """
+        self.slot = slot if slot is not None else EnemyStore(capacity=1).add(x, y)
+        self.rng = rng if rng is not None else random.Random()
+        self.ai = EnemyAI(self.slot)  # AI system for enemy behavior
         self.next_direction = None  # Store next planned direction
+    
+    @property
+    def position(self):
+        """(row, col), read from the store row."""
+        return self.slot.store.cells[self.slot.index]
+    
+    @position.setter
+    def position(self, position):
+        self.slot.store.place(self.slot.index, position)
+    
+    @property
+    def previous_position(self):
+        return self.slot.store.previous_cells[self.slot.index]
+    
+    @previous_position.setter
+    def previous_position(self, position):
+        self.slot.store.place_previous(self.slot.index, position)
+    
+    @property
+    def move_counter(self):
+        """Counter for movement speed control"""
+        return int(self.slot.store.move_counter[self.slot.index])
+    
+    @move_counter.setter
+    def move_counter(self, counter):
+        self.slot.store.move_counter[self.slot.index] = counter
 
-    def move(self, game_map, player_position=None, sound_position=None):
+    def move(self, game_map, player_position=None, sound_position=None, current_tick=None, player_visible=None):
         """
         Move the enemy based on AI or random movement.
         Always updates AI decisions but applies movement at a reduced rate.
         Returns True if movement was successful, False otherwise.
         """    
-        self.next_direction = self._get_movement_direction(game_map, player_position, sound_position)
+        self.next_direction = self._get_movement_direction(game_map, player_position, sound_position, current_tick,
+                                                           player_visible)
         
         # Only apply movement at reduced speed determined by ENEMY_SPEED_FACTOR
         self.move_counter += 1
@@ -58,39 +95,45 @@ class Enemy:
             return self._apply_move(self.next_direction, game_map)
         return False
     
-    def _get_movement_direction(self, game_map, player_position, sound_position=None):
+    def _get_movement_direction(self, game_map, player_position, sound_position=None, current_tick=None,
+                                player_visible=None):
         """Determine which direction the enemy should move."""
         if player_position is not None:
             # Update AI mode based on perception
-            self.ai.update_mode(self.position, player_position, game_map, sound_position)
+            position = self.position
+            self.ai.update_mode(position, player_position, game_map, sound_position, current_tick,
+                                player_visible)
             
             # Get movement direction from AI
-            direction = self.ai.decide_move(self.position, player_position, game_map)
+            direction = self.ai.decide_move(position, player_position, game_map)
             
             # Fallback to random if AI returns None
             if direction is None:
-                direction = random.choice(list(DIRECTIONS.values()))
+                direction = self.rng.choice(list(DIRECTIONS.values()))
         else:
             # Random movement if no player position
-            direction = random.choice(list(DIRECTIONS.values()))
+            direction = self.rng.choice(list(DIRECTIONS.values()))
             
         return direction
     
     def _apply_move(self, direction, game_map):
         """Apply the movement in the given direction if valid."""
-        new_x = self.position[0] + direction[1]
-        new_y = self.position[1] + direction[0]
+        position = self.position
+        new_x = position[0] + direction[1]
+        new_y = position[1] + direction[0]
         
         if game_map.is_valid_move(new_x, new_y):
             # Store previous position before moving
-            self.previous_position = self.position.copy()
-            self.position = [new_x, new_y]
+            self.previous_position = position
+            self.position = (new_x, new_y)
             return True
         return False
 
 class EntityManager:
-    def __init__(self, game_map, num_enemies=1):
-        self.player = Player()
+    def __init__(self, game_map, num_enemies=1, player_spawn=None, rng=None):
+        self.rng = rng if rng is not None else random.Random()  # Shared by this game's enemies
+        self.player = Player(*player_spawn) if player_spawn is not None else Player()
+        self.enemy_store = EnemyStore()  # Enemy state as arrays; self.enemies holds views onto its rows
         self.enemies = []
         self.game_map = game_map
         self.renderer = None  # Will be set by Game class
@@ -104,7 +147,7 @@ class EntityManager:
         self.player.renderer = renderer
     
     def add_enemy(self, x, y):
-        self.enemies.append(Enemy(x, y))
+        self.enemies.append(Enemy(slot=self.enemy_store.add(x, y), rng=self.rng))
     
     def continue_player_movement(self):
         if self.player.current_direction:
@@ -112,84 +155,90 @@ class EntityManager:
     
     def sound_detected(self, x, y):
         """Handle sound pellet detection"""
-        self.sound_position = [x, y]
-        
-        # Find closest enemy not in run away mode
-        closest_enemy = None
-        min_distance = float('inf')
+        self.sound_position = (x, y)
         
         # Find the closest enemy that is not in run away mode
-        for enemy in self.enemies:
-            if enemy.ai.current_mode != "run away":
-                distance = enemy.ai.perception.calculate_distance(enemy.position, [x, y])
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_enemy = enemy
+        store = self.enemy_store
+        closest = store.spatial.nearest((x, y), accept=lambda slot: store.mode[slot.index] != RUN_AWAY)
+        closest_enemy = self.enemies[closest[0].index] if closest else None
         
         # Set closest enemy to investigate
         if closest_enemy:
             closest_enemy.ai.current_mode = "investigate_sound"
-            closest_enemy.ai.sound_location = [x, y]
+            closest_enemy.ai.sound_location = (x, y)
             
             # Clear the sound position so other enemies don't also investigate
             self.sound_position = None
     
-    def move_enemies(self):
+    def move_enemies(self, current_tick=None):
+        """Move every enemy; current_tick (the logical clock) drives AI timers."""
         player_pos = self.player.position
+        visible = self._perceive_player()
+        
+        store, n = self.enemy_store, self.enemy_store.count
+        
+        # Chasing ghosts (as of the start of the tick) share the player as their target
+        chasers = int((store.mode[:n] == CHASE).sum())
         
-        for enemy in self.enemies:
-            # Check if enemy reached sound location
-            if enemy.ai.current_mode == "investigate_sound" and enemy.ai.sound_location:
-                if enemy.position[0] == enemy.ai.sound_location[0] and enemy.position[1] == enemy.ai.sound_location[1]:
-                    enemy.ai.current_mode = "patrol"
-                    enemy.ai.sound_location = None
-                    
-            enemy.move(self.game_map, player_pos, self.sound_position)
+        # Ghosts standing on the sound they were investigating go back to patrol
+        reached = (store.mode[:n] == INVESTIGATE_SOUND) & (store.sound_location[:n] == store.position[:n]).all(axis=1)
+        store.mode[:n][reached] = PATROL
+        store.sound_location[:n][reached] = NO_SOUND
+        
+        for i, enemy in enumerate(self.enemies):
+            enemy.ai.target_sharers = chasers
+            enemy.next_direction = enemy._get_movement_direction(self.game_map, player_pos, self.sound_position,
+                                                                 current_tick, bool(visible[i]))
+        
+        # Decisions are per enemy; applying them is one pass over the store
+        store.advance([enemy.next_direction for enemy in self.enemies], self.game_map)
     
     def check_collision(self):
         player_pos = self.player.position
-        player_prev_pos = [player_pos[0] - (self.player.current_direction[1] if self.player.current_direction else 0),
-                           player_pos[1] - (self.player.current_direction[0] if self.player.current_direction else 0)]
+        player_prev_pos = (player_pos[0] - (self.player.current_direction[1] if self.player.current_direction else 0),
+                           player_pos[1] - (self.player.current_direction[0] if self.player.current_direction else 0))
         
-        enemies_to_remove = []
-        collision_occurred = False
+        store = self.enemy_store
         
-        for i, enemy in enumerate(self.enemies):
-            # Check if player and enemy are in the same position
-            position_match = enemy.position == player_pos
-            
-            # Check if the passed through the enemy
-            enemy_prev_pos = getattr(enemy, 'previous_position', None)
-            pass_through = False
-            if enemy_prev_pos:
-                pass_through = enemy.position == player_prev_pos and enemy_prev_pos == player_pos
-            
-            # If any collision type occurred
-            if position_match or pass_through:
-                # If enemy is in run away mode, player can eat the enemy
-                if enemy.ai.current_mode == "run away":
-                    enemies_to_remove.append(i)
-                    self.score += 200  # Award points for eating an enemy
-                else:
-                    collision_occurred = True
-        # Remove eaten enemies
-        for i in sorted(enemies_to_remove, reverse=True):
-            del self.enemies[i]
+        # Same cell, or the player and an enemy passed through each other
+        hits = {slot.index for slot in store.spatial.at(player_pos)}
+        hits.update(slot.index for slot in store.spatial.at(player_prev_pos)
+                    if store.previous_cells[slot.index] == player_pos)
+        if not hits:
+            return False
+        hit = np.zeros(store.count, dtype=bool)
+        hit[list(hits)] = True
+        
+        # Enemies in run away mode get eaten, any other hit is a collision
+        running_away = store.mode[:store.count] == RUN_AWAY
+        eaten = hit & running_away
+        collision_occurred = bool((hit & ~running_away).any())
+        
+        if eaten.any():
+            self.score += 200 * int(eaten.sum())  # Award points for eating an enemy
+            self.enemies = [enemy for enemy, gone in zip(self.enemies, eaten) if not gone]
+            store.remove(eaten)
         
         return collision_occurred
     
+    def _perceive_player(self):
+        """Which enemies can see the player, for all of them in one batched call."""
+        if not self.enemies:
+            return []
+        store = self.enemy_store
+        visible, _ = self.enemies[0].ai.perception.perceive(
+            store.position[:store.count], [self.player.position], self.game_map)
+        return visible[:, 0]
+    
     def get_enemy_vision_data(self):
         vision_data = []
-        player_pos = self.player.position
+        visible = self._perceive_player()
         
-        for enemy in self.enemies:
+        for i, enemy in enumerate(self.enemies):
             # Get enemy vision data
-            enemy_position = enemy.position
-            player_in_sight = enemy.ai.perception.can_see_player(enemy_position, player_pos, self.game_map)
-            
             vision_data.append({
-                'position': enemy_position,
-                'player_in_sight': player_in_sight,
+                'position': enemy.position,
+                'player_in_sight': bool(visible[i]),
                 'mode': enemy.ai.current_mode
             })
             
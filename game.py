@@ -1,7 +1,8 @@
 import pygame
-from config import DIRECTIONS, GAME_TITLE, FPS, GAME_SPEED, DISTANCE_MAP_VISIBLE
-from map import Map
-from entities import EntityManager
+from text_cache import get_font, render_text
+from config import (DIRECTIONS, GAME_TITLE, FPS, GAME_SPEED, DISTANCE_MAP_VISIBLE, MAX_UPDATES_PER_FRAME,
+                    RENDER_INTERPOLATION)
+from simulation import Simulation
 from render import Renderer
 import sys
 
@@ -12,16 +13,9 @@ class GameOverScreen:
         self.height = height
         self.score = score
         
-        # Load or create fonts
-        try:
-            self.title_font = pygame.font.Font("fonts/arcade.ttf", 80)  # Arcade-style font if available
-        except:
-            self.title_font = pygame.font.Font(None, 80)
-            
-        try:
-            self.menu_font = pygame.font.Font("fonts/arcade.ttf", 36)
-        except:
-            self.menu_font = pygame.font.Font(None, 40)
+        # Load or create fonts (shared through the text cache)
+        self.title_font = get_font("fonts/arcade.ttf", 80)  # Arcade-style font if available
+        self.menu_font = get_font("fonts/arcade.ttf", 36, fallback_size=40)
             
         # Animation properties
         self.flash_speed = 500  # Flash interval in milliseconds
@@ -125,7 +119,7 @@ class GameOverScreen:
 
     def display_score(self):
         """Display the final score"""
-        score_text = self.menu_font.render(f"FINAL SCORE: {self.score}", True, self.colors["white"])
+        score_text = render_text(self.menu_font, f"FINAL SCORE: {self.score}", self.colors["white"])
         score_rect = score_text.get_rect(center=(self.width // 2, self.height // 2 + 50))
         self.screen.blit(score_text, score_rect)
 
@@ -156,8 +150,8 @@ class GameOverScreen:
 
             if self.show_text:
                 # Draw with shadow for better visibility
-                game_over_shadow = self.title_font.render(self.message, True, (100, 0, 0))
-                game_over_text = self.title_font.render(self.message, True, self.colors["red"])
+                game_over_shadow = render_text(self.title_font, self.message, (100, 0, 0))
+                game_over_text = render_text(self.title_font, self.message, self.colors["red"])
                 
                 shadow_pos = (self.width // 2 - game_over_shadow.get_width() // 2 + 3, 
                               self.height // 4 + 3)
@@ -193,7 +187,7 @@ class GameOverScreen:
             mouse_pos = pygame.mouse.get_pos()
             
             # Restart button
-            restart_text = self.menu_font.render("RESTART", True, self.colors["yellow"])
+            restart_text = render_text(self.menu_font, "RESTART", self.colors["yellow"])
             restart_rect = restart_text.get_rect(center=(self.width // 2, self.height * 0.7))
             
             # Highlight on hover
@@ -204,7 +198,7 @@ class GameOverScreen:
             self.screen.blit(restart_text, restart_rect)
             
             # Quit button
-            quit_text = self.menu_font.render("QUIT", True, self.colors["yellow"])
+            quit_text = render_text(self.menu_font, "QUIT", self.colors["yellow"])
             quit_rect = quit_text.get_rect(center=(self.width // 2, self.height * 0.8))
             
             # Highlight on hover
@@ -248,16 +242,9 @@ class StartScreen:
         self.width = width
         self.height = height
         
-        # Load or create fonts
-        try:
-            self.title_font = pygame.font.Font("fonts/arcade.ttf", 80)  # Arcade-style font if available
-        except:
-            self.title_font = pygame.font.Font(None, 80)
-            
-        try:
-            self.menu_font = pygame.font.Font("fonts/arcade.ttf", 36)
-        except:
-            self.menu_font = pygame.font.Font(None, 40)
+        # Load or create fonts (shared through the text cache)
+        self.title_font = get_font("fonts/arcade.ttf", 80)  # Arcade-style font if available
+        self.menu_font = get_font("fonts/arcade.ttf", 36, fallback_size=40)
             
         # Animation properties
         self.flash_speed = 500  # Flash interval in milliseconds
@@ -371,7 +358,7 @@ class StartScreen:
         self.screen.blit(overlay, (0, 0))
         
         # Title
-        instr_title = self.menu_font.render("INSTRUCTIONS", True, self.colors["yellow"])
+        instr_title = render_text(self.menu_font, "INSTRUCTIONS", self.colors["yellow"])
         title_rect = instr_title.get_rect(center=(self.width // 2, 80))
         self.screen.blit(instr_title, title_rect)
         
@@ -386,13 +373,13 @@ class StartScreen:
         
         y_pos = 150
         for instruction in instructions:
-            line = self.menu_font.render(instruction, True, self.colors["white"])
+            line = render_text(self.menu_font, instruction, self.colors["white"])
             line_rect = line.get_rect(center=(self.width // 2, y_pos))
             self.screen.blit(line, line_rect)
             y_pos += 50
         
         # Back button
-        back_text = self.menu_font.render("BACK", True, self.colors["cyan"])
+        back_text = render_text(self.menu_font, "BACK", self.colors["cyan"])
         back_rect = back_text.get_rect(center=(self.width // 2, self.height - 100))
         
         # Highlight on hover
@@ -444,8 +431,8 @@ class StartScreen:
                 
             if self.show_text:
                 # Draw with shadow for better visibility
-                title_shadow = self.title_font.render("PERCEPTRON", True, (50, 50, 100))
-                title_text = self.title_font.render("PERCEPTRON", True, self.colors["yellow"])
+                title_shadow = render_text(self.title_font, "PERCEPTRON", (50, 50, 100))
+                title_text = render_text(self.title_font, "PERCEPTRON", self.colors["yellow"])
                 
                 shadow_pos = (self.width // 2 - title_shadow.get_width() // 2 + 3, 
                               self.height // 5 + 3)
@@ -474,7 +461,7 @@ class StartScreen:
             base_y = self.height // 2 + 50
             
             # Start button
-            start_text = self.menu_font.render("START GAME", True, self.colors["yellow"])
+            start_text = render_text(self.menu_font, "START GAME", self.colors["yellow"])
             start_rect = start_text.get_rect(center=(self.width // 2, base_y))
             
             # Highlight on hover
@@ -485,7 +472,7 @@ class StartScreen:
             self.screen.blit(start_text, start_rect)
             
             # Instructions button
-            inst_text = self.menu_font.render("INSTRUCTIONS", True, self.colors["yellow"])
+            inst_text = render_text(self.menu_font, "INSTRUCTIONS", self.colors["yellow"])
             inst_rect = inst_text.get_rect(center=(self.width // 2, base_y + button_spacing))
             
             # Highlight on hover
@@ -496,7 +483,7 @@ class StartScreen:
             self.screen.blit(inst_text, inst_rect)
             
             # Quit button
-            quit_text = self.menu_font.render("QUIT", True, self.colors["yellow"])
+            quit_text = render_text(self.menu_font, "QUIT", self.colors["yellow"])
             quit_rect = quit_text.get_rect(center=(self.width // 2, base_y + button_spacing * 2))
             
             # Highlight on hover
@@ -541,17 +528,13 @@ class Game:
         pygame.display.set_caption(GAME_TITLE)
         
         # Create game components
-        self.game_map = Map()
-        self.entity_manager = EntityManager(self.game_map)
+        self.simulation = Simulation()
         self.renderer = Renderer()
         screen_width = self.renderer.screen.get_width()
         screen_height = self.renderer.screen.get_height()
         start_screen = StartScreen(self.renderer.screen, screen_width, screen_height)
         start_screen.display()
         
-        # Add enemies to the game
-        self._setup_enemies()
-        
         # Connect renderer to entity manager for sound effects
         self.entity_manager.set_renderer(self.renderer)
         
@@ -560,25 +543,31 @@ class Game:
         self.show_distance_map = DISTANCE_MAP_VISIBLE
         self.current_distance_map = None
         
-        # Time tracking
+        # Time tracking: the simulation advances in fixed steps, frames are drawn as needed
         self.clock = pygame.time.Clock()
-        self.last_update_time = 0
         self.update_interval = 1000 / GAME_SPEED  # Milliseconds between updates
+        self.accumulator = 0  # Milliseconds of game time not yet simulated
+        self.frame_time = pygame.time.get_ticks()  # When the accumulator was last fed
+        self.needs_render = True  # Game state or input changed since the last drawn frame
+        self.last_frame_key = None
+        self.interpolate = RENDER_INTERPOLATION
+        self.tick_start_positions = None  # (player, enemies) before the latest update, for interpolation
         
         # Score tracking
         self.score = 0
     
-    def _setup_enemies(self):
-        """Set up enemy entities in the game."""
-        self.entity_manager.add_enemy(x=5, y=11)
-        # Add more enemies as needed
-        self.entity_manager.add_enemy(x=15, y=11)
-        self.entity_manager.add_enemy(x=30, y=11)
-        self.entity_manager.add_enemy(x=20, y=11)
+    @property
+    def game_map(self):
+        return self.simulation.game_map
+    
+    @property
+    def entity_manager(self):
+        return self.simulation.entity_manager
 
     def handle_events(self):
         """Handle user input events."""
         for event in pygame.event.get():
+            self.needs_render = True  # Input, exposure or resizing can all change the picture
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
@@ -595,14 +584,7 @@ class Game:
     
     def _process_movement_input(self, new_direction):
         """Process player movement input."""
-        player = self.entity_manager.player
-        player.intended_direction = new_direction
-        
-        # Only set current_direction if the move is valid
-        new_x = player.position[0] + new_direction[1]
-        new_y = player.position[1] + new_direction[0]
-        if self.game_map.is_valid_move(new_x, new_y):
-            player.current_direction = new_direction
+        self.simulation.set_direction(new_direction)
     
     def _toggle_distance_map(self):
         """Toggle the distance map visualization on/off."""
@@ -614,9 +596,9 @@ class Game:
     def _update_distance_map(self):
         """Update the distance map for visualization."""
         if len(self.entity_manager.enemies) > 0:
-            enemy = self.entity_manager.enemies[0]
+            # Shares the cached field the chasing ghosts use this tick
             player_pos = self.entity_manager.player.position
-            self.current_distance_map = enemy.ai.create_distance_map(player_pos, self.game_map)
+            self.current_distance_map = self.game_map.distance_field(player_pos)
             
     def show_game_over_screen(self, message):
         """Display an enhanced Game Over screen with the given message."""
@@ -639,33 +621,22 @@ class Game:
     
     def update_score(self):
         """Update the game score based on collected dots and power pellets."""
-        # Calculate score from map collections
-        map_score = 0
-        try:
-            map_score = self.game_map.dots_collected * 10  # 10 points per dot
-            # Add power pellet points if applicable
-            map_score += self.game_map.power_pellets_collected * 50  # 50 points per power pellet
-        except AttributeError:
-            # If these attributes don't exist, use a placeholder
-            map_score = 0
-        
-        # Add the entity manager's score (points from eating enemies)
-        self.score = map_score + self.entity_manager.score
+        # 10 points per dot, 50 per power pellet, plus points from eating enemies
+        self.score = self.simulation.score
     
     def reset_game(self):
         """Reset the game to start a new round."""
-        # Reset map
-        self.game_map = Map()
-        
-        # Reset entities
-        self.entity_manager = EntityManager(self.game_map)
+        # Reset map and entities
+        self.simulation = Simulation()
         self.entity_manager.set_renderer(self.renderer)
-        self._setup_enemies()
         
         # Reset game state
         self.show_distance_map = DISTANCE_MAP_VISIBLE
         self.current_distance_map = None
-        self.last_update_time = pygame.time.get_ticks()
+        self.accumulator = 0
+        self.frame_time = pygame.time.get_ticks()
+        self.needs_render = True
+        self.tick_start_positions = None
         self.score = 0
         
         # Continue running
@@ -673,44 +644,81 @@ class Game:
     
     def update(self):
         """Update game state for one time step."""
-        self.game_map.update()
+        if self.interpolate:
+            store = self.entity_manager.enemy_store
+            self.tick_start_positions = (self.entity_manager.player.position, store.position[:store.count].copy())
+        self.needs_render = True
+        status = self.simulation.step()
         self.update_score()
-        self.entity_manager.continue_player_movement()
         if self.show_distance_map:
             self._update_distance_map()
-        self.entity_manager.move_enemies()   
-        self._check_game_end_conditions()
+        self._check_game_end_conditions(status)
     
                 
-    def _check_game_end_conditions(self):
+    def _check_game_end_conditions(self, status):
         """Check if the game should end."""
-        if self.entity_manager.check_collision():
+        if status == Simulation.LOST:
             self.show_game_over_screen("GAME OVER")
-    
-        if self.game_map.check_win():
+        elif status == Simulation.WON:
             self.show_game_over_screen("YOU WIN!")
     
-    def render(self):
-        """Render the current game state."""
+    def render(self, alpha=None):
+        """
+        Render the current game state. alpha is the fraction of the next tick
+        already elapsed; given with interpolation on, entities are drawn
+        partway along their last step.
+        """
+        interpolation = None
+        if alpha is not None and self.tick_start_positions is not None:
+            interpolation = (alpha,) + self.tick_start_positions
         self.renderer.render(
             self.game_map, 
             self.entity_manager, 
             show_distance_map=self.show_distance_map, 
-            distance_map=self.current_distance_map
+            distance_map=self.current_distance_map,
+            interpolation=interpolation
         )
     
+    def advance(self, elapsed):
+        """
+        Feed elapsed milliseconds into the accumulator and run every whole
+        tick it now holds, at most MAX_UPDATES_PER_FRAME of them. A longer
+        backlog (a stall, a slow machine) is dropped instead of replayed, so
+        the game slows down rather than spiralling. Returns the ticks run.
+        """
+        self.accumulator += elapsed
+        steps = 0
+        while self.running and self.accumulator >= self.update_interval and steps < MAX_UPDATES_PER_FRAME:
+            self.accumulator -= self.update_interval
+            self.update()
+            steps += 1
+        if self.accumulator >= self.update_interval:
+            self.accumulator %= self.update_interval
+        return steps
+    
     def run(self):
-        """Main game loop."""
+        """
+        Main game loop: a fixed-timestep simulation decoupled from drawing.
+        Frames are only drawn when the game state, input or an animation
+        changed; with interpolation every frame slides entities between cells.
+        """
+        self.frame_time = pygame.time.get_ticks()
         while self.running:
             self.handle_events()
             
             # Update game at fixed time intervals
             current_time = pygame.time.get_ticks()
-            if current_time - self.last_update_time >= self.update_interval:
-                self.update()
-                self.last_update_time = current_time
-
-            self.render()
+            elapsed, self.frame_time = current_time - self.frame_time, current_time
+            self.advance(elapsed)
+            
+            if self.interpolate:
+                self.render(self.accumulator / self.update_interval)
+            else:
+                frame_key = self.renderer.frame_key(self.entity_manager)
+                if self.needs_render or frame_key is None or frame_key != self.last_frame_key:
+                    self.render()
+                    self.last_frame_key = frame_key
+            self.needs_render = False
             self.clock.tick(FPS)
         
         pygame.quit()
@@ -1,4 +1,5 @@
 import pygame
+from text_cache import get_font, render_text
 import math
 import random
 
@@ -9,16 +10,9 @@ class GameOverScreen:
         self.height = height
         self.score = score
         
-        # Load or create fonts
-        try:
-            self.title_font = pygame.font.Font("fonts/arcade.ttf", 80)  # Arcade-style font if available
-        except:
-            self.title_font = pygame.font.Font(None, 80)
-            
-        try:
-            self.menu_font = pygame.font.Font("fonts/arcade.ttf", 36)
-        except:
-            self.menu_font = pygame.font.Font(None, 40)
+        # Load or create fonts (shared through the text cache)
+        self.title_font = get_font("fonts/arcade.ttf", 80)  # Arcade-style font if available
+        self.menu_font = get_font("fonts/arcade.ttf", 36, fallback_size=40)
             
         # Animation properties
         self.flash_speed = 500  # Flash interval in milliseconds
@@ -115,14 +109,14 @@ class GameOverScreen:
 
     def display_score(self):
         """Display the final score"""
-        score_text = self.menu_font.render(f"FINAL SCORE: {self.score}", True, self.colors["white"])
+        score_text = render_text(self.menu_font, f"FINAL SCORE: {self.score}", self.colors["white"])
         score_rect = score_text.get_rect(center=(self.width // 2, self.height // 2))
         self.screen.blit(score_text, score_rect)
 
     def display_high_scores(self):
         """Display high scores section"""
         # This could be expanded to load and save actual high scores
-        hs_text = self.menu_font.render("HIGH SCORES", True, self.colors["yellow"])
+        hs_text = render_text(self.menu_font, "HIGH SCORES", self.colors["yellow"])
         hs_rect = hs_text.get_rect(center=(self.width // 2, self.height // 2 + 100))
         self.screen.blit(hs_text, hs_rect)
 
@@ -153,8 +147,8 @@ class GameOverScreen:
 
             if self.show_text:
                 # Draw with shadow for better visibility
-                game_over_shadow = self.title_font.render("GAME OVER", True, (100, 0, 0))
-                game_over_text = self.title_font.render("GAME OVER", True, self.colors["red"])
+                game_over_shadow = render_text(self.title_font, "GAME OVER", (100, 0, 0))
+                game_over_text = render_text(self.title_font, "GAME OVER", self.colors["red"])
                 
                 shadow_pos = (self.width // 2 - game_over_shadow.get_width() // 2 + 3, 
                               self.height // 4 + 3)
@@ -190,7 +184,7 @@ class GameOverScreen:
             mouse_pos = pygame.mouse.get_pos()
             
             # Restart button
-            restart_text = self.menu_font.render("RESTART", True, self.colors["yellow"])
+            restart_text = render_text(self.menu_font, "RESTART", self.colors["yellow"])
             restart_rect = restart_text.get_rect(center=(self.width // 2, self.height * 0.7))
             
             # Highlight on hover
@@ -201,7 +195,7 @@ class GameOverScreen:
             self.screen.blit(restart_text, restart_rect)
             
             # Quit button
-            quit_text = self.menu_font.render("QUIT", True, self.colors["yellow"])
+            quit_text = render_text(self.menu_font, "QUIT", self.colors["yellow"])
             quit_rect = quit_text.get_rect(center=(self.width // 2, self.height * 0.8))
             
             # Highlight on hover
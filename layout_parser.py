@@ -0,0 +1,76 @@
+from collections import namedtuple
+import numpy as np
+
+# Cell codes, as in Map
+WALL = -1
+EMPTY = 0
+REGULAR_PELLET = 1
+POWER_PELLET = 2
+SOUND_PELLET = 3
+
+# Glyphs of the text layout; spawn markers are empty cells
+PLAYER_SPAWN_GLYPH = '@'
+ENEMY_SPAWN_GLYPH = 'G'
+GLYPHS = {
+    'W': WALL,
+    '.': REGULAR_PELLET,
+    'P': POWER_PELLET,
+    'S': SOUND_PELLET,
+    ' ': EMPTY,
+    PLAYER_SPAWN_GLYPH: EMPTY,
+    ENEMY_SPAWN_GLYPH: EMPTY,
+}
+
+UNKNOWN = np.iinfo(np.int8).min
+GLYPH_TABLE = np.full(256, UNKNOWN, dtype=np.int8)
+for glyph, code in GLYPHS.items():
+    GLYPH_TABLE[ord(glyph)] = code
+
+MAX_REPORTED = 10  # Positions listed in an error message
+
+ParsedLayout = namedtuple('ParsedLayout', ['grid', 'player_spawn', 'enemy_spawns', 'pellet_counts'])
+
+class LayoutError(ValueError):
+    """A text layout that cannot be imported; positions holds the offending (row, col) cells or rows."""
+
+    def __init__(self, message, positions):
+        super().__init__(message)
+        self.positions = positions
+
+def parse_layout(layout):
+    """
+    Convert a text layout (one string per row) into an int8 grid with one
+    table lookup over all of its bytes.
+
+    Returns ParsedLayout(grid, player_spawn, enemy_spawns, pellet_counts):
+    player_spawn is None and enemy_spawns empty when the layout has no spawn
+    markers, and pellet_counts maps every cell code to its number of cells.
+    Raises LayoutError for ragged rows or unknown glyphs.
+    """
+    if not layout:
+        raise LayoutError("layout is empty", [])
+    cols = len(layout[0])
+    ragged = [(row, len(line)) for row, line in enumerate(layout) if len(line) != cols]
+    if ragged:
+        listed = ", ".join(f"row {row} has {length}" for row, length in ragged[:MAX_REPORTED])
+        raise LayoutError(f"layout rows must all be {cols} wide: {listed}", [row for row, _ in ragged])
+
+    # One byte per glyph; anything outside latin-1 becomes '?', which is unknown
+    glyphs = np.frombuffer("".join(layout).encode("latin-1", errors="replace"), dtype=np.uint8)
+    codes = GLYPH_TABLE[glyphs]
+
+    unknown = np.flatnonzero(codes == UNKNOWN)
+    if unknown.size:
+        positions = [divmod(int(i), cols) for i in unknown]
+        listed = ", ".join(f"{layout[row][col]!r} at ({row}, {col})" for row, col in positions[:MAX_REPORTED])
+        raise LayoutError(f"unknown glyphs in layout: {listed}", positions)
+
+    grid = codes.reshape(len(layout), cols)
+    counts = np.bincount(codes.astype(np.intp) - WALL, minlength=SOUND_PELLET - WALL + 1)
+    pellet_counts = {code: int(counts[code - WALL]) for code in (WALL, EMPTY, REGULAR_PELLET, POWER_PELLET, SOUND_PELLET)}
+
+    player = np.flatnonzero(glyphs == ord(PLAYER_SPAWN_GLYPH))
+    enemies = np.flatnonzero(glyphs == ord(ENEMY_SPAWN_GLYPH))
+    player_spawn = divmod(int(player[0]), cols) if player.size else None
+    enemy_spawns = [divmod(int(i), cols) for i in enemies]
+    return ParsedLayout(grid, player_spawn, enemy_spawns, pellet_counts)
@@ -1,5 +1,12 @@
 import numpy as np
 from config import *
+from distance_cache import DistanceFieldCache
+from pathfinding import GridGraph, PathTable, NEIGHBOR_OFFSETS
+from visibility import VisibilityIndex
+from pellet_index import PelletIndex
+from maze_gen import generate_maze
+import map_format
+from layout_parser import parse_layout
 
 class Map:
     """
@@ -14,14 +21,45 @@ class Map:
     POWER_PELLET = 2
     SOUND_PELLET = 3
     
-    def __init__(self, wall_probability=0.1):
-        """Initialize the game map with a Pac-Man style layout."""
-        self.occupancy_map = np.zeros((ROWS, COLS))
+    CELL_DTYPE = np.int8  # Cell codes are tiny; int8 keeps big maps compact
+    
+    def __init__(self, wall_probability=0.1, precompute_paths=PRECOMPUTE_PATH_TABLE, layout=None, size=None, seed=None,
+                 map_file=None):
+        """
+        Initialize the game map with a Pac-Man style layout, a custom text
+        layout, a binary map file, or (when size=(rows, cols) is given) a
+        generated maze.
+        """
+        self._set_grid(np.zeros((ROWS, COLS), dtype=self.CELL_DTYPE))
+        self.wall_bits = b""  # Packed wall bitmask, one bit per cell (see _on_walls_changed)
+        self._wall_stride = 0
+        self.pellets = None  # Live index of the remaining pellets (see _index_pellets)
+        self.player_spawn = (1, 1)
+        self.enemy_spawns = list(ENEMY_SPAWN_POSITIONS)
         self.power_pellet_active = False
         self.power_pellet_duration = 0
         self.dots_collected = 0
         self.power_pellets_collected = 0
-        self.generate_pacman_map()
+        self.wall_version = 0  # Bumped whenever the wall layout changes
+        self._grid_graph = None  # Built on first use, see grid_graph
+        self.visibility = None  # Line-of-sight segment index
+        self.precompute_paths = precompute_paths
+        self.path_table = None  # All-pairs table, when precomputed
+        self.distance_cache = DistanceFieldCache(self._compute_distance_field)
+        # Flow fields: next step towards / away from a target for every cell.
+        # Sound sources get their own cache so chase fields never evict them.
+        self.flow_cache = DistanceFieldCache(lambda target: self._compute_flow_field(target, away=False))
+        self.escape_cache = DistanceFieldCache(lambda target: self._compute_flow_field(target, away=True))
+        self.sound_flow_cache = DistanceFieldCache(lambda target: self._compute_flow_field(target, away=False),
+                                                   maxsize=SOUND_FLOW_CACHE_SIZE)
+        if map_file is not None:
+            self.load_file(map_file)
+        elif size is not None:
+            self.generate_maze(size[0], size[1], seed)
+        elif layout is None:
+            self.generate_pacman_map()
+        else:
+            self.load_layout(layout)
     
     def generate_pacman_map(self):
         """Generate a Pac-Man style map with walls and collectible points."""
@@ -62,37 +100,172 @@ class Map:
             "WWWWWWWWWWWWWWWWWWWWWWWWWWWWWWW"
         ]
         
-        # Create a new occupancy map with the right dimensions
-        actual_rows = len(pacman_layout)
-        actual_cols = len(pacman_layout[0])
-        self.occupancy_map = np.zeros((actual_rows, actual_cols))
+        self.load_layout(pacman_layout)
+    
+    def generate_maze(self, rows, cols, seed=None):
+        """Generate a symmetric procedural maze (see maze_gen.generate_maze)."""
+        maze = generate_maze(rows, cols, seed)
+        self.load_grid(maze.grid, maze.player_spawn, maze.enemy_spawns)
+    
+    def load_grid(self, grid, player_spawn=(1, 1), enemy_spawns=ENEMY_SPAWN_POSITIONS, visibility=None):
+        """Use an array of cell codes as the map (visibility: a prebuilt segment index for it)."""
+        self._set_grid(np.asarray(grid, dtype=self.CELL_DTYPE))
+        self.player_spawn = tuple(player_spawn)
+        self.enemy_spawns = [tuple(spawn) for spawn in enemy_spawns]
+        self._on_walls_changed(visibility)
+        self._index_pellets()
+    
+    def load_file(self, path):
+        """Load a binary map file (see map_format); the grid stays memory-mapped."""
+        data = map_format.load_map(path)
+        self.load_grid(data.grid, data.player_spawn, data.enemy_spawns, data.visibility)
+    
+    def save_file(self, path):
+        """Save the current grid, spawns and segment index as a binary map file."""
+        map_format.save_map(path, self.occupancy_map, self.player_spawn, self.enemy_spawns, self.visibility)
+    
+    def load_layout(self, layout):
+        """
+        Build the map from a text layout (one string per row), see
+        layout_parser for the glyphs. Spawn markers override the default spawns.
+        """
+        parsed = parse_layout(layout)
+        self.load_grid(parsed.grid,
+                       parsed.player_spawn or (1, 1),
+                       parsed.enemy_spawns or ENEMY_SPAWN_POSITIONS)
+    
+    def _set_grid(self, grid):
+        self._grid = grid
+        self._grid_view = grid.view()
+        self._grid_view.flags.writeable = False
+    
+    @property
+    def occupancy_map(self):
+        """
+        The cell codes, read-only: wall_bits, the pellet index and the path
+        structures are derived from it, so cells change through set_cell
+        (or a whole new grid through load_grid) to keep them in step.
+        """
+        return self._grid_view
+    
+    @occupancy_map.setter
+    def occupancy_map(self, grid):
+        self.load_grid(grid, self.player_spawn, self.enemy_spawns)
+    
+    def _on_walls_changed(self, visibility=None):
+        """Rebuild wall-derived structures after the layout changes."""
+        self.wall_version += 1
+        walls = self.occupancy_map == self.WALL
+        self._wall_stride = (walls.shape[1] + 7) // 8
+        self.wall_bits = np.packbits(walls, axis=1).tobytes()
+        self._grid_graph = None
+        self.visibility = visibility or VisibilityIndex(self.occupancy_map)
+        self.path_table = None
+        if self.precompute_paths and np.sum(self.occupancy_map != self.WALL) <= PATH_TABLE_MAX_CELLS:
+            self.path_table = PathTable.load_or_build(self.occupancy_map, PATH_TABLE_CACHE_DIR)
+    
+    @property
+    def grid_graph(self):
+        """Adjacency for distance-field searches, built the first time one is needed."""
+        if self._grid_graph is None:
+            self._grid_graph = GridGraph(self.occupancy_map)
+        return self._grid_graph
+    
+    def _index_pellets(self):
+        """Rebuild the pellet index (after bulk changes to the grid)."""
+        self.pellets = PelletIndex(self.occupancy_map, (self.REGULAR_PELLET, self.POWER_PELLET, self.SOUND_PELLET))
+    
+    @property
+    def pellets_remaining(self):
+        """Regular + power pellets left; check_win waits for this to reach zero."""
+        return self.pellets.count(self.REGULAR_PELLET, self.POWER_PELLET)
+    
+    def remaining_pellets(self, *kinds):
+        """Cells of the remaining pellets of the given kinds (regular and power if none given)."""
+        return self.pellets.positions(*(kinds or (self.REGULAR_PELLET, self.POWER_PELLET)))
+    
+    def nearest_pellet(self, position, *kinds):
+        """Closest remaining pellet (Manhattan distance) of the given kinds, or None."""
+        return self.pellets.nearest(position, *(kinds or (self.REGULAR_PELLET, self.POWER_PELLET)))
+    
+    def distance_field(self, target):
+        """Return the shared (read-only) distance field towards target."""
+        return self.distance_cache.get(target, self.wall_version)
+    
+    def flow_field(self, target):
+        """Shared int8 field of NEIGHBOR_OFFSETS indices leading towards target (-1: no move)."""
+        return self.flow_cache.get(target, self.wall_version)
+    
+    def cached_flow_field(self, target):
+        """flow_field towards target if one is already cached, else None."""
+        return self.flow_cache.peek(target, self.wall_version)
+    
+    def next_step(self, start, target, budget=None):
+        """
+        NEIGHBOR_OFFSETS index of the first move from start towards target, by
+        point-to-point A* (None if it would close more than budget cells).
+        """
+        return self.grid_graph.next_step(start, target, budget)
+    
+    def escape_field(self, target):
+        """Like flow_field, but each step leads as far away from target as possible."""
+        return self.escape_cache.get(target, self.wall_version)
+    
+    def sound_flow_field(self, target):
+        """flow_field towards a sound source, kept in its own cache for the whole investigation."""
+        return self.sound_flow_cache.get(target, self.wall_version)
+    
+    def _compute_flow_field(self, target, away):
+        field = self.grid_graph.flow_field(self.distance_field(target), away)
+        field.setflags(write=False)
+        return field
+    
+    def _compute_distance_field(self, target):
+        # The player moves one cell at a time: repair a neighbour's field when one is cached
+        if self.is_valid_move(target[0], target[1]):
+            for dr, dc in NEIGHBOR_OFFSETS:
+                neighbor = (target[0] + dr, target[1] + dc)
+                if not self.is_valid_move(*neighbor):
+                    continue
+                previous = self.distance_cache.peek(neighbor, self.wall_version)
+                if previous is not None:
+                    field = self.grid_graph.repair_distance_map(previous, target)
+                    field.setflags(write=False)
+                    return field
         
-        # Fill the map based on the layout
-        self._populate_map_from_layout(pacman_layout)
-    
-    def _populate_map_from_layout(self, layout):
-        """Convert the text layout to the numerical occupancy map."""
-        for i, row in enumerate(layout):
-            for j, cell in enumerate(row):
-                if cell == 'W':  # Wall
-                    self.occupancy_map[i, j] = self.WALL
-                elif cell == '.':  # Regular pellet
-                    self.occupancy_map[i, j] = self.REGULAR_PELLET
-                elif cell == 'P':  # Power pellet
-                    self.occupancy_map[i, j] = self.POWER_PELLET
-                elif cell == 'S':  # Sound pellet
-                    self.occupancy_map[i, j] = self.SOUND_PELLET
-                elif cell == ' ':  # Empty space
-                    self.occupancy_map[i, j] = self.EMPTY
+        field = self.grid_graph.distance_map(target)
+        field.setflags(write=False)
+        return field
     
     def set_position_empty(self, x, y):
         """Set a position as empty (no collectible)."""
         if self._is_valid_position(x, y):
-            self.occupancy_map[x, y] = self.EMPTY
+            self.set_cell(x, y, self.EMPTY)
+    
+    def set_cell(self, x, y, value):
+        """
+        Write one cell code, e.g. to put a pellet back or raise a wall. The
+        pellet index follows the change, and wall-derived structures are
+        rebuilt when a wall appears or disappears.
+        """
+        cell_value = int(self.occupancy_map[x, y])
+        if cell_value == value:
+            return
+        if cell_value in self.pellets.kinds:
+            self.pellets.remove(cell_value, x, y)
+        self._grid[x, y] = value
+        if value in self.pellets.kinds:
+            self.pellets.add(value, x, y)
+        if self.WALL in (cell_value, value):
+            self._on_walls_changed()
     
     def is_valid_move(self, x, y):
         """Check if a position is valid for movement (not a wall and within bounds)."""
-        return (self._is_valid_position(x, y) and self.occupancy_map[x, y] != self.WALL)
+        if not self._is_valid_position(x, y):
+            return False
+        # Test the packed wall bit directly: plain int math, no array indexing
+        byte = self.wall_bits[x * self._wall_stride + (y >> 3)]
+        return not (byte >> (7 - (y & 7))) & 1
     
     def _is_valid_position(self, x, y):
         """Check if a position is within the map bounds."""
@@ -104,7 +277,7 @@ class Map:
         Collect a point at the given position.
         Returns (collected, is_power_pellet, is_sound_pellet).
         """
-        cell_value = self.occupancy_map[x, y]
+        cell_value = int(self.occupancy_map[x, y])
         
         if cell_value in [self.REGULAR_PELLET, self.POWER_PELLET, self.SOUND_PELLET]:
             is_power_pellet = (cell_value == self.POWER_PELLET)
@@ -120,7 +293,8 @@ class Map:
                 self._activate_power_pellet()
             
             # Clear the cell
-            self.occupancy_map[x, y] = self.EMPTY
+            self.pellets.remove(cell_value, x, y)
+            self._grid[x, y] = self.EMPTY
             return True, is_power_pellet, is_sound_pellet
             
         return False, False, False
@@ -139,8 +313,7 @@ class Map:
     
     def check_win(self):
         """Check if all collectible points have been collected."""
-        return (np.sum(self.occupancy_map == self.REGULAR_PELLET) == 0 and 
-                np.sum(self.occupancy_map == self.POWER_PELLET) == 0)
+        return self.pellets_remaining == 0
     
     def is_power_pellet_active(self):
         """Check if a power pellet effect is currently active."""
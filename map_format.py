@@ -0,0 +1,96 @@
+"""
+Binary map files (.pmap): a fixed header, the spawn points, then raw arrays.
+
+    header   MAGIC, version, enemy count, rows, cols, row/col segment counts,
+             a reserved word and the player spawn (little-endian, see HEADER)
+    spawns   int32 (enemies, 2)
+    grid     int8 (rows, cols) cell codes
+    segments int32 row_segment, col_segment (rows, cols), then row_start,
+             row_end, col_start, col_end (the VisibilityIndex arrays)
+
+Every array starts on an ALIGNMENT boundary so it can be viewed straight out
+of a memory map without copying.
+"""
+import struct
+from collections import namedtuple
+import numpy as np
+from visibility import VisibilityIndex
+
+MAGIC = b"PMAP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIIIii")
+ALIGNMENT = 64
+
+MapData = namedtuple('MapData', ['grid', 'player_spawn', 'enemy_spawns', 'visibility'])
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def _layout(rows, cols, num_enemies, row_segments, col_segments):
+    """(name, dtype, shape, offset) for every array in the file, and the total size."""
+    arrays = [('spawns', np.int32, (num_enemies, 2)),
+              ('grid', np.int8, (rows, cols)),
+              ('row_segment', np.int32, (rows, cols)),
+              ('col_segment', np.int32, (rows, cols)),
+              ('row_start', np.int32, (row_segments,)),
+              ('row_end', np.int32, (row_segments,)),
+              ('col_start', np.int32, (col_segments,)),
+              ('col_end', np.int32, (col_segments,))]
+    offset = HEADER.size
+    placed = []
+    for name, dtype, shape in arrays:
+        offset = _aligned(offset)
+        placed.append((name, dtype, shape, offset))
+        offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return placed, offset
+
+def save_map(path, grid, player_spawn, enemy_spawns, visibility=None):
+    """Write a map file; the segment index is built here unless passed in."""
+    grid = np.ascontiguousarray(grid, dtype=np.int8)
+    visibility = visibility or VisibilityIndex(grid)
+    rows, cols = grid.shape
+    arrays = {
+        'spawns': np.array(enemy_spawns, dtype=np.int32).reshape(-1, 2),
+        'grid': grid,
+        'row_segment': visibility.row_segment, 'col_segment': visibility.col_segment,
+        'row_start': visibility.row_start, 'row_end': visibility.row_end,
+        'col_start': visibility.col_start, 'col_end': visibility.col_end,
+    }
+    placed, size = _layout(rows, cols, len(arrays['spawns']), len(visibility.row_start), len(visibility.col_start))
+
+    buffer = bytearray(size)
+    HEADER.pack_into(buffer, 0, MAGIC, VERSION, len(arrays['spawns']), rows, cols,
+                     len(visibility.row_start), len(visibility.col_start), 0, *player_spawn)
+    for name, dtype, shape, offset in placed:
+        data = np.ascontiguousarray(arrays[name], dtype=dtype)
+        buffer[offset:offset + data.nbytes] = data.tobytes()
+    with open(path, "wb") as f:
+        f.write(buffer)
+
+def load_map(path):
+    """
+    Map a file into memory and return MapData viewing it without copies.
+    The grid is copy-on-write, so collecting pellets never touches the file.
+    """
+    raw = np.memmap(path, dtype=np.uint8, mode="c")
+    if raw.size < HEADER.size:
+        raise ValueError(f"{path}: too short for a map file")
+    magic, version, num_enemies, rows, cols, row_segments, col_segments, _, player_row, player_col = \
+        HEADER.unpack_from(raw, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a map file")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported map format version {version}")
+
+    placed, size = _layout(rows, cols, num_enemies, row_segments, col_segments)
+    if raw.size < size:
+        raise ValueError(f"{path}: truncated ({raw.size} of {size} bytes)")
+    arrays = {name: raw[offset:offset + int(np.prod(shape)) * np.dtype(dtype).itemsize].view(dtype).reshape(shape)
+              for name, dtype, shape, offset in placed}
+
+    visibility = VisibilityIndex.from_arrays(arrays['row_segment'], arrays['row_start'], arrays['row_end'],
+                                             arrays['col_segment'], arrays['col_start'], arrays['col_end'])
+    for name in ('spawns', 'row_segment', 'col_segment', 'row_start', 'row_end', 'col_start', 'col_end'):
+        arrays[name].setflags(write=False)
+    enemy_spawns = [tuple(spawn) for spawn in arrays['spawns'].tolist()]
+    return MapData(arrays['grid'], (player_row, player_col), enemy_spawns, visibility)
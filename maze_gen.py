@@ -0,0 +1,115 @@
+from collections import namedtuple
+import numpy as np
+
+# Cell codes, as in Map
+WALL = -1
+EMPTY = 0
+REGULAR_PELLET = 1
+POWER_PELLET = 2
+SOUND_PELLET = 3
+
+MIN_ROWS, MIN_COLS = 5, 7
+
+GeneratedMaze = namedtuple('GeneratedMaze', ['grid', 'player_spawn', 'enemy_spawns'])
+
+def generate_maze(rows, cols, seed=None, num_enemies=4, sound_pellet_rate=0.02):
+    """
+    Generate a Pac-Man style maze as an int8 grid of cell codes.
+
+    The left half is carved on a lattice of cells two grid squares apart
+    (sidewinder, so it is connected), every dead end gets one extra opening,
+    and the half is mirrored onto the right. The maze core is the largest
+    shape with odd rows and cols % 4 == 3 that fits; leftover rows/columns
+    are walls (split left/right, so the grid stays symmetric when
+    cols % 4 is 1 or 3). Every open cell holds a pellet: power pellets in the
+    four corners, sound pellets in random mirrored pairs.
+    """
+    if rows < MIN_ROWS or cols < MIN_COLS:
+        raise ValueError(f"maze must be at least {MIN_ROWS}x{MIN_COLS}, got {rows}x{cols}")
+    rng = np.random.default_rng(seed)
+
+    core_rows = rows - (1 - rows % 2)
+    core_cols = cols - (cols - 3) % 4
+    half_cols = (core_cols + 1) // 2  # Includes the shared middle column
+    lattice_rows, lattice_cols = (core_rows - 1) // 2, half_cols // 2
+
+    east, south = _sidewinder(rng, lattice_rows, lattice_cols)
+    _remove_dead_ends(rng, east, south)
+
+    # Carve the half grid: lattice cells sit on odd coordinates, passages between them
+    half = np.full((core_rows, half_cols), WALL, dtype=np.int8)
+    half[1::2, 1::2] = REGULAR_PELLET
+    half[1::2, 2:-1:2][east] = REGULAR_PELLET
+    half[2:-1:2, 1::2][south] = REGULAR_PELLET
+
+    # Power pellets in the corners, sound pellets on random off-axis lattice cells
+    half[1, 1] = half[-2, 1] = POWER_PELLET
+    player_spawn = (core_rows - 2, half_cols - 1)
+    candidates = np.flatnonzero(half[1::2, 1:-1:2] == REGULAR_PELLET)
+    count = min(len(candidates), max(1, int(len(candidates) * sound_pellet_rate)))
+    picks = rng.choice(candidates, size=count, replace=False)
+    half[1 + 2 * (picks // (lattice_cols - 1)), 1 + 2 * (picks % (lattice_cols - 1))] = SOUND_PELLET
+    half[player_spawn] = EMPTY
+
+    # Ghosts start on the lattice cells closest to the centre of the maze
+    cells = np.argwhere(np.ones((lattice_rows, lattice_cols), dtype=bool))
+    centre = (lattice_rows // 2, lattice_cols - 1)
+    order = np.lexsort((cells[:, 1], cells[:, 0], np.abs(cells - centre).sum(axis=1)))[:num_enemies + 1]
+    spawn_cells = [cell for cell in map(tuple, 1 + 2 * cells[order]) if cell != player_spawn]
+
+    grid = np.full((rows, cols), WALL, dtype=np.int8)
+    left = (cols - core_cols) // 2
+    grid[:core_rows, left:left + core_cols] = np.hstack((half, half[:, -2::-1]))
+
+    offset = np.array((0, left))
+    return GeneratedMaze(grid, tuple(int(v) for v in player_spawn + offset),
+                         [tuple(int(v) for v in cell + offset) for cell in spawn_cells[:num_enemies]])
+
+def _sidewinder(rng, lattice_rows, lattice_cols):
+    """Spanning tree over the lattice as (east, south) passage masks."""
+    east = rng.random((lattice_rows, lattice_cols - 1)) < 0.5
+    east[0] = True  # Top row is one corridor
+    south = np.zeros((lattice_rows - 1, lattice_cols), dtype=bool)
+
+    # Every other row is split into runs; each run opens one passage north
+    closes = np.ones((lattice_rows - 1, lattice_cols), dtype=bool)
+    closes[:, :-1] = ~east[1:]
+    starts = np.ones_like(closes)
+    starts[:, 1:] = closes[:, :-1]
+    run_ids = np.cumsum(starts.ravel())
+    order = np.lexsort((rng.random(run_ids.size), run_ids))
+    last_in_run = np.append(run_ids[order][1:] != run_ids[order][:-1], True)
+    south.ravel()[order[last_in_run]] = True
+    return east, south
+
+def _remove_dead_ends(rng, east, south):
+    """
+    Open one random closed wall at every dead end, in place.
+    Degrees count the mirror: a middle-column cell's east side is its own west passage.
+    """
+    lattice_rows, lattice_cols = south.shape[0] + 1, east.shape[1] + 1
+    degree = np.zeros((lattice_rows, lattice_cols), dtype=np.int8)
+    degree[:, :-1] += east
+    degree[:, 1:] += east
+    degree[:-1] += south
+    degree[1:] += south
+    degree[:, -1] += east[:, -1]
+
+    # Candidate walls per cell: north, south, west, east (east never for the middle column)
+    closed = np.zeros((lattice_rows, lattice_cols, 4), dtype=bool)
+    closed[1:, :, 0] = ~south
+    closed[:-1, :, 1] = ~south
+    closed[:, 1:, 2] = ~east
+    closed[:, :-1, 3] = ~east
+    keys = np.where(closed, rng.random(closed.shape), -1.0)
+    choice = keys.argmax(axis=2)
+    dead = (degree == 1) & closed.any(axis=2)
+
+    r, c = np.nonzero(dead & (choice == 0))
+    south[r - 1, c] = True
+    r, c = np.nonzero(dead & (choice == 1))
+    south[r, c] = True
+    r, c = np.nonzero(dead & (choice == 2))
+    east[r, c - 1] = True
+    r, c = np.nonzero(dead & (choice == 3))
+    east[r, c] = True
@@ -0,0 +1,304 @@
+import hashlib
+import heapq
+import os
+from collections import OrderedDict
+import numpy as np
+from config import PATH_TABLE_MEMORY_SIZE
+
+# Neighbour offsets in (row, col) order; the order doubles as the tie-breaker
+# for every "pick the best neighbour" decision in the AI.
+NEIGHBOR_OFFSETS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# Distance reported for cells that cannot be reached (walls, closed-off areas).
+# Kept as the int32 maximum so "smaller is closer" comparisons still work.
+UNREACHABLE = np.iinfo(np.int32).max
+
+WALL = -1
+
+class GridGraph:
+    """
+    Flat-index adjacency over the walkable cells of an occupancy grid.
+
+    Cell (row, col) has flat index row * cols + col. Missing neighbours point
+    at an extra sentinel node (index rows * cols) so the BFS never has to
+    filter out -1 entries.
+    """
+
+    def __init__(self, occupancy_map):
+        self.shape = occupancy_map.shape
+        rows, cols = self.shape
+        self.size = rows * cols
+        self.sentinel = self.size
+
+        walkable = occupancy_map != WALL
+        index = np.arange(self.size, dtype=np.int32).reshape(rows, cols)
+        neighbors = np.full((rows, cols, len(NEIGHBOR_OFFSETS)), self.sentinel, dtype=np.int32)
+
+        for k, (dr, dc) in enumerate(NEIGHBOR_OFFSETS):
+            # Slice of source cells whose neighbour (row + dr, col + dc) is in bounds
+            src = (slice(max(-dr, 0), rows - max(dr, 0)), slice(max(-dc, 0), cols - max(dc, 0)))
+            dst = (slice(max(dr, 0), rows + min(dr, 0)), slice(max(dc, 0), cols + min(dc, 0)))
+            neighbors[src + (k,)] = np.where(walkable[dst], index[dst], self.sentinel)
+
+        self.walkable = walkable.ravel()
+        self.neighbors = neighbors.reshape(self.size, len(NEIGHBOR_OFFSETS))
+        self._open = self.walkable.tobytes()  # Plain bytes: cheap per-cell reads for next_step
+
+    def distance_map(self, start_position):
+        """Breadth-first distances from start_position as an int32 (rows, cols) array."""
+        dist = np.full(self.size + 1, UNREACHABLE, dtype=np.int32)
+        dist[self.sentinel] = 0  # Never looks unvisited, so it never enters a frontier
+
+        start = int(start_position[0]) * self.shape[1] + int(start_position[1])
+        dist[start] = 0
+        frontier = np.array([start], dtype=np.int32)
+        depth = 0
+
+        # Expand one whole BFS layer per iteration
+        while frontier.size:
+            depth += 1
+            candidates = self.neighbors[frontier].ravel()
+            candidates = np.unique(candidates[dist[candidates] == UNREACHABLE])
+            dist[candidates] = depth
+            frontier = candidates
+
+        return dist[:self.size].reshape(self.shape)
+
+    def repair_distance_map(self, previous, target_position):
+        """
+        Distance map towards target_position, repaired from `previous`, the
+        map towards a neighbouring cell of target_position.
+
+        Moving the target one step changes every distance by at most one, so
+        previous + 1 is an upper bound that is already consistent (no cell
+        exceeds its neighbours by more than one). Setting the new target to 0
+        and pushing decreases outwards, one BFS layer at a time, restores the
+        exact distances; cells that end up one further away are never touched.
+        """
+        dist = np.empty(self.size + 1, dtype=np.int32)
+        flat = previous.ravel()
+        np.add(flat, 1, out=dist[:self.size], where=flat != UNREACHABLE)
+        dist[:self.size][flat == UNREACHABLE] = UNREACHABLE
+        dist[self.sentinel] = 0  # Never improvable, so it never enters a frontier
+
+        target = int(target_position[0]) * self.shape[1] + int(target_position[1])
+        dist[target] = 0
+        frontier = np.array([target], dtype=np.int32)
+        depth = 0
+
+        while frontier.size:
+            depth += 1
+            candidates = self.neighbors[frontier].ravel()
+            candidates = np.unique(candidates[dist[candidates] > depth])
+            dist[candidates] = depth
+            frontier = candidates
+
+        return dist[:self.size].reshape(self.shape)
+
+    def next_step(self, start_position, target_position, budget=None):
+        """
+        Point-to-point alternative to distance_map + flow_field for a single
+        ghost: the NEIGHBOR_OFFSETS index of the move from start towards
+        target, or -1 if target cannot be reached or start has no walkable
+        neighbour. With a budget, gives up and returns None once more than
+        budget cells have been closed.
+
+        Runs A* backwards from the target with the Manhattan heuristic
+        (EnemyPerception.calculate_distance) and keeps expanding until every
+        node with f <= the path length is closed. That settles every neighbour
+        of start lying on a shortest path, so the tie-break matches the
+        four-neighbour scan exactly.
+        """
+        cols = self.shape[1]
+        start = int(start_position[0]) * cols + int(start_position[1])
+        target = int(target_position[0]) * cols + int(target_position[1])
+        start_row, start_col = divmod(start, cols)
+        around = self._neighbors_of(start)
+
+        if start != target:
+            target_row, target_col = divmod(target, cols)
+            best = {target: 0}
+            closed = {}
+            heap = [(abs(target_row - start_row) + abs(target_col - start_col), 0, target)]
+            length = None
+            while heap:
+                f, g, node = heapq.heappop(heap)
+                if length is not None and f > length:
+                    break
+                if node in closed:
+                    continue
+                closed[node] = g
+                if budget is not None and len(closed) > budget:
+                    return None
+                if node == start:
+                    length = g
+                for neighbor in self._neighbors_of(node):
+                    if neighbor >= 0 and g + 1 < best.get(neighbor, UNREACHABLE):
+                        best[neighbor] = g + 1
+                        row, col = divmod(neighbor, cols)
+                        heapq.heappush(heap, (g + 1 + abs(row - start_row) + abs(col - start_col), g + 1, neighbor))
+
+            if length is None:
+                return -1  # Cut off from the target: the scan stays put
+            for k, neighbor in enumerate(around):
+                if neighbor >= 0 and closed.get(neighbor) == length - 1:
+                    return k
+
+        # On the target: every open neighbour is one step away, the scan takes the first
+        for k, neighbor in enumerate(around):
+            if neighbor >= 0:
+                return k
+        return -1
+
+    def _neighbors_of(self, index):
+        """Flat indices of the walkable neighbours of a cell in NEIGHBOR_OFFSETS order, -1 where blocked."""
+        rows, cols = self.shape
+        row, col = divmod(index, cols)
+        up, down, left, right = index - cols, index + cols, index - 1, index + 1
+        return (up if row > 0 and self._open[up] else -1,
+                down if row < rows - 1 and self._open[down] else -1,
+                left if col > 0 and self._open[left] else -1,
+                right if col < cols - 1 and self._open[right] else -1)
+
+    def flow_field(self, distances, away=False):
+        """
+        Direction field over a distance field: for every cell, the index into
+        NEIGHBOR_OFFSETS of the walkable neighbour with the smallest distance
+        (largest when away=True), first in neighbour order on ties, or -1 if
+        the cell has no walkable neighbour (or, moving towards, no neighbour
+        that can reach the target). This is exactly the move the AI's own
+        four-neighbour scan would pick, precomputed for the whole grid.
+        """
+        blocked = -1 if away else np.iinfo(np.int64).max
+        extended = np.append(distances.ravel().astype(np.int64), blocked)
+        extended[:self.size][~self.walkable] = blocked
+        if not away:
+            extended[extended == UNREACHABLE] = blocked  # Unreachable neighbours are no better than walls
+
+        around = extended[self.neighbors]
+        best = around.argmax(axis=1) if away else around.argmin(axis=1)
+        field = best.astype(np.int8)
+        field[(around == blocked).all(axis=1)] = -1
+        return field.reshape(self.shape)
+
+
+class PathTable:
+    """
+    All-pairs shortest-path table over the walkable cells of a static maze.
+
+    Distances are stored as uint16 (TABLE_UNREACHABLE for disconnected pairs)
+    and next hops as uint8 indices into NEIGHBOR_OFFSETS (NO_HOP when there
+    is none). Next hops use the same neighbour order as the AI's own scan, so
+    a table lookup picks exactly the move the distance-map scan would.
+    """
+
+    TABLE_UNREACHABLE = np.iinfo(np.uint16).max
+    NO_HOP = np.iinfo(np.uint8).max
+
+    _loaded = OrderedDict()  # Tables already built in this process, keyed by layout hash, LRU order
+    max_loaded = PATH_TABLE_MEMORY_SIZE
+
+    def __init__(self, cell_index, distances, next_hops):
+        self.cell_index = cell_index  # (rows, cols) -> table id, -1 for walls
+        self.distances = distances
+        self.next_hops = next_hops
+
+    @classmethod
+    def build(cls, occupancy_map):
+        """Run one BFS per walkable cell, all sources advancing together."""
+        walkable = occupancy_map != WALL
+        cell_index = np.full(walkable.shape, -1, dtype=np.int32)
+        count = int(walkable.sum())
+        cell_index[walkable] = np.arange(count, dtype=np.int32)
+
+        # Neighbour table in cell ids, with id `count` as the "no neighbour" sentinel
+        graph = GridGraph(occupancy_map)
+        flat_ids = np.append(cell_index.ravel(), count)
+        flat_ids[flat_ids < 0] = count
+        neighbor_ids = flat_ids[graph.neighbors[graph.walkable]]
+
+        distances = np.full((count + 1, count), cls.TABLE_UNREACHABLE, dtype=np.uint16)
+        frontier = np.zeros((count, count + 1), dtype=bool)  # [source, cell]
+        frontier[np.arange(count), np.arange(count)] = True
+        reached = frontier.copy()
+        distances[:count][frontier[:, :count]] = 0
+        depth = 0
+
+        while frontier.any():
+            depth += 1
+            frontier[:, :count] = frontier[:, neighbor_ids].any(axis=2) & ~reached[:, :count]
+            reached |= frontier
+            distances[:count][frontier[:, :count]] = depth
+
+        # Next hop from cell to target: first neighbour one step closer to the target.
+        # Distances are symmetric, so row `cell` of the table doubles as "cell -> target".
+        next_hops = np.full((count, count), cls.NO_HOP, dtype=np.uint8)
+        current = distances[:count].astype(np.int32)
+        for k in range(len(NEIGHBOR_OFFSETS)):
+            closer = distances[neighbor_ids[:, k]].astype(np.int32) == current - 1
+            next_hops[closer & (next_hops == cls.NO_HOP)] = k
+
+        return cls(cell_index, distances[:count], next_hops)
+
+    @staticmethod
+    def layout_hash(occupancy_map):
+        """Hash of the wall layout; pellets do not affect the table."""
+        walls = np.ascontiguousarray(occupancy_map == WALL)
+        digest = hashlib.sha1(str(walls.shape).encode())
+        digest.update(np.packbits(walls).tobytes())
+        return digest.hexdigest()[:16]
+
+    @classmethod
+    def load_or_build(cls, occupancy_map, cache_dir=None):
+        """
+        Return the table for this layout: reused from this process if still
+        held, else loaded from cache_dir, else built (and saved to cache_dir).
+        Only the max_loaded most recently used tables stay in memory.
+        """
+        layout_hash = cls.layout_hash(occupancy_map)
+        table = cls._loaded.get(layout_hash)
+        if table is not None:
+            cls._loaded.move_to_end(layout_hash)
+            return table
+
+        path = os.path.join(cache_dir, f"path_table_{layout_hash}.npz") if cache_dir else None
+        if path and os.path.exists(path):
+            with np.load(path) as data:
+                table = cls(data["cell_index"], data["distances"], data["next_hops"])
+        else:
+            table = cls.build(occupancy_map)
+            if path:
+                os.makedirs(cache_dir, exist_ok=True)
+                np.savez(path, cell_index=table.cell_index, distances=table.distances, next_hops=table.next_hops)
+
+        for array in (table.cell_index, table.distances, table.next_hops):
+            array.setflags(write=False)  # Shared by every Map with this layout
+        cls._loaded[layout_hash] = table
+        while len(cls._loaded) > cls.max_loaded:
+            cls._loaded.popitem(last=False)  # Evict least recently used
+        return table
+
+    def distance(self, start_position, target_position):
+        """Shortest-path length between two cells, or UNREACHABLE."""
+        start = self.cell_index[start_position[0], start_position[1]]
+        target = self.cell_index[target_position[0], target_position[1]]
+        if start < 0 or target < 0:
+            return UNREACHABLE
+        distance = self.distances[start, target]
+        return UNREACHABLE if distance == self.TABLE_UNREACHABLE else int(distance)
+
+    def next_step(self, start_position, target_position):
+        """(row, col) offset of the first move towards target, or None if there is none."""
+        start = self.cell_index[start_position[0], start_position[1]]
+        target = self.cell_index[target_position[0], target_position[1]]
+        if start < 0 or target < 0:
+            return None
+        hop = self.next_hops[start, target]
+        if hop == self.NO_HOP:
+            return None
+        return NEIGHBOR_OFFSETS[hop]
+
+
+def create_distance_map(start_position, game_map):
+    """Creates a BFS distance map (int32 array) from the start position."""
+    return GridGraph(game_map.occupancy_map).distance_map(start_position)
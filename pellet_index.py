@@ -0,0 +1,86 @@
+from bisect import bisect_left, insort
+import numpy as np
+
+class PelletIndex:
+    """
+    Live index of the remaining pellets of each kind.
+
+    Pellets are bucketed per row in sorted column lists, so removal is cheap
+    and a nearest-pellet query only looks at rows closer than the best match
+    found so far instead of scanning the whole grid. Buckets start out as
+    slices of one NumPy array and only become Python lists once changed, so
+    indexing a huge map stays cheap.
+    """
+
+    def __init__(self, occupancy_map, kinds):
+        self.kinds = tuple(kinds)
+        self._rows = {kind: {} for kind in self.kinds}  # kind -> {row: sorted cols}
+        self._counts = dict.fromkeys(self.kinds, 0)
+        for kind in self.kinds:
+            rows, cols = np.nonzero(occupancy_map == kind)  # Row-major, so each row's cols come sorted
+            if rows.size:
+                bounds = np.flatnonzero(np.diff(rows)) + 1
+                row_ids = rows[np.append(0, bounds)].tolist()
+                self._rows[kind] = dict(zip(row_ids, np.split(cols, bounds)))
+            self._counts[kind] = int(rows.size)
+
+    def count(self, *kinds):
+        """Number of remaining pellets of the given kinds (all kinds if none given)."""
+        return sum(self._counts[kind] for kind in (kinds or self.kinds))
+
+    def _bucket(self, kind, row):
+        """Row bucket as a mutable list (None if the row has no pellets of this kind)."""
+        cols = self._rows[kind].get(row)
+        if isinstance(cols, np.ndarray):
+            cols = self._rows[kind][row] = cols.tolist()
+        return cols
+
+    def add(self, kind, row, col):
+        cols = self._bucket(kind, row)
+        if cols is None:
+            cols = self._rows[kind][row] = []
+        insort(cols, col)
+        self._counts[kind] += 1
+
+    def remove(self, kind, row, col):
+        cols = self._bucket(kind, row)
+        if not cols:
+            return
+        i = bisect_left(cols, col)
+        if i < len(cols) and cols[i] == col:
+            del cols[i]
+            self._counts[kind] -= 1
+            if not cols:
+                del self._rows[kind][row]
+
+    def positions(self, *kinds):
+        """Remaining pellet cells of the given kinds as (row, col) tuples, in row-major order per kind."""
+        return [(row, int(col)) for kind in (kinds or self.kinds)
+                for row, cols in sorted(self._rows[kind].items()) for col in cols]
+
+    def nearest(self, position, *kinds):
+        """
+        Closest remaining pellet of the given kinds by Manhattan distance, or None.
+        Ties go to the smaller (row, col).
+        """
+        row, col = int(position[0]), int(position[1])
+        best = None
+        for kind in (kinds or self.kinds):
+            buckets = self._rows[kind]
+            if not buckets:
+                continue
+            max_offset = max(abs(r - row) for r in (min(buckets), max(buckets)))
+            for offset in range(max_offset + 1):
+                if best is not None and offset > best[0]:
+                    break
+                for r in ((row - offset, row + offset) if offset else (row,)):
+                    cols = buckets.get(r)
+                    if cols is None or len(cols) == 0:
+                        continue
+                    i = bisect_left(cols, col)
+                    for c in cols[max(i - 1, 0):i + 1]:
+                        c = int(c)
+                        candidate = (offset + abs(c - col), r, c)
+                        if best is None or candidate < best:
+                            best = candidate
+        return None if best is None else (best[1], best[2])
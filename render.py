@@ -1,6 +1,9 @@
 import pygame
 import numpy as np
 from config import *
+from pathfinding import UNREACHABLE
+from text_cache import get_sys_font, render_text
+from enemy_store import EnemyStore, CHASE, RUN_AWAY, INVESTIGATE_SOUND
 
 class Renderer:
     def __init__(self):
@@ -9,6 +12,20 @@ class Renderer:
         pygame.font.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         self.distance_map_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        self._distance_glyphs = {}  # Distance -> rendered label, built once per value
+        self._unreachable_key = None  # Unreachable-cell mask the cached X marks were built for
+        self._unreachable_marks_cache = None
+        
+        # Cached maze layer: background, walls and regular pellets
+        self.maze_surface = pygame.Surface((WIDTH, HEIGHT))
+        self._maze_key = None  # (map identity, wall version) the layer was built for
+        self._drawn_cells = None  # Copy of the occupancy map as drawn on the layer
+        self._animated_pellets = []  # (cell value, center) of power and sound pellets
+        
+        # Dirty-rect bookkeeping: regions drawn over the maze layer last frame
+        self._previous_rects = []
+        self._previous_overlay = None
+        self._vision_tiles = {}  # Vision color -> translucent cell tile
         
         # Sound effect variables
         self.sound_effect_center = (0, 0)
@@ -20,34 +37,74 @@ class Renderer:
     
     def draw_grid(self, game_map):
         """Draw the game map grid with walls and collectible points."""
-        # Draw map elements
-        for i in range(game_map.occupancy_map.shape[0]):
-            for j in range(game_map.occupancy_map.shape[1]):
-                rect = pygame.Rect(j * GRID_SIZE, i * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                
-                # Draw based on cell type
-                cell_value = game_map.occupancy_map[i, j]
-                if cell_value == -1:  # Wall
-                    pygame.draw.rect(self.screen, WALL_COLOR, rect)
-                elif cell_value == 1:  # Regular pellet
-                    pygame.draw.circle(self.screen, POINT_COLOR, rect.center, GRID_SIZE // 4)
-                elif cell_value == 2:  # Power pellet
-                    self._draw_power_pellet(rect.center)
-                elif cell_value == 3:  # Sound pellet
-                    self._draw_sound_pellet(rect.center)
+        self._sync_maze_layer(game_map)
+        self.screen.blit(self.maze_surface, (0, 0))
+        self._draw_animated_layer()
+    
+    def _draw_animated_layer(self):
+        """Draw the pulsing pellets and the sound ripple on top of the maze layer."""
+        # Only the pulsing pellets need drawing every frame
+        for cell_value, center in self._animated_pellets:
+            if cell_value == 2:  # Power pellet
+                self._draw_power_pellet(center)
+            else:  # Sound pellet
+                self._draw_sound_pellet(center)
         
         # Draw active sound effect if any
         self._draw_sound_effect()
     
+    def _sync_maze_layer(self, game_map):
+        """
+        Rebuild the maze layer for a new layout, or patch the cells whose contents changed.
+        Returns the patched cells, or None when the whole layer was rebuilt.
+        """
+        occupancy_map = game_map.occupancy_map
+        maze_key = (id(game_map), getattr(game_map, 'wall_version', None))
+        if maze_key != self._maze_key or self._drawn_cells.shape != occupancy_map.shape:
+            self._maze_key = maze_key
+            self.maze_surface.fill(BG_COLOR)
+            changed = np.argwhere(occupancy_map != 0)
+            rebuilt = True
+        else:
+            changed = np.argwhere(self._drawn_cells != occupancy_map)
+            rebuilt = False
+            if len(changed) == 0:
+                return changed
+        
+        for i, j in changed:
+            self._draw_maze_cell(i, j, occupancy_map[i, j])
+        self._drawn_cells = occupancy_map.copy()
+        
+        # Animated pellets are few; recollect them whenever the grid changes
+        self._animated_pellets = [
+            (occupancy_map[i, j], (j * GRID_SIZE + GRID_SIZE // 2, i * GRID_SIZE + GRID_SIZE // 2))
+            for i, j in np.argwhere((occupancy_map == 2) | (occupancy_map == 3))
+        ]
+        return None if rebuilt else changed
+    
+    def _draw_maze_cell(self, i, j, cell_value):
+        """Draw one cell of the static maze layer."""
+        rect = pygame.Rect(j * GRID_SIZE, i * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+        if cell_value == -1:  # Wall
+            pygame.draw.rect(self.maze_surface, WALL_COLOR, rect)
+            return
+        
+        pygame.draw.rect(self.maze_surface, BG_COLOR, rect)
+        if cell_value == 1:  # Regular pellet
+            pygame.draw.circle(self.maze_surface, POINT_COLOR, rect.center, GRID_SIZE // 4)
+    
     def _draw_sound_pellet(self, center):
         """Draw a sound pellet with pulsing effect."""
         # Base circle
         pygame.draw.circle(self.screen, SOUND_PALLET_COLOR, center, GRID_SIZE // 3)
         
         # Pulsing outer circle
-        pulse_size = int(GRID_SIZE // 4 + (GRID_SIZE // 8) * (pygame.time.get_ticks() % 1000) / 1000)
+        pulse_size = self._sound_pulse_size(pygame.time.get_ticks())
         pygame.draw.circle(self.screen, SOUND_PALLET_COLOR, center, pulse_size, 2)
     
+    def _sound_pulse_size(self, current_time):
+        return int(GRID_SIZE // 4 + (GRID_SIZE // 8) * (current_time % 1000) / 1000)
+    
     def _draw_sound_effect(self):
         """Draw ripple effect for sound collection."""
         if self.sound_effect_duration > 0:
@@ -70,59 +127,86 @@ class Renderer:
         # Clear the distance map surface
         self.distance_map_surface.fill((0, 0, 0, 0))
         
-        # Find the max distance for normalization (excluding infinity)
-        max_distance = 0
-        for row in distance_map:
-            for dist in row:
-                if dist != float('inf') and dist > max_distance:
-                    max_distance = dist
+        # Find the max distance for normalization (excluding unreachable cells)
+        distances = np.asarray(distance_map)
+        reachable = distances != UNREACHABLE
+        max_distance = distances[reachable].max() if reachable.any() else 0
         
         if max_distance == 0:
             return
         
-        # Draw each cell with appropriate coloring
-        for i, row in enumerate(distance_map):
-            for j, dist in enumerate(row):
-                rect = pygame.Rect(j * GRID_SIZE, i * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                
-                if dist != float('inf'):
-                    # Draw reachable cell with distance-based color
-                    self._draw_distance_cell(rect, dist, max_distance)
-                else:
-                    # Draw unreachable cell (wall)
-                    self._draw_wall_cell(rect)
+        # Lerp every cell's color at once; unreachable cells get the dark red wall tint
+        norm_dist = np.where(reachable, distances, 0) / max_distance
+        color_min = np.array(DISTANCE_MAP_COLOR_MIN, dtype=float)
+        color_max = np.array(DISTANCE_MAP_COLOR_MAX, dtype=float)
+        colors = (color_min + (color_max - color_min) * norm_dist[..., None]).astype(np.uint8)
+        colors[~reachable] = (80, 0, 0)
+        alpha = np.where(reachable, DISTANCE_MAP_OPACITY, 100).astype(np.uint8)
+        
+        # Pack each cell's RGBA into the surface's pixel format, scale cells up to pixels
+        # (surfarray is indexed [x, y]), stamp the cached X marks and write everything at once
+        rows, cols = distances.shape
+        cell_pixels = self._pack_pixels(colors, alpha).T
+        pixels = np.zeros(self.distance_map_surface.get_size(), dtype=np.uint32)
+        grid_w, grid_h = min(cols * GRID_SIZE, WIDTH), min(rows * GRID_SIZE, HEIGHT)
+        pixels[:grid_w, :grid_h] = cell_pixels.repeat(GRID_SIZE, 0).repeat(GRID_SIZE, 1)[:grid_w, :grid_h]
+        
+        marks_index, marks_pixels = self._unreachable_marks(reachable)
+        pixels.ravel()[marks_index] = marks_pixels
+        pygame.surfarray.pixels2d(self.distance_map_surface)[...] = pixels
+        
+        self._draw_distance_labels(distances, reachable)
         
         # Add the visualization to the screen
         self.screen.blit(self.distance_map_surface, (0, 0))
         
         # Add a legend for the distance map
-        font = pygame.font.SysFont(None, 24)
-        legend = font.render("Distance Map: ON (Press 'D' to toggle)", True, (255, 255, 255))
+        legend = render_text(get_sys_font(None, 24), "Distance Map: ON (Press 'D' to toggle)", (255, 255, 255))
         self.screen.blit(legend, (10, HEIGHT - 30))
     
-    def _draw_distance_cell(self, rect, distance, max_distance):
-        """Draw a cell with distance information."""
-        norm_dist = distance / max_distance
-        
-        r = int(DISTANCE_MAP_COLOR_MIN[0] + (DISTANCE_MAP_COLOR_MAX[0] - DISTANCE_MAP_COLOR_MIN[0]) * norm_dist)
-        g = int(DISTANCE_MAP_COLOR_MIN[1] + (DISTANCE_MAP_COLOR_MAX[1] - DISTANCE_MAP_COLOR_MIN[1]) * norm_dist)
-        b = int(DISTANCE_MAP_COLOR_MIN[2] + (DISTANCE_MAP_COLOR_MAX[2] - DISTANCE_MAP_COLOR_MIN[2]) * norm_dist)
-        
-        pygame.draw.rect(self.distance_map_surface, (r, g, b, DISTANCE_MAP_OPACITY), rect)
-        font = pygame.font.SysFont(None, 16)
-        text = font.render(str(int(distance)), True, (255, 255, 255))
-        text_rect = text.get_rect(center=rect.center)
-        self.distance_map_surface.blit(text, text_rect)
+    def _pack_pixels(self, rgb, alpha):
+        """Pack (..., 3) colors and (...) alphas into the overlay surface's 32-bit pixel format."""
+        r_shift, g_shift, b_shift, a_shift = self.distance_map_surface.get_shifts()
+        rgb = rgb.astype(np.uint32)
+        return ((rgb[..., 0] << r_shift) | (rgb[..., 1] << g_shift) |
+                (rgb[..., 2] << b_shift) | (alpha.astype(np.uint32) << a_shift))
+    
+    def _unreachable_marks(self, reachable):
+        """X-mark pixels for the unreachable cells as (flat pixel index, packed pixel), cached per cell mask."""
+        if self._unreachable_key != (reachable.shape, reachable.tobytes()):
+            self._unreachable_key = (reachable.shape, reachable.tobytes())
+            marks = pygame.Surface(self.distance_map_surface.get_size(), pygame.SRCALPHA)
+            for i, j in np.argwhere(~reachable):
+                self._draw_wall_cell(marks, pygame.Rect(j * GRID_SIZE, i * GRID_SIZE, GRID_SIZE, GRID_SIZE))
+            marks_alpha = pygame.surfarray.array_alpha(marks)
+            index = np.flatnonzero(marks_alpha)
+            packed = self._pack_pixels(pygame.surfarray.array3d(marks).reshape(-1, 3)[index], marks_alpha.ravel()[index])
+            self._unreachable_marks_cache = (index, packed)
+        return self._unreachable_marks_cache
+    
+    def _draw_distance_labels(self, distances, reachable):
+        """Blit each reachable cell's distance from the pre-rendered digit atlas."""
+        font = get_sys_font(None, 16)
+        labels = []
+        half = GRID_SIZE // 2
+        for i, j in np.argwhere(reachable):
+            distance = int(distances[i, j])
+            glyph = self._distance_glyphs.get(distance)
+            if glyph is None:
+                glyph = font.render(str(distance), True, (255, 255, 255))
+                self._distance_glyphs[distance] = glyph
+            labels.append((glyph, glyph.get_rect(center=(j * GRID_SIZE + half, i * GRID_SIZE + half))))
+        self.distance_map_surface.blits(labels, doreturn=False)
     
-    def _draw_wall_cell(self, rect):
+    def _draw_wall_cell(self, surface, rect):
         """Draw a wall cell in the distance map."""
         # Dark red background for unreachable cells
-        pygame.draw.rect(self.distance_map_surface, (80, 0, 0, 100), rect)
+        pygame.draw.rect(surface, (80, 0, 0, 100), rect)
         
         # X marking for walls
-        pygame.draw.line(self.distance_map_surface, (255, 0, 0, 180), 
+        pygame.draw.line(surface, (255, 0, 0, 180), 
                         rect.topleft, rect.bottomright, 2)
-        pygame.draw.line(self.distance_map_surface, (255, 0, 0, 180), 
+        pygame.draw.line(surface, (255, 0, 0, 180), 
                         rect.bottomleft, rect.topright, 2)
     
     def start_sound_effect(self, x, y):
@@ -130,34 +214,50 @@ class Renderer:
         self.sound_effect_center = (y * GRID_SIZE + GRID_SIZE // 2, x * GRID_SIZE + GRID_SIZE // 2)
         self.sound_effect_duration = 420  # running for 7 seconds
     
-    def draw_player(self, player):
-        """Draw the player at its current position."""
+    def draw_player(self, player, shift=(0, 0)):
+        """Draw the player at its current position, offset by shift pixels."""
         rect = pygame.Rect(player.position[1] * GRID_SIZE, player.position[0] * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+        rect.move_ip(shift)
         pygame.draw.rect(self.screen, PLAYER_COLOR, rect)
     
-    def draw_enemies(self, enemies):
-        """Draw all enemies at their current positions."""
+    def draw_enemies(self, enemies, shifts=None):
+        """
+        Draw all enemies at their current positions (a list of Enemy views, or
+        a whole EnemyStore), each offset by its pixel shift if shifts is given.
+        """
         # Get current time in milliseconds to determine color
         current_time = pygame.time.get_ticks()
         
-        for enemy in enemies:
-            rect = pygame.Rect(enemy.position[1] * GRID_SIZE, enemy.position[0] * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-            
-            # enemy changes color according to mode
-            if enemy.ai.current_mode == "chase":
-                color = ENEMY_CHASE_COLOR_1 if (current_time // 500) % 2 == 0 else ENEMY_CHASE_COLOR_2
-            elif enemy.ai.current_mode == "run away":
-                color = ENEMY_RUNAWAY_COLOR
-            elif enemy.ai.current_mode == "investigate_sound":
-                color = SOUND_PALLET_COLOR
-            else:
-                color = ENEMY_COLOR
-                
-            pygame.draw.rect(self.screen, color, rect)
+        # enemy changes color according to mode
+        colors = {
+            CHASE: ENEMY_CHASE_COLOR_1 if (current_time // 500) % 2 == 0 else ENEMY_CHASE_COLOR_2,
+            RUN_AWAY: ENEMY_RUNAWAY_COLOR,
+            INVESTIGATE_SOUND: SOUND_PALLET_COLOR,
+        }
+        
+        rows = self._enemy_rows(enemies)
+        for ((row, col), mode), shift in zip(rows, shifts or [(0, 0)] * len(rows)):
+            rect = pygame.Rect(col * GRID_SIZE + shift[0], row * GRID_SIZE + shift[1], GRID_SIZE, GRID_SIZE)
+            pygame.draw.rect(self.screen, colors.get(mode, ENEMY_COLOR), rect)
+    
+    def _enemy_rows(self, enemies):
+        """(position, mode code) pairs, read column-wise when given an EnemyStore."""
+        if isinstance(enemies, EnemyStore):
+            return list(zip(enemies.position[:enemies.count].tolist(), enemies.mode[:enemies.count].tolist()))
+        return [(enemy.position, enemy.ai.mode_code) for enemy in enemies]
     
     def draw_enemy_vision(self, game_map, enemy_vision_data):
         """Draw enemy vision lines along rows and columns."""
-        vision_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        vision_cells, _ = self._collect_vision(game_map, enemy_vision_data)
+        self._draw_vision_cells(vision_cells)
+    
+    def _collect_vision(self, game_map, enemy_vision_data):
+        """
+        Work out which cells enemy vision covers.
+        Returns ({(row, col): color}, [bounding rect of each vision line]).
+        """
+        vision_cells = {}
+        line_rects = []
         
         for enemy_data in enemy_vision_data:
             enemy_row, enemy_col = enemy_data['position']
@@ -170,22 +270,38 @@ class Renderer:
                 
             vision_color = VISION_WARNING_COLOR if player_in_sight else VISION_COLOR
             
-            # Draw vision in all four directions
-            directions = [
-                (0, -1, 0, enemy_col),  # Left
-                (0, 1, 0, enemy_col),   # Right
-                (-1, 0, enemy_row, 0),  # Up
-                (1, 0, enemy_row, 0)    # Down
-            ]
-            
-            for dr, dc, base_row, base_col in directions:
-                self._draw_vision_line(vision_surface, game_map, enemy_row, enemy_col, dr, dc, vision_color)
+            # Vision in all four directions: left, right, up, down
+            for dr, dc in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
+                line = self._vision_line(game_map, enemy_row, enemy_col, dr, dc)
+                if not line:
+                    continue
+                for cell in line:
+                    vision_cells[cell] = vision_color
+                (first_row, first_col), (last_row, last_col) = line[0], line[-1]
+                top, left = min(first_row, last_row), min(first_col, last_col)
+                line_rects.append(pygame.Rect(left * GRID_SIZE, top * GRID_SIZE,
+                                              (abs(last_col - first_col) + 1) * GRID_SIZE,
+                                              (abs(last_row - first_row) + 1) * GRID_SIZE))
+        
+        return vision_cells, line_rects
     
-        # Add vision overlay to screen
-        self.screen.blit(vision_surface, (0, 0))
+    def _draw_vision_cells(self, vision_cells):
+        """Blend one translucent tile per covered cell (the last enemy's color wins on overlaps)."""
+        for (row, col), color in vision_cells.items():
+            tile = self._vision_tiles.get(color)
+            if tile is None:
+                tile = pygame.Surface((GRID_SIZE, GRID_SIZE), pygame.SRCALPHA)
+                tile.fill(color)
+                self._vision_tiles[color] = tile
+            self.screen.blit(tile, (col * GRID_SIZE, row * GRID_SIZE))
 
-    def _draw_vision_line(self, surface, game_map, enemy_row, enemy_col, dr, dc, color):
-        """Draw a line of sight in a specific direction, stopping at walls."""
+    def _vision_line(self, game_map, enemy_row, enemy_col, dr, dc):
+        """Cells on the line of sight in one direction, stopping at walls."""
+        visibility = getattr(game_map, 'visibility', None)
+        if visibility is not None:
+            return visibility.ray(enemy_row, enemy_col, dr, dc)
+        
+        line = []
         # Start from the position next to the enemy
         curr_row, curr_col = enemy_row + dr, enemy_col + dc
         
@@ -196,52 +312,138 @@ class Renderer:
             # Stop at walls
             if game_map.occupancy_map[curr_row, curr_col] == -1:
                 break
-                
-            # Draw vision tile
-            rect = pygame.Rect(curr_col * GRID_SIZE, curr_row * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-            pygame.draw.rect(surface, color, rect)
+            
+            line.append((curr_row, curr_col))
             
             # Move to next position in this direction
             curr_row += dr
             curr_col += dc
+        return line
     
     def _draw_power_pellet(self, center):
         """Draw a power pellet with pulsing effect."""
         # Create pulsing effect with time
-        current_time = pygame.time.get_ticks()
-        pulsing_factor = 0.8 + 0.4 * abs(((current_time % 1000) / 500) - 1)
-        
-        base_size = GRID_SIZE // 3
-        pulse_size = int(base_size * pulsing_factor)
+        pulse_size = self._power_pulse_size(pygame.time.get_ticks())
         
         # Draw inner circle and outer ring
         pygame.draw.circle(self.screen, POWER_PELLET_COLOR, center, pulse_size)
         outer_size = pulse_size + 3
         pygame.draw.circle(self.screen, POWER_PELLET_COLOR, center, outer_size, 2)
     
-    def render(self, game_map, entity_manager, show_distance_map=False, distance_map=None):
-        """Render the complete game state."""
-        # Draw basic elements
-        self.clear_screen()
-        self.draw_grid(game_map)
+    def _power_pulse_size(self, current_time):
+        pulsing_factor = 0.8 + 0.4 * abs(((current_time % 1000) / 500) - 1)
+        return int(GRID_SIZE // 3 * pulsing_factor)
+    
+    def frame_key(self, entity_manager):
+        """
+        What the time-driven animations look like right now: while the game
+        state is unchanged, a frame with the same key as the last one drawn
+        would be identical, so it can be skipped. None means always redraw.
+        """
+        if self.sound_effect_duration > 0:
+            return None  # The ripple advances once per drawn frame
+        current_time = pygame.time.get_ticks()
+        kinds = {int(cell_value) for cell_value, _ in self._animated_pellets}
+        store = entity_manager.enemy_store
+        chasing = bool((store.mode[:store.count] == CHASE).any())
+        return (self._power_pulse_size(current_time) if 2 in kinds else None,
+                self._sound_pulse_size(current_time) if 3 in kinds else None,
+                (current_time // 500) % 2 if chasing else None)
+    
+    def _entity_shifts(self, entity_manager, interpolation):
+        """
+        Pixel (x, y) offsets that slide the player and each enemy back
+        towards the cell they left this tick. interpolation is
+        (alpha, previous player position, previous enemy positions), alpha
+        being the fraction of the tick elapsed; None draws everything on its cell.
+        """
+        store = entity_manager.enemy_store
+        if interpolation is None:
+            return (0, 0), [(0, 0)] * store.count
+        alpha, previous_player, previous_enemies = interpolation
+        
+        def shifts(previous, current):
+            delta = np.asarray(previous, dtype=np.float64).reshape(-1, 2) - np.asarray(current).reshape(-1, 2)
+            one_step = np.abs(delta).sum(axis=1) == 1  # Spawns and resets snap instead of sliding
+            offsets = np.rint(delta[:, ::-1] * (1 - alpha) * GRID_SIZE).astype(int) * one_step[:, None]
+            return [tuple(offset) for offset in offsets.tolist()]
         
-        # Get and draw enemy vision
+        current_enemies = store.position[:store.count]
+        enemy_shifts = (shifts(previous_enemies, current_enemies) if len(previous_enemies) == store.count
+                        else [(0, 0)] * store.count)  # Someone was eaten: the rows no longer line up
+        return shifts(previous_player, entity_manager.player.position)[0], enemy_shifts
+    
+    def render(self, game_map, entity_manager, show_distance_map=False, distance_map=None, interpolation=None):
+        """
+        Render the complete game state.
+        With DIRTY_RECT_RENDERING only the regions that changed since the last
+        frame are redrawn and pushed to the display; a full repaint happens on
+        a new map and while the distance map overlay is toggled or shown.
+        interpolation slides entities between cells (see _entity_shifts).
+        """
+        changed_cells = self._sync_maze_layer(game_map)
         enemy_vision_data = entity_manager.get_enemy_vision_data()
-        self.draw_enemy_vision(game_map, enemy_vision_data)
+        vision_cells, vision_rects = self._collect_vision(game_map, enemy_vision_data)
+        player_shift, enemy_shifts = self._entity_shifts(entity_manager, interpolation)
+        frame_rects = self._dynamic_rects(entity_manager, vision_rects, player_shift, enemy_shifts)
+        
+        full_repaint = (not DIRTY_RECT_RENDERING or changed_cells is None or show_distance_map
+                        or show_distance_map != self._previous_overlay)
+        if full_repaint:
+            self.screen.blit(self.maze_surface, (0, 0))
+        else:
+            dirty_rects = self._previous_rects + frame_rects + [
+                pygame.Rect(j * GRID_SIZE, i * GRID_SIZE, GRID_SIZE, GRID_SIZE) for i, j in changed_cells
+            ]
+            # Restore the maze layer underneath everything that moved or animates
+            for rect in dirty_rects:
+                self.screen.blit(self.maze_surface, rect, rect)
+        
+        # Draw pellets, vision and the sound ripple
+        self._draw_animated_layer()
+        self._draw_vision_cells(vision_cells)
         
         # Draw distance map if enabled
         if show_distance_map and distance_map is not None:
             self.draw_distance_map(distance_map)
         
         # Draw entities
-        self.draw_player(entity_manager.player)
-        self.draw_enemies(entity_manager.enemies)
+        self.draw_player(entity_manager.player, player_shift)
+        self.draw_enemies(entity_manager.enemy_store, enemy_shifts)
         
         # Add status message if distance map is on
         if show_distance_map:
-            font = pygame.font.SysFont(None, 24)
-            status = font.render("Distance Map: ON", True, (255, 255, 255))
+            status = render_text(get_sys_font(None, 24), "Distance Map: ON", (255, 255, 255))
             self.screen.blit(status, (10, 10))
         
         # Update display
-        pygame.display.flip() 
\ No newline at end of file
+        if full_repaint:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
+        self._previous_rects = frame_rects
+        self._previous_overlay = show_distance_map
+    
+    def _dynamic_rects(self, entity_manager, vision_rects, player_shift=(0, 0), enemy_shifts=None):
+        """Screen regions drawn over the maze layer this frame."""
+        screen_rect = self.screen.get_rect()
+        rects = list(vision_rects)
+        
+        player = entity_manager.player
+        rects.append(pygame.Rect(player.position[1] * GRID_SIZE + player_shift[0],
+                                 player.position[0] * GRID_SIZE + player_shift[1], GRID_SIZE, GRID_SIZE))
+        rows = self._enemy_rows(entity_manager.enemy_store)
+        for ((row, col), _), shift in zip(rows, enemy_shifts or [(0, 0)] * len(rows)):
+            rects.append(pygame.Rect(col * GRID_SIZE + shift[0], row * GRID_SIZE + shift[1], GRID_SIZE, GRID_SIZE))
+        
+        # Pulsing rings can reach slightly past their cell
+        for _, center in self._animated_pellets:
+            rects.append(pygame.Rect(0, 0, GRID_SIZE + 4, GRID_SIZE + 4).move(center[0] - GRID_SIZE // 2 - 2,
+                                                                              center[1] - GRID_SIZE // 2 - 2))
+        
+        if self.sound_effect_duration > 0:
+            reach = GRID_SIZE * 2 + 2
+            rects.append(pygame.Rect(self.sound_effect_center[0] - reach, self.sound_effect_center[1] - reach,
+                                     reach * 2, reach * 2))
+        
+        return [rect.clip(screen_rect) for rect in rects]
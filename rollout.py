@@ -0,0 +1,91 @@
+import argparse
+import random
+from collections import namedtuple
+from multiprocessing import Pool
+from config import DIRECTIONS, ENEMY_SPAWN_POSITIONS
+from map import Map
+from simulation import Simulation
+
+# What to play: layout None means the stock maze, a (rows, cols) size a maze generated from the seed
+EpisodeSpec = namedtuple('EpisodeSpec', ['seed', 'num_enemies', 'max_ticks', 'layout', 'enemy_positions', 'size'],
+                         defaults=[len(ENEMY_SPAWN_POSITIONS), 5000, None, None, None])
+
+# What comes back from a worker: plain numbers only, never game objects
+EpisodeResult = namedtuple('EpisodeResult', ['seed', 'num_enemies', 'outcome', 'ticks', 'score',
+                                             'dots_collected', 'enemies_eaten'])
+
+MOVES = list(DIRECTIONS.values())
+
+def random_walk_policy(simulation, rng):
+    """Keep going, but turn at random now and then (or when stuck)."""
+    player = simulation.entity_manager.player
+    if player.current_direction is None or rng.random() < 0.15:
+        return rng.choice(MOVES)
+    return None
+
+def play_episode(spec, policy=random_walk_policy):
+    """Build a game for spec, play it to a win, loss or the tick limit, and summarize it."""
+    rng = random.Random(spec.seed)
+    game_map = Map(layout=spec.layout, size=spec.size, seed=spec.seed)
+    enemy_positions = spec.enemy_positions or game_map.enemy_spawns
+    if spec.num_enemies > len(enemy_positions):
+        # Results are keyed on num_enemies, so a silently smaller game would be misreported
+        raise ValueError(f"episode {spec.seed} asks for {spec.num_enemies} enemies "
+                         f"but only {len(enemy_positions)} spawn positions are available")
+    simulation = Simulation(seed=spec.seed, game_map=game_map,
+                            enemy_positions=enemy_positions[:spec.num_enemies])
+    outcome = simulation.run(spec.max_ticks, lambda sim: policy(sim, rng))
+    return EpisodeResult(spec.seed, spec.num_enemies, outcome, simulation.tick, simulation.score,
+                         game_map.dots_collected, simulation.entity_manager.score // 200)
+
+def run_rollouts(specs, processes=None, chunksize=4, policy=random_walk_policy):
+    """
+    Play every episode in specs across a worker pool and yield results as they finish.
+    processes=1 plays them in this process (handy for debugging and tests).
+    The policy must be a module-level function so it can be sent to workers.
+    """
+    if processes == 1:
+        for spec in specs:
+            yield play_episode(spec, policy)
+        return
+
+    with Pool(processes) as pool:
+        jobs = [(spec, policy) for spec in specs]
+        for result in pool.imap_unordered(_play_job, jobs, chunksize=chunksize):
+            yield result
+
+def _play_job(job):
+    spec, policy = job
+    return play_episode(spec, policy)
+
+def aggregate(results):
+    """Fold episode results into summary statistics, overall and per enemy count."""
+    summary = {}
+    for result in results:
+        for key in ('all', result.num_enemies):
+            stats = summary.setdefault(key, {'episodes': 0, 'won': 0, 'lost': 0, 'ticks': 0, 'score': 0})
+            stats['episodes'] += 1
+            stats['ticks'] += result.ticks
+            stats['score'] += result.score
+            if result.outcome in (Simulation.WON, Simulation.LOST):
+                stats[result.outcome] += 1
+
+    for stats in summary.values():
+        stats['win_rate'] = stats['won'] / stats['episodes']
+        stats['mean_ticks'] = stats['ticks'] / stats['episodes']
+        stats['mean_score'] = stats['score'] / stats['episodes']
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play headless episodes across a process pool.")
+    parser.add_argument("--episodes", type=int, default=200)
+    parser.add_argument("--processes", type=int, default=None, help="worker count (default: all cores)")
+    parser.add_argument("--max-ticks", type=int, default=5000)
+    args = parser.parse_args()
+
+    specs = [EpisodeSpec(seed=seed, num_enemies=1 + seed % len(ENEMY_SPAWN_POSITIONS), max_ticks=args.max_ticks)
+             for seed in range(args.episodes)]
+    summary = aggregate(run_rollouts(specs, args.processes))
+    for key, stats in sorted(summary.items(), key=lambda item: str(item[0])):
+        print(f"{key!s:>4} episodes {stats['episodes']:5d}  win rate {stats['win_rate']:.2f}  "
+              f"mean ticks {stats['mean_ticks']:8.1f}  mean score {stats['mean_score']:8.1f}")
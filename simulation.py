@@ -0,0 +1,83 @@
+import random
+from config import GAME_SPEED
+from map import Map
+from entities import EntityManager
+
+class Simulation:
+    """
+    Headless game engine: owns the Map and EntityManager and advances them on
+    a deterministic logical clock. Nothing here touches the display, fonts or
+    the event pump, so it can run as fast as the CPU allows.
+    """
+
+    RUNNING = "running"
+    WON = "won"
+    LOST = "lost"
+
+    def __init__(self, seed=None, enemy_positions=None, game_map=None):
+        """
+        Set up a fresh game. A seed makes any random enemy moves reproducible;
+        they come from this game's own RNG, never the global random module.
+        Players and enemies start on the map's spawn points unless enemy_positions is given.
+        """
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.game_map = game_map if game_map is not None else Map()
+        self.entity_manager = EntityManager(self.game_map, player_spawn=self.game_map.player_spawn, rng=self.rng)
+        if enemy_positions is None:
+            enemy_positions = self.game_map.enemy_spawns
+        for x, y in enemy_positions:
+            self.entity_manager.add_enemy(x, y)
+
+        self.tick = 0
+        self.status = self.RUNNING
+
+    @property
+    def time(self):
+        """Logical game time in seconds (one tick lasts 1 / GAME_SPEED)."""
+        return self.tick / GAME_SPEED
+
+    @property
+    def score(self):
+        """Score from collected dots, power pellets and eaten enemies."""
+        return (self.game_map.dots_collected * 10 +
+                self.game_map.power_pellets_collected * 50 +
+                self.entity_manager.score)
+
+    def set_direction(self, direction):
+        """Apply a movement input, the same way a key press does in the game."""
+        player = self.entity_manager.player
+        player.intended_direction = direction
+
+        # Only set current_direction if the move is valid
+        new_x = player.position[0] + direction[1]
+        new_y = player.position[1] + direction[0]
+        if self.game_map.is_valid_move(new_x, new_y):
+            player.current_direction = direction
+
+    def step(self, direction=None):
+        """Advance the game by one tick and return the resulting status."""
+        if self.status != self.RUNNING:
+            return self.status
+        if direction is not None:
+            self.set_direction(direction)
+
+        self.tick += 1
+        self.game_map.update()
+        self.entity_manager.continue_player_movement()
+        self.entity_manager.move_enemies(current_tick=self.tick)
+
+        if self.entity_manager.check_collision():
+            self.status = self.LOST
+        elif self.game_map.check_win():
+            self.status = self.WON
+        return self.status
+
+    def run(self, max_ticks, policy=None):
+        """
+        Step until the game ends or max_ticks have passed.
+        policy(simulation) returns a direction (or None) before every tick.
+        """
+        while self.status == self.RUNNING and self.tick < max_ticks:
+            self.step(policy(self) if policy else None)
+        return self.status
@@ -0,0 +1,110 @@
+from config import SPATIAL_HASH_BUCKET
+
+class SpatialHash:
+    """
+    Grid-bucket index of entity positions.
+
+    Cells are grouped into bucket x bucket blocks, so "who is on this cell"
+    reads one block and a nearest-entity query only widens ring by ring
+    until no unread block can hold anything closer. Keys are the entities
+    themselves (anything hashable); each remembers the order it was first
+    inserted in, which breaks distance ties the way a scan over the entity
+    list would.
+    """
+
+    def __init__(self, bucket=SPATIAL_HASH_BUCKET):
+        self.bucket = bucket
+        self._entries = {}  # key -> (row, col, order)
+        self._buckets = {}  # (row // bucket, col // bucket) -> {key: None}
+        self._next_order = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _block(self, row, col):
+        return (row // self.bucket, col // self.bucket)
+
+    def insert(self, key, position):
+        row, col = int(position[0]), int(position[1])
+        self._entries[key] = (row, col, self._next_order)
+        self._buckets.setdefault(self._block(row, col), {})[key] = None
+        self._next_order += 1
+
+    def remove(self, key):
+        row, col, _ = self._entries.pop(key)
+        block = self._block(row, col)
+        members = self._buckets[block]
+        del members[key]
+        if not members:
+            del self._buckets[block]
+
+    def move(self, key, position):
+        """Update key's position; it keeps its place in the tie-break order."""
+        row, col = int(position[0]), int(position[1])
+        old_row, old_col, order = self._entries[key]
+        self._entries[key] = (row, col, order)
+        old_block, block = self._block(old_row, old_col), self._block(row, col)
+        if block != old_block:
+            members = self._buckets[old_block]
+            del members[key]
+            if not members:
+                del self._buckets[old_block]
+            self._buckets.setdefault(block, {})[key] = None
+
+    def at(self, position):
+        """Keys on the given cell, in insertion order."""
+        row, col = int(position[0]), int(position[1])
+        members = self._buckets.get(self._block(row, col))
+        if not members:
+            return []
+        entries = self._entries
+        found = [(entries[key][2], key) for key in members if entries[key][0] == row and entries[key][1] == col]
+        found.sort(key=lambda item: item[0])
+        return [key for _, key in found]
+
+    def nearest(self, position, k=1, accept=None):
+        """
+        Up to k keys closest to position by Manhattan distance, closest
+        first, skipping keys for which accept(key) is false. Ties go to the
+        key inserted first.
+        """
+        row, col = int(position[0]), int(position[1])
+        center_row, center_col = self._block(row, col)
+        found = []  # (distance, order, key)
+        unread = len(self._entries)
+        ring = 0
+        while unread:
+            # Every cell in ring r of blocks is at least (r - 1) * bucket + 1 away
+            if len(found) >= k and ring and found[k - 1][0] < (ring - 1) * self.bucket + 1:
+                break
+            if 8 * ring > len(self._buckets):
+                # Fewer occupied blocks than the ring has: read the rest of them directly
+                blocks = [block for block in self._buckets
+                          if max(abs(block[0] - center_row), abs(block[1] - center_col)) >= ring]
+            else:
+                blocks = self._ring(center_row, center_col, ring)
+            for block in blocks:
+                members = self._buckets.get(block)
+                if not members:
+                    continue
+                unread -= len(members)
+                for key in members:
+                    if accept is None or accept(key):
+                        r, c, order = self._entries[key]
+                        found.append((abs(r - row) + abs(c - col), order, key))
+            found.sort(key=lambda item: item[:2])
+            ring += 1
+        return [key for _, _, key in found[:k]]
+
+    @staticmethod
+    def _ring(center_row, center_col, ring):
+        """Blocks at Chebyshev distance `ring` from the centre block."""
+        if ring == 0:
+            yield (center_row, center_col)
+            return
+        for dc in range(-ring, ring + 1):
+            yield (center_row - ring, center_col + dc)
+            yield (center_row + ring, center_col + dc)
+        for dr in range(-ring + 1, ring):
+            yield (center_row + dr, center_col - ring)
+            yield (center_row + dr, center_col + ring)
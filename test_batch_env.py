@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+from batch_env import BatchEnv, RUN_AWAY
+from simulation import Simulation
+
+# Action codes -> Simulation directions (col, row)
+ACTION_DIRECTIONS = {1: (0, -1), 2: (0, 1), 3: (-1, 0), 4: (1, 0)}
+
+class TestBatchEnv(unittest.TestCase):
+
+    def test_reset_state(self):
+        env = BatchEnv(3)
+        self.assertEqual(env.enemy_pos.shape, (3, 4, 2))
+        self.assertTrue(env.alive.all())
+        self.assertTrue((env.remaining == env.remaining[0]).all())
+        self.assertEqual(env.cells[0, 1, 1], 0)  # Player spawn starts empty
+
+    def test_matches_simulation(self):
+        num_envs, ticks = 32, 400
+        rng = np.random.default_rng(0)
+        actions = rng.integers(0, 5, size=(ticks, num_envs))
+        actions[rng.random((ticks, num_envs)) < 0.9] = 0
+
+        env = BatchEnv(num_envs, auto_reset=False)
+        sims = [Simulation(seed=0) for _ in range(num_envs)]
+        for t in range(ticks):
+            _, dones, info = env.step(actions[t])
+            for i, sim in enumerate(sims):
+                if sim.status != Simulation.RUNNING:
+                    continue
+                status = sim.step(ACTION_DIRECTIONS.get(int(actions[t, i])))
+                enemies = [tuple(enemy.position) for enemy in sim.entity_manager.enemies]
+                batch_enemies = [tuple(int(v) for v in pos) for pos, alive in zip(env.enemy_pos[i], env.alive[i]) if alive]
+                self.assertEqual(tuple(sim.entity_manager.player.position), tuple(env.player[i]))
+                self.assertEqual(enemies, batch_enemies)
+                self.assertEqual(sim.score, env.scores[i])
+                self.assertEqual(status == Simulation.LOST, info['lost'][i])
+                self.assertEqual(status == Simulation.WON, info['won'][i])
+
+    def test_power_pellet_lets_player_eat_enemy(self):
+        env = BatchEnv(1, num_enemies=1, auto_reset=False)
+        env.power_timer[:] = 10
+        env.enemy_pos[0, 0] = (1, 3)
+        env.enemy_prev[0, 0] = (1, 3)
+        _, dones, _ = env.step([4])
+        self.assertEqual(env.mode[0, 0], RUN_AWAY)
+        env.step([4])
+        self.assertFalse(dones[0])
+        self.assertFalse(env.alive[0, 0])
+        self.assertEqual(env.enemies_eaten[0], 1)
+
+    def test_auto_reset_finished_games(self):
+        env = BatchEnv(2, num_enemies=1)
+        env.enemy_pos[0, 0] = (1, 1)
+        rewards, dones, info = env.step([0, 0])
+        self.assertTrue(dones[0] and info['lost'][0])
+        self.assertFalse(dones[1])
+        self.assertEqual(tuple(env.enemy_pos[0, 0]), (5, 11))  # Respawned
+
+if __name__ == '__main__':
+    unittest.main()
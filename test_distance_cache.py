@@ -0,0 +1,46 @@
+import unittest
+from map import Map
+from enemy_ai import EnemyAI
+from distance_cache import DistanceFieldCache
+
+class TestDistanceFieldCache(unittest.TestCase):
+
+    def setUp(self):
+        self.map = Map(precompute_paths=False)
+
+    def test_same_target_shares_field(self):
+        first = self.map.distance_field((1, 1))
+        second = self.map.distance_field([1, 1])
+        self.assertIs(first, second)
+        self.assertEqual(self.map.distance_cache.hits, 1)
+        self.assertEqual(self.map.distance_cache.misses, 1)
+
+    def test_ghosts_share_field_with_map(self):
+        ai_a, ai_b = EnemyAI(), EnemyAI()
+        ai_a.target_sharers = ai_b.target_sharers = 2
+        ai_a.chase((5, 7), (1, 1), self.map)
+        ai_b.chase((22, 1), (1, 1), self.map)
+        self.assertEqual(self.map.distance_cache.misses, 1)
+
+    def test_pellet_collection_keeps_cache_valid(self):
+        field = self.map.distance_field((1, 1))
+        self.map.collect_point(1, 2)
+        self.assertIs(self.map.distance_field((1, 1)), field)
+
+    def test_wall_change_invalidates(self):
+        field = self.map.distance_field((1, 1))
+        self.map.generate_pacman_map()
+        self.assertIsNot(self.map.distance_field((1, 1)), field)
+
+    def test_lru_eviction(self):
+        cache = DistanceFieldCache(lambda target: [target], maxsize=2)
+        cache.get((0, 0), 1)
+        cache.get((0, 1), 1)
+        cache.get((0, 0), 1)
+        cache.get((0, 2), 1)  # Evicts (0, 1)
+        self.assertEqual(len(cache), 2)
+        cache.get((0, 1), 1)
+        self.assertEqual(cache.misses, 4)
+
+if __name__ == '__main__':
+    unittest.main()
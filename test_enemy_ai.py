@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import MagicMock
 import numpy as np
+from config import CHASE_DURATION
 from enemy_ai import EnemyAI, EnemyPerception
 
 class TestEnemyPerception(unittest.TestCase):
@@ -42,7 +43,7 @@ class TestEnemyAI(unittest.TestCase):
 
     def test_patrol_changes_direction(self):
         self.mock_map.is_valid_move.side_effect = [False, True]
-        initial_direction = self.enemy_ai.patrol_direction.copy()
+        initial_direction = self.enemy_ai.patrol_direction
         new_direction = self.enemy_ai.patrol((2, 2), self.mock_map)
         self.assertNotEqual(initial_direction, new_direction)
 
@@ -56,12 +57,38 @@ class TestEnemyAI(unittest.TestCase):
         move = self.enemy_ai.chase((2, 2), (0, 0), self.mock_map)
         self.assertIsInstance(move, tuple)
 
+    def test_chase_stays_put_when_target_unreachable(self):
+        self.mock_map.occupancy_map = np.array([[0, 0, -1, 0]])
+        self.mock_map.is_valid_move.side_effect = lambda x, y: (0 <= x < 1 and 0 <= y < 4 and
+                                                                self.mock_map.occupancy_map[x, y] != -1)
+        self.assertEqual(self.enemy_ai.chase((0, 0), (0, 3), self.mock_map), (0, 0))
+        self.assertEqual(self.enemy_ai.chase((0, 0), (0, 1), self.mock_map), (1, 0))
+
     def test_update_mode_switches_to_chase(self):
         self.mock_map.is_power_pellet_active.return_value = False
         self.enemy_ai.perception.can_see_player = MagicMock(return_value=True)
         self.enemy_ai.update_mode((0, 0), (0, 1), self.mock_map)
         self.assertEqual(self.enemy_ai.current_mode, "chase")
 
+    def test_chase_times_out_after_chase_duration_ticks(self):
+        self.enemy_ai.perception.can_see_player = MagicMock(return_value=True)
+        self.enemy_ai.update_mode((0, 0), (0, 1), self.mock_map, current_tick=100)
+        self.enemy_ai.perception.can_see_player.return_value = False
+        for tick in range(101, 100 + CHASE_DURATION):
+            self.enemy_ai.update_mode((0, 0), (1, 1), self.mock_map, current_tick=tick)
+            self.assertEqual(self.enemy_ai.current_mode, "chase")
+        self.enemy_ai.update_mode((0, 0), (1, 1), self.mock_map, current_tick=100 + CHASE_DURATION)
+        self.assertEqual(self.enemy_ai.current_mode, "patrol")
+
+    def test_update_mode_without_clock_counts_calls(self):
+        self.enemy_ai.perception.can_see_player = MagicMock(return_value=True)
+        self.enemy_ai.update_mode((0, 0), (0, 1), self.mock_map)
+        self.enemy_ai.perception.can_see_player.return_value = False
+        for _ in range(CHASE_DURATION):
+            self.enemy_ai.update_mode((0, 0), (1, 1), self.mock_map)
+        self.assertEqual(self.enemy_ai.last_update_tick, CHASE_DURATION)
+        self.assertEqual(self.enemy_ai.current_mode, "patrol")
+
     def test_update_mode_to_run_away(self):
         self.mock_map.is_power_pellet_active.return_value = True
         self.enemy_ai.update_mode((0, 0), (0, 1), self.mock_map)
@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+from map import Map
+from entities import Enemy, EntityManager
+from enemy_store import EnemyStore, PATROL, CHASE, RUN_AWAY
+
+class TestEnemyStore(unittest.TestCase):
+
+    def setUp(self):
+        self.map = Map(precompute_paths=False)
+        self.manager = EntityManager(self.map)
+        for x, y in [(1, 1), (1, 5), (6, 1), (9, 1), (22, 1)]:
+            self.manager.add_enemy(x, y)
+        self.store = self.manager.enemy_store
+
+    def test_views_read_and_write_rows(self):
+        enemy = self.manager.enemies[2]
+        self.assertEqual(enemy.position, (6, 1))
+        enemy.ai.current_mode = "run away"
+        self.assertEqual(self.store.mode[2], RUN_AWAY)
+        self.store.mode[2] = CHASE
+        self.assertEqual(enemy.ai.current_mode, "chase")
+        enemy.ai.sound_location = (3, 4)
+        self.assertEqual(enemy.ai.sound_location, (3, 4))
+        enemy.ai.sound_location = None
+        self.assertIsNone(enemy.ai.sound_location)
+
+    def test_capacity_grows(self):
+        self.assertEqual(self.store.count, 5)
+        self.assertGreaterEqual(self.store.capacity, 5)
+        np.testing.assert_array_equal(self.store.position[:5], [(1, 1), (1, 5), (6, 1), (9, 1), (22, 1)])
+
+    def test_remove_compacts_and_detaches(self):
+        eaten = self.manager.enemies[1]
+        eaten.ai.current_mode = "run away"
+        self.manager.player.position = (1, 5)
+        self.assertFalse(self.manager.check_collision())
+        self.assertEqual(self.manager.score, 200)
+        self.assertEqual(self.store.count, 4)
+        self.assertEqual([enemy.position for enemy in self.manager.enemies], [(1, 1), (6, 1), (9, 1), (22, 1)])
+        self.assertEqual([slot.index for slot in self.store.slots], [0, 1, 2, 3])
+        # The eaten enemy still reads its own state
+        self.assertEqual(eaten.position, (1, 5))
+        self.assertEqual(eaten.ai.current_mode, "run away")
+
+    def test_batched_advance_matches_single_moves(self):
+        directions = [(0, 1), (1, 0), (0, -1), (-1, 0), (1, 0)]
+        singles = [Enemy(*enemy.position) for enemy in self.manager.enemies]
+        for _ in range(3):
+            moved = self.store.advance(directions, self.map)
+            for enemy, direction, did_move in zip(singles, directions, moved):
+                enemy.move_counter += 1
+                if enemy.move_counter >= 1.1:
+                    enemy.move_counter = 0
+                    self.assertEqual(enemy._apply_move(direction, self.map), did_move)
+                else:
+                    self.assertFalse(did_move)
+        self.assertEqual([enemy.position for enemy in self.manager.enemies], [enemy.position for enemy in singles])
+
+    def test_cached_cells_follow_arrays(self):
+        enemy = self.manager.enemies[0]
+        self.assertIs(enemy.position, enemy.position)
+        for tick in range(10):
+            self.manager.move_enemies(current_tick=tick)
+        enemy.position = (1, 2)
+        self.manager.enemies[1].ai.current_mode = "run away"
+        self.manager.player.position = self.manager.enemies[1].position
+        self.manager.check_collision()
+        n = self.store.count
+        self.assertEqual(self.store.cells, [tuple(cell) for cell in self.store.position[:n].tolist()])
+        self.assertEqual(self.store.previous_cells, [tuple(cell) for cell in self.store.previous_position[:n].tolist()])
+
+    def test_standalone_enemy_has_own_store(self):
+        enemy = Enemy(3, 3)
+        self.assertEqual(enemy.slot.store.count, 1)
+        self.assertEqual(enemy.ai.mode_code, PATROL)
+
+if __name__ == '__main__':
+    unittest.main()
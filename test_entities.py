@@ -1,3 +1,4 @@
+import random
 import unittest
 from unittest.mock import MagicMock
 from entities import Player, Enemy, EntityManager
@@ -23,7 +24,7 @@ class TestEntities(unittest.TestCase):
         player = self.manager.player
         result = player.move((0, 1), self.mock_game_map)
         self.assertTrue(result)
-        self.assertEqual(player.position, [2, 1])
+        self.assertEqual(player.position, (2, 1))
         self.mock_game_map.is_valid_move.assert_called()
 
     def test_player_triggers_sound_renderer_and_entity_manager(self):
@@ -33,6 +34,18 @@ class TestEntities(unittest.TestCase):
         self.mock_game_map.collect_point.assert_called()
         self.mock_renderer.start_sound_effect.assert_called_with(2, 1)
 
+    def test_random_moves_come_from_own_rng(self):
+        first = Enemy(3, 3, rng=random.Random(4))
+        second = Enemy(3, 3, rng=random.Random(4))
+        state = random.getstate()
+        moves = []
+        for _ in range(10):
+            moves.append(first._get_movement_direction(self.mock_game_map, None))
+            second._get_movement_direction(self.mock_game_map, None)  # Interleaved draws don't interfere
+        reference = Enemy(3, 3, rng=random.Random(4))
+        self.assertEqual(moves, [reference._get_movement_direction(self.mock_game_map, None) for _ in range(10)])
+        self.assertEqual(random.getstate(), state)
+
     def test_enemy_moves_after_counter(self):
         enemy = Enemy(3, 3)
         enemy.move_counter = 1  # Just below ENEMY_SPEED_FACTOR
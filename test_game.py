@@ -0,0 +1,147 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Renderer opens a display
+
+from config import GRID_SIZE, MAX_UPDATES_PER_FRAME
+from enemy_store import CHASE
+from entities import EntityManager
+from game import Game
+from map import Map
+from render import Renderer
+
+def stub_game():
+    """A Game with only the loop state, and update() counting its calls."""
+    game = Game.__new__(Game)
+    game.running = True
+    game.update_interval = 200
+    game.accumulator = 0
+    game.updates = 0
+    def update():
+        game.updates += 1
+    game.update = update
+    return game
+
+class TestAdvance(unittest.TestCase):
+
+    def test_runs_whole_ticks_and_keeps_remainder(self):
+        game = stub_game()
+        self.assertEqual(game.advance(150), 0)
+        self.assertEqual(game.advance(300), 2)
+        self.assertEqual(game.updates, 2)
+        self.assertEqual(game.accumulator, 50)
+
+    def test_catch_up_is_capped(self):
+        game = stub_game()
+        self.assertEqual(game.advance(200 * MAX_UPDATES_PER_FRAME), MAX_UPDATES_PER_FRAME)
+        self.assertEqual(game.accumulator, 0)
+        self.assertEqual(game.advance(5000 + 30), MAX_UPDATES_PER_FRAME)
+        self.assertEqual(game.updates, 2 * MAX_UPDATES_PER_FRAME)
+
+    def test_backlog_is_dropped(self):
+        game = stub_game()
+        game.advance(5000 + 30)
+        self.assertEqual(game.accumulator, 30)  # Only the part of a tick is kept
+        self.assertEqual(game.advance(0), 0)
+
+    def test_stops_when_game_ends(self):
+        game = stub_game()
+        def update():
+            game.updates += 1
+            game.running = False
+        game.update = update
+        self.assertEqual(game.advance(1000), 1)
+
+class TestFrameSkip(unittest.TestCase):
+
+    def setUp(self):
+        self.renderer = Renderer()
+        self.manager = EntityManager(Map(precompute_paths=False))
+        self.manager.add_enemy(1, 5)
+
+    def key_at(self, time):
+        with patch('pygame.time.get_ticks', return_value=time):
+            return self.renderer.frame_key(self.manager)
+
+    def test_still_frame_has_steady_key(self):
+        self.renderer._animated_pellets = []
+        self.assertEqual(self.key_at(0), (None, None, None))
+        self.assertEqual(self.key_at(0), self.key_at(700))
+
+    def test_pulsing_pellets_change_key(self):
+        self.renderer._animated_pellets = [(2, (10, 10))]
+        self.assertNotEqual(self.key_at(0), self.key_at(500))
+        self.renderer._animated_pellets = [(3, (10, 10))]
+        self.assertNotEqual(self.key_at(0), self.key_at(900))
+
+    def test_chase_blink_changes_key(self):
+        self.renderer._animated_pellets = []
+        self.manager.enemy_store.mode[0] = CHASE
+        self.assertEqual(self.key_at(0), self.key_at(400))
+        self.assertNotEqual(self.key_at(0), self.key_at(600))
+
+    def test_sound_ripple_always_redraws(self):
+        self.renderer.sound_effect_duration = 3
+        self.assertIsNone(self.key_at(0))
+
+    def test_run_skips_unchanged_frames(self):
+        game = Game.__new__(Game)
+        game.running, game.interpolate, game.needs_render = True, False, True
+        game.update_interval, game.accumulator, game.last_frame_key = 200, 0, None
+        game.simulation = MagicMock()
+        game.renderer = MagicMock()
+        game.renderer.frame_key.side_effect = [(4, None, None)] * 3 + [(7, None, None)] * 2
+        game.clock = MagicMock()
+        game.render = MagicMock()
+        loops = []
+        def handle_events():
+            loops.append(None)
+            game.running = len(loops) < 5
+        game.handle_events = handle_events
+        with patch('pygame.time.get_ticks', return_value=0), patch('pygame.quit'):
+            game.run()
+        self.assertEqual(game.render.call_count, 2)  # The first frame, then the key change
+
+class TestEntityShifts(unittest.TestCase):
+
+    def setUp(self):
+        self.renderer = Renderer()
+        self.manager = EntityManager(Map(precompute_paths=False), player_spawn=(1, 2))
+        for x, y in [(1, 5), (6, 1)]:
+            self.manager.add_enemy(x, y)
+
+    def previous(self, player, enemies):
+        return player, np.array(enemies)
+
+    def test_no_interpolation_draws_on_cells(self):
+        self.assertEqual(self.renderer._entity_shifts(self.manager, None), ((0, 0), [(0, 0), (0, 0)]))
+
+    def test_one_step_slides_back(self):
+        interpolation = (0.25,) + self.previous((1, 1), [(1, 4), (5, 1)])
+        player, enemies = self.renderer._entity_shifts(self.manager, interpolation)
+        shift = round(0.75 * GRID_SIZE)
+        self.assertEqual(player, (-shift, 0))  # (x, y): came from the left
+        self.assertEqual(enemies, [(-shift, 0), (0, -shift)])
+
+    def test_end_of_tick_is_on_cell(self):
+        interpolation = (1.0,) + self.previous((1, 1), [(1, 4), (5, 1)])
+        self.assertEqual(self.renderer._entity_shifts(self.manager, interpolation), ((0, 0), [(0, 0), (0, 0)]))
+
+    def test_spawn_and_reset_snap(self):
+        interpolation = (0.5,) + self.previous((20, 15), [(1, 5), (26, 1)])
+        self.assertEqual(self.renderer._entity_shifts(self.manager, interpolation), ((0, 0), [(0, 0), (0, 0)]))
+
+    def test_eaten_ghost_rows_do_not_slide(self):
+        # One row fewer than the tick started with: the rows no longer match up
+        self.manager.enemies[0].ai.current_mode = "run away"
+        self.manager.player.position = (1, 5)
+        self.manager.check_collision()
+        interpolation = (0.5,) + self.previous((1, 4), [(1, 4), (5, 1)])
+        player, enemies = self.renderer._entity_shifts(self.manager, interpolation)
+        self.assertEqual(player, (-GRID_SIZE // 2, 0))
+        self.assertEqual(enemies, [(0, 0)])
+
+if __name__ == '__main__':
+    unittest.main()
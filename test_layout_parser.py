@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+from layout_parser import parse_layout, LayoutError
+from map import Map
+from maze_gen import generate_maze
+
+class TestLayoutParser(unittest.TestCase):
+
+    def test_codes_counts_and_spawns(self):
+        parsed = parse_layout(["WWWWW",
+                               "W@.GW",
+                               "WPS W",
+                               "WWWWW"])
+        np.testing.assert_array_equal(parsed.grid, [[-1, -1, -1, -1, -1],
+                                                    [-1, 0, 1, 0, -1],
+                                                    [-1, 2, 3, 0, -1],
+                                                    [-1, -1, -1, -1, -1]])
+        self.assertEqual(parsed.grid.dtype, np.int8)
+        self.assertEqual(parsed.player_spawn, (1, 1))
+        self.assertEqual(parsed.enemy_spawns, [(1, 3)])
+        self.assertEqual(parsed.pellet_counts, {Map.WALL: 14, Map.EMPTY: 3, Map.REGULAR_PELLET: 1,
+                                                Map.POWER_PELLET: 1, Map.SOUND_PELLET: 1})
+
+    def test_ragged_rows(self):
+        with self.assertRaises(LayoutError) as caught:
+            parse_layout(["WWW", "W.", "WWW", "W..W"])
+        self.assertEqual(caught.exception.positions, [1, 3])
+        self.assertIn("row 1 has 2", str(caught.exception))
+
+    def test_unknown_glyphs(self):
+        with self.assertRaises(LayoutError) as caught:
+            parse_layout(["WWW", "WxW", "Wé☃"])
+        self.assertEqual(caught.exception.positions, [(1, 1), (2, 1), (2, 2)])
+        self.assertIn("'x' at (1, 1)", str(caught.exception))
+
+    def test_map_uses_layout_spawns(self):
+        game_map = Map(layout=["WWWWW", "W.G@W", "WWWWW"], precompute_paths=False)
+        self.assertEqual(game_map.player_spawn, (1, 3))
+        self.assertEqual(game_map.enemy_spawns, [(1, 2)])
+        self.assertEqual(game_map.pellets_remaining, 1)
+
+    def test_round_trips_generated_maze(self):
+        grid = generate_maze(201, 199, seed=1).grid
+        glyph_of = {-1: 'W', 0: ' ', 1: '.', 2: 'P', 3: 'S'}
+        layout = ["".join(glyph_of[code] for code in row) for row in grid.tolist()]
+        np.testing.assert_array_equal(parse_layout(layout).grid, grid)
+
+if __name__ == '__main__':
+    unittest.main()
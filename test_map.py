@@ -53,6 +53,50 @@ class TestMap(unittest.TestCase):
     def test_check_win_false(self):
         self.assertFalse(self.map.check_win())
 
+    def test_check_win_after_all_pellets(self):
+        for i, j in np.argwhere(self.map.occupancy_map > Map.EMPTY):
+            self.assertFalse(self.map.check_win())
+            self.map.collect_point(i, j)
+        self.assertTrue(self.map.check_win())
+        self.assertEqual(self.map.pellets_remaining, 0)
+
+    def test_set_position_empty_counts_pellet(self):
+        remaining = self.map.pellets_remaining
+        self.map.set_position_empty(1, 2)
+        self.map.set_position_empty(1, 2)
+        self.assertEqual(self.map.pellets_remaining, remaining - 1)
+
+    def test_grid_is_read_only(self):
+        with self.assertRaises(ValueError):
+            self.map.occupancy_map[1, 1] = Map.WALL
+        self.assertTrue(self.map.is_valid_move(1, 1))
+
+    def test_wall_edits_keep_derived_state_in_step(self):
+        version = self.map.wall_version
+        self.map.set_cell(1, 1, Map.WALL)
+        self.assertFalse(self.map.is_valid_move(1, 1))
+        self.assertGreater(self.map.wall_version, version)
+        self.map.set_cell(1, 1, Map.EMPTY)
+        self.assertTrue(self.map.is_valid_move(1, 1))
+
+    def test_assigning_grid_reloads(self):
+        grid = np.zeros((5, 6), dtype=np.int8)
+        grid[2, 3] = Map.WALL
+        grid[1, 1] = Map.REGULAR_PELLET
+        self.map.occupancy_map = grid
+        self.assertEqual(self.map.occupancy_map.shape, (5, 6))
+        self.assertFalse(self.map.is_valid_move(2, 3))
+        self.assertEqual(self.map.pellets_remaining, 1)
+
+    def test_compact_storage(self):
+        self.assertEqual(self.map.occupancy_map.dtype, np.int8)
+        rows, cols = self.map.occupancy_map.shape
+        for i in range(rows):
+            for j in range(cols):
+                self.assertEqual(self.map.is_valid_move(i, j), self.map.occupancy_map[i, j] != Map.WALL)
+        self.assertFalse(self.map.is_valid_move(-1, 0))
+        self.assertFalse(self.map.is_valid_move(0, cols))
+
     def test_power_pellet_duration_decreases(self):
         self.map.power_pellet_active = True
         self.map.power_pellet_duration = 2
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import map_format
+from map import Map
+
+class TestMapFormat(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "maze.pmap")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        original = Map(size=(41, 43), seed=4, precompute_paths=False)
+        original.save_file(self.path)
+        loaded = Map(map_file=self.path, precompute_paths=False)
+        np.testing.assert_array_equal(loaded.occupancy_map, original.occupancy_map)
+        self.assertEqual(loaded.player_spawn, original.player_spawn)
+        self.assertEqual(loaded.enemy_spawns, original.enemy_spawns)
+        for name in ('row_segment', 'col_segment', 'row_start', 'row_end', 'col_start', 'col_end'):
+            np.testing.assert_array_equal(getattr(loaded.visibility, name), getattr(original.visibility, name))
+        self.assertEqual(loaded.pellets_remaining, original.pellets_remaining)
+
+    def test_grid_is_copy_on_write(self):
+        Map(precompute_paths=False).save_file(self.path)
+        before = open(self.path, "rb").read()
+        game_map = Map(map_file=self.path, precompute_paths=False)
+        self.assertTrue(game_map.collect_point(1, 2)[0])
+        self.assertEqual(game_map.occupancy_map[1, 2], Map.EMPTY)
+        del game_map
+        self.assertEqual(open(self.path, "rb").read(), before)
+
+    def test_rejects_bad_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"NOPE" + bytes(100))
+        with self.assertRaises(ValueError):
+            map_format.load_map(self.path)
+
+        Map(precompute_paths=False).save_file(self.path)
+        with open(self.path, "r+b") as f:
+            f.truncate(200)
+        with self.assertRaises(ValueError):
+            map_format.load_map(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import time
+import unittest
+import numpy as np
+from maze_gen import generate_maze, WALL, EMPTY, POWER_PELLET, SOUND_PELLET
+from map import Map
+from pathfinding import GridGraph, UNREACHABLE
+from simulation import Simulation
+
+class TestMazeGenerator(unittest.TestCase):
+
+    SIZES = [(5, 7), (33, 31), (34, 33), (61, 63), (101, 97)]
+
+    def test_shape_and_symmetry(self):
+        for rows, cols in self.SIZES:
+            grid = generate_maze(rows, cols, seed=rows).grid
+            self.assertEqual(grid.shape, (rows, cols))
+            self.assertEqual(grid.dtype, np.int8)
+            walls = grid == WALL
+            np.testing.assert_array_equal(walls, walls[:, ::-1])
+
+    def test_connected_without_dead_ends(self):
+        for rows, cols in self.SIZES:
+            maze = generate_maze(rows, cols, seed=7)
+            open_cells = maze.grid != WALL
+            field = GridGraph(maze.grid).distance_map(maze.player_spawn)
+            self.assertTrue((field[open_cells] != UNREACHABLE).all(), (rows, cols))
+
+            padded = np.pad(open_cells, 1)
+            degree = (padded[:-2, 1:-1].astype(int) + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:])
+            self.assertTrue((degree[open_cells] >= 2).all(), (rows, cols))
+
+    def test_pellets_and_spawns(self):
+        maze = generate_maze(33, 31, seed=2)
+        self.assertEqual(maze.grid[maze.player_spawn], EMPTY)
+        self.assertEqual(np.count_nonzero(maze.grid == POWER_PELLET), 4)
+        self.assertGreater(np.count_nonzero(maze.grid == SOUND_PELLET), 0)
+        self.assertEqual(len(maze.enemy_spawns), 4)
+        for spawn in maze.enemy_spawns:
+            self.assertNotEqual(maze.grid[spawn], WALL)
+
+    def test_seeded(self):
+        np.testing.assert_array_equal(generate_maze(41, 43, seed=5).grid, generate_maze(41, 43, seed=5).grid)
+        self.assertFalse(np.array_equal(generate_maze(41, 43, seed=5).grid, generate_maze(41, 43, seed=6).grid))
+
+    def test_too_small(self):
+        with self.assertRaises(ValueError):
+            generate_maze(3, 7)
+
+    def test_large_maze_is_fast(self):
+        start = time.perf_counter()
+        maze = generate_maze(1000, 1000, seed=0)
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertEqual(maze.grid.shape, (1000, 1000))
+
+    def test_simulation_on_generated_map(self):
+        game_map = Map(size=(41, 43), seed=3)
+        simulation = Simulation(seed=3, game_map=game_map)
+        self.assertEqual(tuple(simulation.entity_manager.player.position), game_map.player_spawn)
+        self.assertEqual([tuple(enemy.position) for enemy in simulation.entity_manager.enemies], game_map.enemy_spawns)
+        simulation.run(50)
+        self.assertGreater(simulation.tick, 0)
+
+if __name__ == '__main__':
+    unittest.main()
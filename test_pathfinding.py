@@ -0,0 +1,222 @@
+import os
+import tempfile
+import unittest
+from collections import deque
+from unittest.mock import patch
+import numpy as np
+from map import Map
+from enemy_ai import EnemyAI
+from pathfinding import GridGraph, PathTable, UNREACHABLE, NEIGHBOR_OFFSETS, create_distance_map
+
+def reference_distances(occupancy_map, start):
+    """Plain Python BFS used as the ground truth."""
+    rows, cols = occupancy_map.shape
+    dist = np.full((rows, cols), UNREACHABLE, dtype=np.int64)
+    dist[start] = 0
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in NEIGHBOR_OFFSETS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < rows and 0 <= ny < cols and occupancy_map[nx, ny] != -1 and dist[nx, ny] == UNREACHABLE:
+                dist[nx, ny] = dist[x, y] + 1
+                queue.append((nx, ny))
+    return dist
+
+class TestGridGraph(unittest.TestCase):
+
+    def test_matches_reference_on_stock_map(self):
+        game_map = Map()
+        for start in [(1, 1), (16, 15), (31, 29)]:
+            field = GridGraph(game_map.occupancy_map).distance_map(start)
+            np.testing.assert_array_equal(field, reference_distances(game_map.occupancy_map, start))
+
+    def test_matches_reference_on_random_grid(self):
+        rng = np.random.default_rng(7)
+        occupancy = np.where(rng.random((40, 60)) < 0.3, -1, 0)
+        occupancy[0, 0] = 0
+        field = GridGraph(occupancy).distance_map((0, 0))
+        np.testing.assert_array_equal(field, reference_distances(occupancy, (0, 0)))
+
+    def test_walls_are_unreachable(self):
+        occupancy = np.array([[0, -1, 0]])
+        field = create_distance_map((0, 0), type('Grid', (), {'occupancy_map': occupancy}))
+        self.assertEqual(field.dtype, np.int32)
+        self.assertEqual(field[0, 0], 0)
+        self.assertEqual(field[0, 1], UNREACHABLE)
+        self.assertEqual(field[0, 2], UNREACHABLE)
+
+class TestIncrementalRepair(unittest.TestCase):
+
+    def walk(self, game_map, steps, seed):
+        rng = np.random.default_rng(seed)
+        position = game_map.player_spawn
+        for _ in range(steps):
+            dr, dc = NEIGHBOR_OFFSETS[rng.integers(len(NEIGHBOR_OFFSETS))]
+            if game_map.is_valid_move(position[0] + dr, position[1] + dc):
+                position = (position[0] + dr, position[1] + dc)
+                yield position
+
+    def test_repair_matches_rebuild(self):
+        for game_map in [Map(precompute_paths=False), Map(size=(51, 47), seed=2, precompute_paths=False)]:
+            graph = game_map.grid_graph
+            field = graph.distance_map(game_map.player_spawn)
+            for target in self.walk(game_map, 300, seed=1):
+                field = graph.repair_distance_map(field, target)
+                np.testing.assert_array_equal(field, graph.distance_map(target))
+
+    def test_map_repairs_from_neighbouring_field(self):
+        game_map = Map(precompute_paths=False)
+        calls = []
+        repair = game_map.grid_graph.repair_distance_map
+        game_map.grid_graph.repair_distance_map = lambda *args: calls.append(args) or repair(*args)
+        game_map.distance_field(game_map.player_spawn)
+        for target in self.walk(game_map, 50, seed=4):
+            np.testing.assert_array_equal(game_map.distance_field(target),
+                                          reference_distances(game_map.occupancy_map, target))
+        self.assertGreater(len(calls), 0)
+
+
+class TestPathTable(unittest.TestCase):
+
+    def setUp(self):
+        self.map = Map()
+        self.table = self.map.path_table
+
+    def test_built_at_map_load(self):
+        self.assertIsNotNone(self.table)
+        self.assertEqual(self.table.distances.dtype, np.uint16)
+        self.assertIsNone(Map(precompute_paths=False).path_table)
+
+    def test_distances_match_bfs(self):
+        target = (16, 15)
+        field = self.map.distance_field(target)
+        for cell in [(1, 1), (31, 29), (9, 15), (22, 1)]:
+            self.assertEqual(self.table.distance(cell, target), field[cell])
+        self.assertEqual(self.table.distance((0, 0), target), UNREACHABLE)
+
+    def test_next_step_matches_distance_scan(self):
+        plain_map = Map(precompute_paths=False)
+        table_ai, scan_ai = EnemyAI(), EnemyAI()
+        walkable = np.argwhere(self.map.distance_field((1, 1)) != UNREACHABLE)
+        for enemy in walkable[::7]:
+            for target in [(1, 1), (16, 15), (31, 15)]:
+                self.assertEqual(table_ai.chase(tuple(enemy), target, self.map),
+                                 scan_ai.chase(tuple(enemy), target, plain_map))
+
+    def test_persisted_by_layout_hash(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            PathTable._loaded.clear()
+            built = PathTable.load_or_build(self.map.occupancy_map, cache_dir)
+            PathTable._loaded.clear()
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            loaded = PathTable.load_or_build(self.map.occupancy_map, cache_dir)
+            np.testing.assert_array_equal(built.distances, loaded.distances)
+            np.testing.assert_array_equal(built.next_hops, loaded.next_hops)
+
+    def test_reused_within_process(self):
+        self.assertIs(Map().path_table, self.table)
+
+    def test_memory_is_bounded(self):
+        tables = [Map(size=(9, 11), seed=seed).path_table for seed in range(PathTable.max_loaded + 2)]
+        self.assertEqual(len(PathTable._loaded), PathTable.max_loaded)
+        self.assertNotIn(PathTable.layout_hash(self.map.occupancy_map), PathTable._loaded)
+        self.assertIs(PathTable._loaded[PathTable.layout_hash(Map(size=(9, 11), seed=5).occupancy_map)], tables[-1])
+
+class ScanOnlyMap:
+    """Not a Map, so EnemyAI falls back to its four-neighbour distance-map scan."""
+
+    def __init__(self, game_map):
+        self.occupancy_map = game_map.occupancy_map
+        self.is_valid_move = game_map.is_valid_move
+
+
+class TestFlowField(unittest.TestCase):
+
+    def check_matches_scan(self, game_map, targets):
+        scan_map = ScanOnlyMap(game_map)
+        flow_ai, scan_ai = EnemyAI(), EnemyAI()
+        flow_ai.target_sharers = 2  # Use the flow field, not the point search
+        for enemy in map(tuple, np.argwhere(game_map.occupancy_map != Map.WALL)):
+            for target in targets:
+                self.assertEqual(flow_ai.chase(enemy, target, game_map), scan_ai.chase(enemy, target, scan_map))
+                self.assertEqual(flow_ai.run_away(enemy, target, game_map), scan_ai.run_away(enemy, target, scan_map))
+
+    def test_matches_scan_on_stock_map(self):
+        game_map = Map(precompute_paths=False)
+        self.check_matches_scan(game_map, [(1, 1), (16, 15), (12, 0)])  # (12, 0) is in a closed-off area
+
+    def test_matches_scan_on_generated_map(self):
+        game_map = Map(size=(41, 39), seed=8, precompute_paths=False)
+        self.check_matches_scan(game_map, [game_map.player_spawn, (1, 1)])
+
+    def test_one_field_per_target(self):
+        game_map = Map(precompute_paths=False)
+        ais = [EnemyAI() for _ in range(4)]
+        for ai in ais:
+            ai.target_sharers = len(ais)
+        for ai, enemy in zip(ais, [(1, 1), (31, 29), (9, 15), (22, 1)]):
+            ai.chase(enemy, (16, 15), game_map)
+        self.assertEqual(game_map.flow_cache.misses, 1)
+        self.assertEqual(game_map.flow_cache.hits, 3)
+
+    def test_lone_ghost_uses_point_search(self):
+        game_map = Map(precompute_paths=False)
+        lone, field_ai = EnemyAI(), EnemyAI()
+        field_ai.target_sharers = 2
+        moves = [lone.chase((31, 29), (16, 15), game_map)]
+        self.assertEqual(game_map.flow_cache.misses, 0)
+        moves.append(field_ai.chase((31, 29), (16, 15), game_map))
+        self.assertEqual(game_map.flow_cache.misses, 1)
+        self.assertEqual(moves[0], moves[1])
+
+    def test_lone_ghost_reuses_field_for_still_target(self):
+        game_map = Map(precompute_paths=False)
+        ai = EnemyAI()
+        ai.chase((31, 29), (16, 15), game_map)
+        self.assertEqual(game_map.flow_cache.misses, 0)
+        move = ai.chase((30, 29), (16, 15), game_map)
+        self.assertEqual(game_map.flow_cache.misses, 1)
+        self.assertEqual(move, ai.step_to_move(game_map.next_step((30, 29), (16, 15))))
+        ai.chase((29, 29), (16, 15), game_map)
+        self.assertEqual(game_map.flow_cache.misses, 1)
+
+    def test_point_search_budget(self):
+        game_map = Map(precompute_paths=False)
+        self.assertIsNone(game_map.next_step((31, 29), (1, 1), budget=10))
+        self.assertEqual(game_map.next_step((2, 1), (1, 1), budget=10), game_map.next_step((2, 1), (1, 1)))
+        with patch('enemy_ai.POINT_SEARCH_BUDGET', 10):
+            move = EnemyAI().chase((31, 29), (1, 1), game_map)
+        self.assertEqual(game_map.flow_cache.misses, 1)
+        self.assertEqual(move, EnemyAI().step_to_move(game_map.next_step((31, 29), (1, 1))))
+
+    def test_point_search_matches_flow_field(self):
+        for game_map in [Map(precompute_paths=False), Map(size=(45, 43), seed=6, precompute_paths=False)]:
+            cells = [tuple(cell) for cell in np.argwhere(game_map.occupancy_map != Map.WALL)]
+            for target in cells[::83] + [(0, 0)]:
+                field = game_map.flow_field(target)
+                for cell in cells[::5]:
+                    self.assertEqual(game_map.next_step(cell, target), field[cell], (cell, target))
+
+    def test_unreachable_target_stays_put(self):
+        game_map = Map(precompute_paths=False)
+        lone, field_ai = EnemyAI(), EnemyAI()
+        field_ai.target_sharers = 2
+        for ai in (lone, field_ai):
+            self.assertEqual(ai.chase((1, 1), (12, 0), game_map), (0, 0))  # (12, 0) is in a closed-off area
+        self.assertEqual(EnemyAI().chase((1, 1), (12, 0), Map()), (0, 0))  # Path table
+
+    def test_sound_fields_cached_separately(self):
+        game_map = Map(precompute_paths=False)
+        ai = EnemyAI()
+        ai.current_mode = "investigate_sound"
+        ai.sound_location = [14, 14]
+        ai.investigate_sound((1, 1), game_map)
+        for target in range(20):
+            game_map.flow_field((1, 1 + target))
+        ai.investigate_sound((1, 2), game_map)
+        self.assertEqual(game_map.sound_flow_cache.misses, 1)
+        self.assertEqual(game_map.sound_flow_cache.hits, 1)
+
+if __name__ == '__main__':
+    unittest.main()
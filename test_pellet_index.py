@@ -0,0 +1,53 @@
+import random
+import unittest
+import numpy as np
+from map import Map
+
+class TestPelletIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.map = Map(precompute_paths=False)
+
+    def brute_nearest(self, position, kinds):
+        cells = [(int(r), int(c)) for r, c in np.argwhere(np.isin(self.map.occupancy_map, kinds))]
+        if not cells:
+            return None
+        return min(cells, key=lambda cell: (abs(cell[0] - position[0]) + abs(cell[1] - position[1]), cell))
+
+    def test_index_tracks_collection(self):
+        rng = random.Random(3)
+        cells = self.map.remaining_pellets(Map.REGULAR_PELLET, Map.POWER_PELLET, Map.SOUND_PELLET)
+        rng.shuffle(cells)
+        rows, cols = self.map.occupancy_map.shape
+        for step, (row, col) in enumerate(cells):
+            if step % 2:
+                self.map.collect_point(row, col)
+            else:
+                self.map.set_position_empty(row, col)
+            probe = (rng.randrange(rows), rng.randrange(cols))
+            self.assertEqual(self.map.nearest_pellet(probe),
+                             self.brute_nearest(probe, [Map.REGULAR_PELLET, Map.POWER_PELLET]))
+            self.assertEqual(self.map.nearest_pellet(probe, Map.SOUND_PELLET),
+                             self.brute_nearest(probe, [Map.SOUND_PELLET]))
+        self.assertEqual(self.map.remaining_pellets(), [])
+        self.assertIsNone(self.map.nearest_pellet((1, 1)))
+        self.assertTrue(self.map.check_win())
+
+    def test_restored_pellets_are_indexed(self):
+        self.map.collect_point(1, 1)
+        self.map.collect_point(1, 2)
+        before = self.map.pellets_remaining
+        self.map.set_cell(1, 1, Map.REGULAR_PELLET)
+        self.map.set_cell(1, 2, Map.POWER_PELLET)
+        self.assertEqual(self.map.pellets_remaining, before + 2)
+        self.assertEqual(self.map.nearest_pellet((1, 0), Map.POWER_PELLET), (1, 2))
+        self.assertEqual(self.map.remaining_pellets(Map.REGULAR_PELLET)[0], (1, 1))
+
+    def test_remaining_matches_grid(self):
+        self.map.collect_point(1, 2)
+        expected = [tuple(cell) for cell in np.argwhere(self.map.occupancy_map == Map.REGULAR_PELLET).tolist()]
+        self.assertEqual(self.map.remaining_pellets(Map.REGULAR_PELLET), expected)
+        self.assertEqual(self.map.pellets_remaining, int(np.isin(self.map.occupancy_map, [1, 2]).sum()))
+
+if __name__ == '__main__':
+    unittest.main()
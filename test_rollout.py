@@ -0,0 +1,40 @@
+import unittest
+from rollout import EpisodeSpec, EpisodeResult, play_episode, run_rollouts, aggregate
+
+class TestRollout(unittest.TestCase):
+
+    def setUp(self):
+        self.specs = [EpisodeSpec(seed=seed, num_enemies=1 + seed % 4, max_ticks=300) for seed in range(6)]
+
+    def test_episode_is_reproducible(self):
+        self.assertEqual(play_episode(self.specs[0]), play_episode(self.specs[0]))
+
+    def test_pool_matches_serial(self):
+        serial = sorted(run_rollouts(self.specs, processes=1))
+        pooled = sorted(run_rollouts(self.specs, processes=2, chunksize=1))
+        self.assertEqual(serial, pooled)
+
+    def test_custom_layout(self):
+        layout = ["WWWWW",
+                  "W...W",
+                  "WWWWW"]
+        result = play_episode(EpisodeSpec(seed=0, num_enemies=0, max_ticks=50, layout=layout))
+        self.assertEqual(result.outcome, "won")
+        self.assertEqual(result.dots_collected, 2)
+
+    def test_too_many_enemies_rejected(self):
+        with self.assertRaises(ValueError):
+            play_episode(EpisodeSpec(seed=0, num_enemies=5, max_ticks=10))
+        with self.assertRaises(ValueError):
+            play_episode(EpisodeSpec(seed=0, num_enemies=2, max_ticks=10, enemy_positions=[(1, 5)]))
+
+    def test_aggregate(self):
+        results = [EpisodeResult(0, 1, "won", 10, 100, 10, 0),
+                   EpisodeResult(1, 2, "lost", 30, 50, 5, 0)]
+        summary = aggregate(results)
+        self.assertEqual(summary['all']['episodes'], 2)
+        self.assertEqual(summary['all']['win_rate'], 0.5)
+        self.assertEqual(summary[2]['mean_ticks'], 30)
+
+if __name__ == '__main__':
+    unittest.main()
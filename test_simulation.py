@@ -0,0 +1,58 @@
+import random
+import unittest
+from config import DIRECTIONS
+from simulation import Simulation
+
+DIRECTION_CYCLE = list(DIRECTIONS.values())
+
+def cycling_policy(simulation):
+    """Change direction every 7 ticks."""
+    return DIRECTION_CYCLE[(simulation.tick // 7) % len(DIRECTION_CYCLE)]
+
+def trajectory(simulation, ticks):
+    positions = []
+    for _ in range(ticks):
+        simulation.step(cycling_policy(simulation))
+        positions.append((tuple(simulation.entity_manager.player.position),
+                          tuple(tuple(enemy.position) for enemy in simulation.entity_manager.enemies)))
+    return positions
+
+class TestSimulation(unittest.TestCase):
+
+    def test_starts_running_with_spawned_enemies(self):
+        simulation = Simulation(seed=1)
+        self.assertEqual(simulation.status, Simulation.RUNNING)
+        self.assertEqual(len(simulation.entity_manager.enemies), 4)
+        self.assertEqual(simulation.tick, 0)
+
+    def test_deterministic_for_same_inputs(self):
+        first = trajectory(Simulation(seed=3), 200)
+        second = trajectory(Simulation(seed=3), 200)
+        self.assertEqual(first, second)
+
+    def test_seed_leaves_global_rng_alone(self):
+        state = random.getstate()
+        simulation = Simulation(seed=3)
+        simulation.run(20)
+        self.assertEqual(random.getstate(), state)
+        self.assertIs(simulation.entity_manager.enemies[0].rng, simulation.rng)
+
+    def test_logical_clock_advances_per_tick(self):
+        simulation = Simulation(seed=1, enemy_positions=[])
+        simulation.run(10)
+        self.assertEqual(simulation.tick, 10)
+        self.assertAlmostEqual(simulation.time, 10 / 5)
+
+    def test_collision_ends_game(self):
+        simulation = Simulation(seed=1, enemy_positions=[(1, 3)])
+        status = simulation.run(50, lambda sim: (1, 0))
+        self.assertEqual(status, Simulation.LOST)
+        self.assertEqual(simulation.step(), Simulation.LOST)  # Finished games stay finished
+
+    def test_collecting_dots_scores(self):
+        simulation = Simulation(seed=1, enemy_positions=[])
+        simulation.run(5, lambda sim: (1, 0))
+        self.assertEqual(simulation.score, 50)
+
+if __name__ == '__main__':
+    unittest.main()
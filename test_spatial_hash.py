@@ -0,0 +1,68 @@
+import random
+import unittest
+from map import Map
+from entities import EntityManager
+from spatial_hash import SpatialHash
+from enemy_store import RUN_AWAY
+
+class TestSpatialHash(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.index = SpatialHash(bucket=4)
+        self.positions = {}
+        for key in range(200):
+            position = (rng.randrange(60), rng.randrange(60))
+            self.index.insert(key, position)
+            self.positions[key] = position
+        for key in rng.sample(range(200), 50):
+            position = (rng.randrange(60), rng.randrange(60))
+            self.index.move(key, position)
+            self.positions[key] = position
+        for key in rng.sample(range(200), 20):
+            self.index.remove(key)
+            del self.positions[key]
+
+    def brute_nearest(self, position, k, accept):
+        keys = [key for key in sorted(self.positions) if accept(key)]
+        distance = lambda key: (abs(self.positions[key][0] - position[0]) +
+                                abs(self.positions[key][1] - position[1]))
+        return sorted(keys, key=distance)[:k]
+
+    def test_at_matches_scan(self):
+        for row in range(0, 60, 3):
+            for col in range(60):
+                expected = [key for key in sorted(self.positions) if self.positions[key] == (row, col)]
+                self.assertEqual(self.index.at((row, col)), expected)
+
+    def test_nearest_matches_scan(self):
+        rng = random.Random(11)
+        odd = lambda key: key % 2 == 1
+        for _ in range(200):
+            probe = (rng.randrange(-10, 70), rng.randrange(-10, 70))
+            k = rng.choice([1, 3, 10])
+            self.assertEqual(self.index.nearest(probe, k), self.brute_nearest(probe, k, lambda key: True))
+            self.assertEqual(self.index.nearest(probe, k, odd), self.brute_nearest(probe, k, odd))
+
+    def test_nearest_when_nothing_accepted(self):
+        self.assertEqual(self.index.nearest((5, 5), accept=lambda key: False), [])
+        self.assertEqual(SpatialHash().nearest((5, 5)), [])
+
+    def test_store_keeps_index_in_step(self):
+        game_map = Map(precompute_paths=False)
+        manager = EntityManager(game_map)
+        for x, y in [(1, 1), (1, 5), (6, 1), (9, 1), (22, 1)]:
+            manager.add_enemy(x, y)
+        store = manager.enemy_store
+        for tick in range(20):
+            manager.move_enemies(current_tick=tick)
+        manager.enemies[3].position = (1, 2)
+        store.mode[1] = RUN_AWAY  # So it gets eaten
+        manager.player.position = manager.enemies[1].position
+        manager.check_collision()
+        self.assertEqual(len(store.spatial), store.count)
+        for enemy in manager.enemies:
+            self.assertIn(enemy.slot, store.spatial.at(enemy.position))
+
+if __name__ == '__main__':
+    unittest.main()
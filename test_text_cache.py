@@ -0,0 +1,28 @@
+import unittest
+import pygame
+import text_cache
+
+class TestTextCache(unittest.TestCase):
+
+    def setUp(self):
+        pygame.font.init()
+        text_cache.clear()
+
+    def test_missing_font_file_falls_back(self):
+        font = text_cache.get_font("fonts/missing.ttf", 36, fallback_size=40)
+        self.assertIs(text_cache.get_font("fonts/missing.ttf", 36, fallback_size=40), font)
+
+    def test_text_rasterized_once(self):
+        font = text_cache.get_font(None, 24)
+        first = text_cache.render_text(font, "SCORE: 10", (255, 255, 255))
+        self.assertIs(text_cache.render_text(font, "SCORE: 10", [255, 255, 255]), first)
+        self.assertIsNot(text_cache.render_text(font, "SCORE: 20", (255, 255, 255)), first)
+
+    def test_cache_is_bounded(self):
+        font = text_cache.get_font(None, 24)
+        for i in range(text_cache.TEXT_CACHE_SIZE + 10):
+            text_cache.render_text(font, str(i), (255, 255, 255))
+        self.assertEqual(len(text_cache._surfaces), text_cache.TEXT_CACHE_SIZE)
+
+if __name__ == '__main__':
+    unittest.main()
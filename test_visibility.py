@@ -0,0 +1,62 @@
+import unittest
+from map import Map
+from visibility import VisibilityIndex
+from enemy_ai import EnemyPerception
+
+class TestVisibilityIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.map = Map(precompute_paths=False)
+        self.index = self.map.visibility
+        self.perception = EnemyPerception()
+
+    def open_cells(self):
+        rows, cols = self.map.occupancy_map.shape
+        return [(r, c) for r in range(rows) for c in range(cols) if self.map.occupancy_map[r, c] != -1]
+
+    def test_matches_wall_scan(self):
+        # The MagicMock-safe scan in can_see_player is the reference
+        game_map = type('PlainMap', (), {'occupancy_map': self.map.occupancy_map})()
+        cells = self.open_cells()
+        for enemy in cells[::7]:
+            for player in cells:
+                if enemy[0] == player[0] or enemy[1] == player[1]:
+                    self.assertEqual(self.index.can_see(enemy, player),
+                                     self.perception.can_see_player(enemy, player, game_map),
+                                     (enemy, player))
+
+    def test_ray_stops_before_wall(self):
+        occupancy = self.map.occupancy_map
+        for r, c in self.open_cells()[::5]:
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                ray = self.index.ray(r, c, dr, dc)
+                expected = []
+                nr, nc = r + dr, c + dc
+                while 0 <= nr < occupancy.shape[0] and 0 <= nc < occupancy.shape[1] and occupancy[nr, nc] != -1:
+                    expected.append((nr, nc))
+                    nr, nc = nr + dr, nc + dc
+                self.assertEqual(ray, expected)
+
+    def test_batched_perception_matches_single(self):
+        cells = self.open_cells()
+        enemies, players = cells[::11], cells[3::17]
+        visible, distances = self.perception.perceive(enemies, players, self.map)
+        self.assertEqual(visible.shape, (len(enemies), len(players)))
+        for i, enemy in enumerate(enemies):
+            for j, player in enumerate(players):
+                self.assertEqual(visible[i, j], self.perception.can_see_player(enemy, player, self.map))
+                self.assertEqual(distances[i, j], self.perception.calculate_distance(enemy, player))
+
+    def test_rebuilt_with_walls(self):
+        index = self.map.visibility
+        self.map.generate_pacman_map()
+        self.assertIsNot(self.map.visibility, index)
+
+    def test_walls_have_no_segment(self):
+        index = VisibilityIndex(self.map.occupancy_map)
+        walls = self.map.occupancy_map == -1
+        self.assertTrue((index.row_segment[walls] == -1).all())
+        self.assertTrue((index.col_segment[walls] == -1).all())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import pygame
+from collections import OrderedDict
+from config import TEXT_CACHE_SIZE
+
+# Shared between the renderer and the start/game over screens
+_fonts = {}
+_surfaces = OrderedDict()
+
+def get_font(path, size, fallback_size=None):
+    """
+    Load a font file once and reuse it.
+    Falls back to pygame's default font (at fallback_size, if given) when the file can't be loaded.
+    """
+    key = ('file', path, size, fallback_size)
+    font = _fonts.get(key)
+    if font is None:
+        try:
+            font = pygame.font.Font(path, size)
+        except (OSError, FileNotFoundError, pygame.error):
+            font = pygame.font.Font(None, fallback_size or size)
+        _fonts[key] = font
+    return font
+
+def get_sys_font(name, size):
+    """Load a system font once and reuse it."""
+    key = ('sys', name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+def render_text(font, text, color, antialias=True):
+    """
+    Render text with a cached font, rasterizing it only the first time this
+    (font, text, colour) combination is seen. The returned surface is shared,
+    so only blit it; never draw on it.
+    """
+    key = (font, text, tuple(color), antialias)
+    surface = _surfaces.get(key)
+    if surface is not None:
+        _surfaces.move_to_end(key)
+        return surface
+
+    surface = font.render(text, antialias, color)
+    _surfaces[key] = surface
+    if len(_surfaces) > TEXT_CACHE_SIZE:
+        _surfaces.popitem(last=False)  # Evict least recently used
+    return surface
+
+def clear():
+    """Drop every cached font and text surface."""
+    _fonts.clear()
+    _surfaces.clear()
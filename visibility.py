@@ -0,0 +1,81 @@
+import numpy as np
+
+WALL = -1
+
+class VisibilityIndex:
+    """
+    Run-length index of the open row and column segments of a maze.
+
+    Every walkable cell gets the id of the horizontal and the vertical run of
+    open cells it sits in (-1 on walls). Two cells in the same row see each
+    other exactly when they share a row segment (likewise for columns), and a
+    vision ray runs from a cell to the end of its segment.
+    """
+
+    def __init__(self, occupancy_map):
+        open_cells = occupancy_map != WALL
+        self.row_segment, self.row_start, self.row_end = self._segments(open_cells)
+        col_segment, self.col_start, self.col_end = self._segments(open_cells.T)
+        self.col_segment = col_segment.T
+
+    @classmethod
+    def from_arrays(cls, row_segment, row_start, row_end, col_segment, col_start, col_end):
+        """Wrap previously built index arrays (e.g. loaded from a map file) without rebuilding."""
+        index = cls.__new__(cls)
+        index.row_segment, index.row_start, index.row_end = row_segment, row_start, row_end
+        index.col_segment, index.col_start, index.col_end = col_segment, col_start, col_end
+        return index
+
+    @staticmethod
+    def _segments(open_cells):
+        """Label the runs of open cells along each row: (ids, first column, last column) per run."""
+        rows, cols = open_cells.shape
+        walled = np.pad(open_cells, ((0, 0), (1, 1)), constant_values=False)
+        starts = open_cells & ~walled[:, :-2]
+        ends = open_cells & ~walled[:, 2:]
+
+        segment = np.cumsum(starts.ravel()).reshape(rows, cols).astype(np.int32) - 1
+        segment[~open_cells] = -1
+        return segment, np.nonzero(starts)[1].astype(np.int32), np.nonzero(ends)[1].astype(np.int32)
+
+    def can_see(self, enemy_position, player_position):
+        """Same check as EnemyPerception.can_see_player, as a segment-id comparison."""
+        enemy_row, enemy_col = int(enemy_position[0]), int(enemy_position[1])
+        player_row, player_col = int(player_position[0]), int(player_position[1])
+        if enemy_row == player_row:
+            return self.row_segment[enemy_row, enemy_col] == self.row_segment[player_row, player_col]
+        if enemy_col == player_col:
+            return self.col_segment[enemy_row, enemy_col] == self.col_segment[player_row, player_col]
+        return False
+
+    def visible(self, enemy_positions, player_positions):
+        """
+        Boolean (enemies, players) matrix of can_see for every pair at once.
+        Positions are (N, 2) and (M, 2) arrays of [row, col].
+        """
+        enemies = np.asarray(enemy_positions, dtype=np.intp).reshape(-1, 2)
+        players = np.asarray(player_positions, dtype=np.intp).reshape(-1, 2)
+        enemy_row, enemy_col = enemies[:, 0, None], enemies[:, 1, None]
+        player_row, player_col = players[None, :, 0], players[None, :, 1]
+
+        same_row = enemy_row == player_row
+        same_col = enemy_col == player_col
+        row_match = self.row_segment[enemy_row, enemy_col] == self.row_segment[player_row, player_col]
+        col_match = self.col_segment[enemy_row, enemy_col] == self.col_segment[player_row, player_col]
+        # A shared row decides on its own, as in can_see
+        return (same_row & row_match) | (~same_row & same_col & col_match)
+
+    def ray(self, row, col, dr, dc):
+        """Cells seen from (row, col) looking in direction (dr, dc), nearest first."""
+        if dr == 0:
+            segment = self.row_segment[row, col]
+            if segment < 0:
+                return []
+            last = self.row_end[segment] if dc > 0 else self.row_start[segment]
+            return [(row, c) for c in range(col + dc, int(last) + dc, dc)]
+
+        segment = self.col_segment[row, col]
+        if segment < 0:
+            return []
+        last = self.col_end[segment] if dr > 0 else self.col_start[segment]
+        return [(r, col) for r in range(row + dr, int(last) + dr, dr)]